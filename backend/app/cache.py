@@ -0,0 +1,173 @@
+"""In-process response cache for read-heavy GET endpoints.
+
+Public data only changes when the scrape pipeline or the forecast job
+commits, so responses are kept in an LRU map with a TTL as a safety net and
+dropped explicitly by :meth:`ResponseCache.invalidate` after those writes.
+Concurrent misses for the same key share one load, so a burst of identical
+dashboard requests runs a single set of queries.
+"""
+
+import asyncio
+import functools
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, ParamSpec, TypeVar
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+
+logger = logging.getLogger("agrisenta.cache")
+settings = get_settings()
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Arguments that are per-request plumbing rather than part of what is being asked for.
+_UNCACHED_ARGUMENT_TYPES = (AsyncSession, Request, Response)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def to_dict(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class ResponseCache:
+    def __init__(self, *, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        # Bumped by invalidate() so loads that started before it are not stored.
+        self._generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        """Return the cached value for ``key``, running ``load`` once on a miss."""
+        if not self.enabled:
+            return await load()
+
+        found, value = self._lookup(key)
+        if found:
+            self.stats.hits += 1
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats.hits += 1
+            return await asyncio.shield(pending)
+
+        self.stats.misses += 1
+        generation = self._generation
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Nobody else may be waiting; don't let the event loop warn about it.
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if generation == self._generation:
+                self._store(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, reason: str = "") -> None:
+        """Drop every cached response; call after a write that changes public data commits."""
+        self._entries.clear()
+        self._generation += 1
+        self.stats.invalidations += 1
+        if reason:
+            logger.info("Response cache invalidated: %s", reason)
+
+    def reset(self) -> None:
+        """Drop entries and counters (tests)."""
+        self._entries.clear()
+        self._generation += 1
+        self.stats = CacheStats()
+
+
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries, ttl_seconds=settings.response_cache_ttl_seconds
+)
+
+
+def _cache_key(namespace: str, kwargs: dict[str, Any]) -> tuple:
+    """``namespace`` plus the non-default arguments, sorted by name."""
+    return (
+        namespace,
+        tuple(
+            sorted(
+                (name, value)
+                for name, value in kwargs.items()
+                if value is not None and not isinstance(value, _UNCACHED_ARGUMENT_TYPES)
+            )
+        ),
+    )
+
+
+def cached(namespace: str) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """Cache an endpoint's return value in :data:`response_cache`, keyed by its query arguments.
+
+    FastAPI passes endpoint parameters as keyword arguments, and
+    ``functools.wraps`` keeps the signature it inspects for dependencies.
+    Values are shared between requests, so endpoints must not mutate them.
+    """
+
+    def decorator(endpoint: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @functools.wraps(endpoint)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            return await response_cache.get_or_load(_cache_key(namespace, kwargs), lambda: endpoint(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,148 @@
+"""Data-version counter behind ``ETag``/``Last-Modified`` on the public read endpoints.
+
+Every write that changes public data calls :func:`mark_data_changed`, which
+bumps the version and clears the response cache.  ``ConditionalRequestMiddleware``
+tags GET responses with the version and answers a matching ``If-None-Match``
+(or an ``If-Modified-Since`` after the change's second) with ``304`` before
+routing, so no database session is opened.  Routes that depend on a security
+scheme only get their ``304`` after the handler, and so its auth check, has
+run.  The counter lives in this process, which is
+also where the scrape and forecast jobs run; the ETag includes the process
+start time so tags from before a restart never match.  Some responses are
+relative to the current date (forecasts from today on, today's price board),
+so both validators also roll over at midnight UTC.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, time
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.routing import APIRoute
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match
+
+from app.cache import response_cache
+
+logger = logging.getLogger("agrisenta.data_version")
+
+# GET routes whose responses depend only on shared data (not on who is asking).
+VERSIONED_PATH_PREFIXES = tuple(
+    f"/api/v1/{prefix}"
+    for prefix in (
+        "alerts",
+        "analytics",
+        "commodities",
+        "export",
+        "forecast",
+        "harvests",
+        "markets",
+        "price-board",
+        "prices",
+        "regions",
+        "vendors",
+    )
+)
+
+
+def _now() -> datetime:
+    # HTTP dates have one-second resolution.
+    return datetime.now(UTC).replace(microsecond=0)
+
+
+@dataclass(slots=True)
+class DataVersion:
+    version: int = 1
+    changed_at: datetime = field(default_factory=_now)
+    epoch: int = field(default_factory=lambda: int(datetime.now(UTC).timestamp()))
+
+    @property
+    def etag(self) -> str:
+        return f'W/"{self.epoch:x}-{self.version}-{_now():%Y%m%d}"'
+
+    @property
+    def modified_at(self) -> datetime:
+        """The last change, or the start of today if that is later."""
+        return max(self.changed_at, datetime.combine(_now().date(), time(), UTC))
+
+    @property
+    def last_modified(self) -> str:
+        return format_datetime(self.modified_at, usegmt=True)
+
+    def bump(self) -> None:
+        self.version += 1
+        self.changed_at = _now()
+
+
+data_version = DataVersion()
+
+
+def mark_data_changed(reason: str) -> None:
+    """Record that public data changed: new ETags from now on, and no cached responses."""
+    data_version.bump()
+    response_cache.invalidate(reason)
+    logger.debug("Data version %d: %s", data_version.version, reason)
+
+
+def _not_modified(request: Request, etag: str, changed_at: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        # Weak comparison: a strong copy of the same tag matches too.
+        return "*" in tags or etag in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        # HTTP dates have one-second resolution, and two changes can land in the same second;
+        # only a date after the change's second proves the client has the current data.
+        try:
+            return changed_at < parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+# Keyed by path template and methods; routes compare by value and are not hashable.
+_route_requires_credentials: dict[tuple[str, frozenset[str]], bool] = {}
+
+
+def _requires_credentials(request: Request) -> bool:
+    """Whether the route ``request`` resolves to depends on a security scheme (e.g. ``require_admin``)."""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match is not Match.FULL:
+            continue
+        if not isinstance(route, APIRoute):
+            return False
+        key = (route.path, frozenset(route.methods))
+        if key not in _route_requires_credentials:
+            _route_requires_credentials[key] = bool(get_flat_dependant(route.dependant).security_requirements)
+        return _route_requires_credentials[key]
+    return False
+
+
+class ConditionalRequestMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if request.method != "GET" or not request.url.path.startswith(VERSIONED_PATH_PREFIXES):
+            return await call_next(request)
+
+        # Read the version before the handler runs; a write that lands meanwhile
+        # then yields a newer tag on the next request instead of a stale 304.
+        etag, changed_at, last_modified = data_version.etag, data_version.modified_at, data_version.last_modified
+        headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": "no-cache"}
+        not_modified = _not_modified(request, etag, changed_at)
+        # A 304 before routing would skip authentication, so guarded routes are answered after it.
+        guarded = _requires_credentials(request)
+        if not_modified and not guarded:
+            return Response(status_code=304, headers=headers)
+
+        response = await call_next(request)
+        # Placeholder responses (e.g. forecasts still being generated) must not be revalidated as current.
+        if response.status_code == 200 and "Retry-After" not in response.headers:
+            if not_modified:
+                return Response(status_code=304, headers=headers)
+            response.headers.update(headers)
+        return response
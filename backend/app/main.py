@@ -1,5 +1,6 @@
 import logging
 from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,13 +8,17 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.config import get_settings
+from app.data_version import ConditionalRequestMiddleware, mark_data_changed
 from app.database import AsyncSessionLocal, engine
 from app.models.base import Base
 from app.rate_limit import limiter
 from app.routers import api_router
+from app.scraping.http_client import scraper_http
 from app.scraping.scheduler import create_scheduler
 from app.services.auth_service import create_user, get_user_by_username
 from app.services.forecast_service import regenerate_all_forecasts
+from app.services.job_tracker import FORECAST_JOB, SEED_JOB, job_tracker
+from app.utils.partitions import add_months, ensure_partitions
 from app.utils.seed_data import seed_reference_data
 
 logging.basicConfig(
@@ -26,22 +31,14 @@ logger = logging.getLogger("agrisenta")
 settings = get_settings()
 
 
-@asynccontextmanager
-async def lifespan(_: FastAPI):
-    scheduler = create_scheduler()
-
-    logger.info("Creating database tables …")
-    async with engine.begin() as connection:
-        # drop_all + create_all ensures schema stays in sync during development.
-        # For production, use Alembic migrations instead.
-        await connection.run_sync(Base.metadata.drop_all)
-        await connection.run_sync(Base.metadata.create_all)
-
-    logger.info("Seeding reference data …")
+async def _seed_database() -> str:
     async with AsyncSessionLocal() as session:
         await seed_reference_data(session)
+    mark_data_changed("reference data seeded")
+    return "reference data seeded"
 
-    logger.info("Seeding default admin user …")
+
+async def _seed_admin_user() -> None:
     async with AsyncSessionLocal() as session:
         existing = await get_user_by_username(session, settings.default_admin_username)
         if existing is None:
@@ -55,17 +52,57 @@ async def lifespan(_: FastAPI):
         else:
             logger.info("Admin user already exists, skipping")
 
-    logger.info("Generating initial forecasts …")
+
+async def _generate_initial_forecasts() -> str:
     result = await regenerate_all_forecasts(horizon_days=7)
     logger.info("Forecasts generated: %s rows", result.get("rows_generated", 0))
+    return f"{result.get('rows_generated', 0)} forecast rows generated"
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    scheduler = create_scheduler()
+
+    logger.info("Creating database tables …")
+    async with engine.begin() as connection:
+        # create_all only adds missing tables; schema changes to existing ones need
+        # RESET_SCHEMA_ON_STARTUP=true in development, or Alembic migrations.
+        if settings.reset_schema_on_startup:
+            logger.warning("Dropping all tables (RESET_SCHEMA_ON_STARTUP)")
+            await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+        today = datetime.now(UTC).date()
+        # Covers the seeded history; rows backfilled before it land in the default partition
+        # until maintenance creates their month, which moves them out.
+        await ensure_partitions(
+            connection,
+            start=today - timedelta(days=settings.seed_history_days),
+            end=add_months(today, settings.daily_prices_partition_months_ahead),
+        )
+
+    logger.info("Seeding default admin user …")
+    await _seed_admin_user()
+
+    startup_jobs = [(SEED_JOB, _seed_database), (FORECAST_JOB, _generate_initial_forecasts)]
+    if settings.startup_mode == "blocking":
+        for name, step in startup_jobs:
+            logger.info("Running startup job %s …", name)
+            await step()
+    else:
+        # Serve requests right away; /health/ready reports when seeding and
+        # the initial forecast have finished.
+        logger.info("Running startup jobs in the background …")
+        job_tracker.start(startup_jobs)
 
     scheduler.start()
     logger.info("Scheduler started")
 
     yield
 
+    await job_tracker.stop()
     scheduler.shutdown(wait=False)
     logger.info("Scheduler shut down")
+    await scraper_http.aclose()
 
 
 app = FastAPI(title=settings.app_name, version=settings.app_version, lifespan=lifespan)
@@ -74,6 +111,7 @@ app = FastAPI(title=settings.app_name, version=settings.app_version, lifespan=li
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+app.add_middleware(ConditionalRequestMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
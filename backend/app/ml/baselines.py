@@ -0,0 +1,68 @@
+"""Cheap baseline forecasters: naive, seasonal-naive and simple exponential smoothing.
+
+These are pure NumPy and cost microseconds per series, so they are tried
+before the statsmodels ARIMA fit and frequently win on flat or weekly-cyclic
+market prices.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+WEEKLY_PERIOD = 7
+SES_ALPHAS = np.linspace(0.1, 0.9, 9)
+
+
+@dataclass(slots=True)
+class BaselineForecaster:
+    """A fitted baseline: repeats ``pattern`` forward and carries its residual spread."""
+
+    pattern: np.ndarray
+    residual_std: float
+
+    def forecast(self, steps: int) -> np.ndarray:
+        repeats = -(-steps // len(self.pattern))
+        return np.tile(self.pattern, repeats)[:steps]
+
+
+def _residual_std(errors: np.ndarray) -> float:
+    return float(np.std(errors)) if len(errors) else 0.0
+
+
+def fit_naive(values: np.ndarray) -> BaselineForecaster:
+    """Tomorrow's price equals today's."""
+    return BaselineForecaster(pattern=values[-1:].copy(), residual_std=_residual_std(np.diff(values)))
+
+
+def fit_seasonal_naive(values: np.ndarray, period: int = WEEKLY_PERIOD) -> BaselineForecaster:
+    """Each day repeats the same weekday of the last observed week."""
+    if len(values) < period:
+        raise ValueError(f"seasonal naive needs at least {period} observations")
+    return BaselineForecaster(
+        pattern=values[-period:].copy(),
+        residual_std=_residual_std(values[period:] - values[:-period]),
+    )
+
+
+def _smooth(values: np.ndarray, alphas: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Run simple exponential smoothing for every alpha at once.
+
+    Returns the final level per alpha and the one-step-ahead errors
+    (``len(alphas) x (len(values) - 1)``).
+    """
+    level = np.full(len(alphas), values[0], dtype=np.float64)
+    errors = np.empty((len(alphas), len(values) - 1), dtype=np.float64)
+    for index, value in enumerate(values[1:]):
+        error = value - level
+        errors[:, index] = error
+        level = level + alphas * error
+    return level, errors
+
+
+def fit_simple_exponential_smoothing(values: np.ndarray) -> BaselineForecaster:
+    """Flat forecast at the smoothed level, with alpha picked from a small grid by one-step SSE."""
+    if len(values) < 2:
+        return fit_naive(values)
+    levels, errors = _smooth(values, SES_ALPHAS)
+    best = int(np.argmin((errors * errors).sum(axis=1)))
+    return BaselineForecaster(pattern=levels[best : best + 1], residual_std=_residual_std(errors[best]))
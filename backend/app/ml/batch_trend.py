@@ -0,0 +1,119 @@
+"""Vectorized linear-trend fitting for many price series at once.
+
+Series of different lengths are left-aligned in a padded 2-D matrix with a
+boolean mask; every slope and intercept is then solved in one closed-form
+least-squares pass over the matrix instead of one regression per series.
+The time feature is the observation index (0, 1, 2, …), matching the
+per-series ``np.arange`` features used by the trainer.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+# Holdout split shared with app.ml.trainer when comparing models.
+MIN_TRAIN_SIZE = 5
+TRAIN_FRACTION = 0.8
+MIN_HOLDOUT_LENGTH = 8
+
+
+@dataclass(slots=True)
+class LinearTrend:
+    """A fitted ``price = slope * index + intercept`` line."""
+
+    slope: float
+    intercept: float
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        return np.asarray(x, dtype=float).ravel() * self.slope + self.intercept
+
+
+@dataclass(slots=True)
+class TrendCandidates:
+    """Batch fit results, one entry per input series."""
+
+    holdout_mae: np.ndarray
+    slopes: np.ndarray
+    intercepts: np.ndarray
+
+    def trend(self, index: int) -> LinearTrend:
+        return LinearTrend(slope=float(self.slopes[index]), intercept=float(self.intercepts[index]))
+
+
+def holdout_train_size(length: int) -> int:
+    train_size = max(MIN_TRAIN_SIZE, int(length * TRAIN_FRACTION))
+    return min(train_size, length - 1)
+
+
+def _holdout_train_sizes(lengths: np.ndarray) -> np.ndarray:
+    """Vectorized :func:`holdout_train_size`."""
+    train_sizes = np.maximum(MIN_TRAIN_SIZE, (lengths * TRAIN_FRACTION).astype(np.int64))
+    return np.minimum(train_sizes, lengths - 1)
+
+
+def pad_series(series: Sequence[Sequence[float] | np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Left-align ``series`` into a zero-padded matrix; return ``(values, lengths)``."""
+    lengths = np.fromiter((len(values) for values in series), dtype=np.int64, count=len(series))
+    width = int(lengths.max()) if len(lengths) else 0
+    values = np.zeros((len(series), width), dtype=np.float64)
+    for row, row_values in enumerate(series):
+        values[row, : lengths[row]] = row_values
+    return values, lengths
+
+
+def fit_trends(values: np.ndarray, mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Least-squares slope/intercept for every row, using only cells where ``mask`` is true.
+
+    Rows with fewer than two masked points get a flat line through their mean.
+    """
+    weights = mask.astype(np.float64)
+    x = np.arange(values.shape[1], dtype=np.float64)
+
+    n = weights.sum(axis=1)
+    sum_x = weights @ x
+    sum_y = (weights * values).sum(axis=1)
+    sum_xx = weights @ (x * x)
+    sum_xy = (weights * values) @ x
+
+    denominator = n * sum_xx - sum_x * sum_x
+    safe_n = np.where(n > 0, n, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = np.where(denominator > 0, (n * sum_xy - sum_x * sum_y) / denominator, 0.0)
+    intercepts = (sum_y - slopes * sum_x) / safe_n
+    return slopes, intercepts
+
+
+def forecast_trends(slopes: np.ndarray, intercepts: np.ndarray, lengths: np.ndarray, horizon_days: int) -> np.ndarray:
+    """Return an ``(n_series, horizon_days)`` matrix of future trend values."""
+    steps = np.arange(horizon_days, dtype=np.float64)
+    future_x = lengths[:, None].astype(np.float64) + steps[None, :]
+    return slopes[:, None] * future_x + intercepts[:, None]
+
+
+def train_linear_trends(series: Sequence[Sequence[float] | np.ndarray]) -> TrendCandidates:
+    """Holdout MAE plus a full-history trend for every series in one pass.
+
+    The holdout uses the trainer's 80/20 split; series shorter than
+    ``MIN_HOLDOUT_LENGTH`` get an MAE of 0, as in ``train_best_model``.
+    """
+    values, lengths = pad_series(series)
+    columns = np.arange(values.shape[1])[None, :]
+    full_mask = columns < lengths[:, None]
+
+    train_sizes = _holdout_train_sizes(lengths)
+    train_mask = columns < train_sizes[:, None]
+    test_mask = full_mask & ~train_mask
+
+    train_slopes, train_intercepts = fit_trends(values, train_mask)
+    predictions = train_slopes[:, None] * columns + train_intercepts[:, None]
+    errors = np.where(test_mask, np.abs(values - predictions), 0.0)
+    test_counts = test_mask.sum(axis=1)
+    holdout_mae = np.where(
+        (lengths >= MIN_HOLDOUT_LENGTH) & (test_counts > 0),
+        errors.sum(axis=1) / np.maximum(test_counts, 1),
+        0.0,
+    )
+
+    slopes, intercepts = fit_trends(values, full_mask)
+    return TrendCandidates(holdout_mae=holdout_mae, slopes=slopes, intercepts=intercepts)
@@ -0,0 +1,238 @@
+"""Process-pool forecast engine.
+
+Model fitting is CPU-bound (statsmodels ARIMA + regressions), so every
+commodity–region pair is fitted in a worker process.  Results are streamed
+back to the caller as they finish, which keeps the event loop free to serve
+API requests while a full regeneration is running.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from time import perf_counter
+
+import numpy as np
+
+from app.ml.param_cache import ArimaWarmStart
+from app.ml.predictor import generate_forecast_points
+from app.ml.registry import CHEAP_MODEL_MAX_COST
+from app.ml.trainer import DEFAULT_MAE_TOLERANCE, LinearCandidate, linear_candidates, train_best_model
+
+logger = logging.getLogger("agrisenta.forecast.engine")
+
+
+@dataclass(slots=True)
+class PairForecastJob:
+    commodity_id: int
+    region_id: int
+    prices: np.ndarray | list[float]
+    last_date: date
+    horizon_days: int = 7
+    warm_start: ArimaWarmStart | None = None
+    tolerance: float = DEFAULT_MAE_TOLERANCE
+    max_cost: float | None = None
+
+
+@dataclass(slots=True)
+class PairForecastResult:
+    commodity_id: int
+    region_id: int
+    last_date: date
+    model_name: str
+    points: list[dict]
+    warm_start: ArimaWarmStart | None = None
+    optimizer_iterations: int = 0
+    model_seconds: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class ForecastRunStats:
+    workers: int = 0
+    pairs_submitted: int = 0
+    pairs_completed: int = 0
+    pairs_failed: int = 0
+    pairs_warm_started: int = 0
+    optimizer_iterations: int = 0
+    pairs_budget_limited: int = 0
+    model_seconds: dict[str, float] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def cpu_seconds(self) -> float:
+        return sum(self.model_seconds.values())
+
+    @property
+    def pairs_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.pairs_completed / self.elapsed_seconds
+
+
+def resolve_worker_count(max_workers: int | None) -> int:
+    """Return the pool size to use; ``None`` or ``<= 0`` means one per CPU."""
+    if max_workers is None or max_workers <= 0:
+        return os.cpu_count() or 1
+    return max_workers
+
+
+def _fit_one(job: PairForecastJob, linear: LinearCandidate) -> PairForecastResult:
+    trained = train_best_model(
+        job.prices, warm_start=job.warm_start, linear=linear, tolerance=job.tolerance, max_cost=job.max_cost
+    )
+    points = generate_forecast_points(
+        trained=trained,
+        history=job.prices,
+        start_date=job.last_date,
+        horizon_days=job.horizon_days,
+    )
+    return PairForecastResult(
+        commodity_id=job.commodity_id,
+        region_id=job.region_id,
+        last_date=job.last_date,
+        model_name=trained.model_name,
+        points=points,
+        warm_start=trained.arima_warm_start,
+        optimizer_iterations=trained.optimizer_iterations,
+        model_seconds=trained.model_seconds,
+    )
+
+
+def fit_pairs(jobs: list[PairForecastJob]) -> list[PairForecastResult]:
+    """Train and forecast a chunk of pairs.  Runs inside a worker process.
+
+    Linear trends for the whole chunk are fitted in one vectorized pass;
+    only ARIMA is fitted pair by pair.  A pair that raises comes back with
+    ``error`` set and no points instead of failing the chunk.
+    """
+    candidates = linear_candidates([job.prices for job in jobs])
+    results: list[PairForecastResult] = []
+    for job, linear in zip(jobs, candidates, strict=True):
+        try:
+            results.append(_fit_one(job, linear))
+        except Exception as exc:
+            results.append(
+                PairForecastResult(
+                    commodity_id=job.commodity_id,
+                    region_id=job.region_id,
+                    last_date=job.last_date,
+                    model_name="",
+                    points=[],
+                    error=str(exc),
+                )
+            )
+    return results
+
+
+def fit_pair(job: PairForecastJob) -> PairForecastResult:
+    """Train and forecast a single pair."""
+    return fit_pairs([job])[0]
+
+
+async def _as_async_iterator(jobs: Iterable[PairForecastJob]) -> AsyncIterator[PairForecastJob]:
+    for job in jobs:
+        yield job
+
+
+async def _next_chunk(job_iterator: AsyncIterator[PairForecastJob], chunk_size: int) -> list[PairForecastJob]:
+    chunk: list[PairForecastJob] = []
+    while len(chunk) < chunk_size:
+        job = await anext(job_iterator, None)
+        if job is None:
+            break
+        chunk.append(job)
+    return chunk
+
+
+async def run_forecast_jobs(
+    jobs: Iterable[PairForecastJob] | AsyncIterable[PairForecastJob],
+    *,
+    max_workers: int | None = None,
+    chunk_size: int = 16,
+    stats: ForecastRunStats | None = None,
+    cpu_budget_seconds: float | None = None,
+) -> AsyncIterator[PairForecastResult]:
+    """Fit ``jobs`` on a process pool and yield results as chunks complete.
+
+    Jobs are sent to the workers ``chunk_size`` pairs at a time so that the
+    linear trends of a chunk can be fitted together.  At most
+    ``2 * workers`` chunks are in flight at once so that a large backlog
+    never has to be pickled into the pool up front; ``jobs`` may be an async
+    iterable so that history can be streamed straight from the DB.  A pair
+    that raises is logged and skipped instead of aborting the whole run.
+
+    ``cpu_budget_seconds`` caps the model-fitting CPU time of the run, as
+    reported back by the workers.  Once it is spent, chunks submitted from
+    then on are restricted to cheap models; chunks already in flight finish
+    as submitted, so the budget can be overshot by at most that much work.
+    """
+    stats = stats if stats is not None else ForecastRunStats()
+    workers = resolve_worker_count(max_workers)
+    stats.workers = workers
+    in_flight_limit = workers * 2
+
+    loop = asyncio.get_running_loop()
+    # "spawn" keeps workers independent of the parent's event loop, DB
+    # connections and threads.
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    started_at = perf_counter()
+
+    job_iterator = aiter(jobs) if isinstance(jobs, AsyncIterable) else _as_async_iterator(jobs)
+    exhausted = False
+    pending: dict[asyncio.Future[list[PairForecastResult]], int] = {}
+
+    try:
+        while True:
+            while not exhausted and len(pending) < in_flight_limit:
+                chunk = await _next_chunk(job_iterator, chunk_size)
+                if not chunk:
+                    exhausted = True
+                    break
+                if cpu_budget_seconds is not None and stats.cpu_seconds >= cpu_budget_seconds:
+                    for job in chunk:
+                        job.max_cost = CHEAP_MODEL_MAX_COST
+                    stats.pairs_budget_limited += len(chunk)
+                pending[loop.run_in_executor(executor, fit_pairs, chunk)] = len(chunk)
+                stats.pairs_submitted += len(chunk)
+                stats.pairs_warm_started += sum(1 for job in chunk if job.warm_start is not None)
+
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                chunk_length = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as exc:
+                    stats.pairs_failed += chunk_length
+                    logger.warning("Forecast chunk of %d pairs failed: %s", chunk_length, exc)
+                    continue
+
+                for result in results:
+                    if result.error is not None:
+                        stats.pairs_failed += 1
+                        logger.warning(
+                            "Forecast failed for commodity=%s region=%s: %s",
+                            result.commodity_id,
+                            result.region_id,
+                            result.error,
+                        )
+                        continue
+
+                    stats.pairs_completed += 1
+                    stats.optimizer_iterations += result.optimizer_iterations
+                    for model_name, seconds in result.model_seconds.items():
+                        stats.model_seconds[model_name] = stats.model_seconds.get(model_name, 0.0) + seconds
+                    stats.elapsed_seconds = perf_counter() - started_at
+                    yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        stats.elapsed_seconds = perf_counter() - started_at
@@ -0,0 +1,87 @@
+"""Cache of fitted ARIMA parameters used to warm-start later fits.
+
+Entries are keyed by ``(commodity_id, region_id, order)`` and persisted on
+``ForecastFitState.model_params`` so that next week's refit can start the
+optimizer from last week's optimum instead of from scratch.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+ArimaOrder = tuple[int, int, int]
+CacheKey = tuple[int, int, ArimaOrder]
+
+# A cached optimum is only reused while the series level stays within this
+# fraction of the level it was fitted on.
+MAX_LEVEL_SHIFT = 0.25
+
+
+@dataclass(slots=True)
+class ArimaWarmStart:
+    order: ArimaOrder
+    params: list[float]
+    n_obs: int
+    level: float
+
+    @classmethod
+    def from_fit(cls, order: ArimaOrder, params: np.ndarray, prices: np.ndarray) -> "ArimaWarmStart":
+        return cls(
+            order=order,
+            params=[float(value) for value in params],
+            n_obs=len(prices),
+            level=float(np.mean(prices)),
+        )
+
+    @classmethod
+    def from_dict(cls, payload: dict | None) -> "ArimaWarmStart | None":
+        if not payload:
+            return None
+        try:
+            return cls(
+                order=tuple(payload["order"]),
+                params=[float(value) for value in payload["params"]],
+                n_obs=int(payload["n_obs"]),
+                level=float(payload["level"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def to_dict(self) -> dict:
+        return {"order": list(self.order), "params": self.params, "n_obs": self.n_obs, "level": self.level}
+
+    def is_compatible(self, prices: np.ndarray, order: ArimaOrder) -> bool:
+        """Whether these parameters are still a sensible starting point for ``prices``.
+
+        The cache is invalidated when the series changes shape: it got shorter
+        (history was rewritten) or its level moved by more than
+        ``MAX_LEVEL_SHIFT``.
+        """
+        if order != self.order or len(prices) < self.n_obs or not np.all(np.isfinite(self.params)):
+            return False
+        if self.level == 0:
+            return False
+        return abs(float(np.mean(prices)) - self.level) <= MAX_LEVEL_SHIFT * abs(self.level)
+
+
+class ArimaParamCache:
+    """In-memory ``(commodity_id, region_id, order) -> ArimaWarmStart`` map."""
+
+    def __init__(self) -> None:
+        self._entries: dict[CacheKey, ArimaWarmStart] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, commodity_id: int, region_id: int, order: ArimaOrder, prices: np.ndarray) -> ArimaWarmStart | None:
+        key = (commodity_id, region_id, order)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_compatible(prices, order):
+            del self._entries[key]
+            return None
+        return entry
+
+    def put(self, commodity_id: int, region_id: int, warm_start: ArimaWarmStart) -> None:
+        self._entries[(commodity_id, region_id, warm_start.order)] = warm_start
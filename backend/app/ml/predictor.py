@@ -7,16 +7,19 @@ from app.ml.trainer import TrainedForecastModel
 
 def generate_forecast_points(
     trained: TrainedForecastModel,
-    history: list[float],
+    history: list[float] | np.ndarray,
     start_date: date,
     horizon_days: int = 7,
 ) -> list[dict]:
-    if not history:
+    if len(history) == 0:
         return []
 
     if trained.model_name.startswith("arima") and trained.arima_result is not None:
         forecast_values = list(trained.arima_result.forecast(steps=horizon_days))
         residual_std = float(np.std(trained.arima_result.resid)) if hasattr(trained.arima_result, "resid") else 0.0
+    elif trained.baseline is not None:
+        forecast_values = list(trained.baseline.forecast(horizon_days))
+        residual_std = trained.baseline.residual_std
     else:
         if trained.linear_model is None:
             return []
@@ -0,0 +1,130 @@
+"""Registry of candidate forecast models.
+
+Every candidate declares a relative CPU cost (the naive forecast is 1).
+:func:`select_model` evaluates candidates cheapest first on the trainer's
+holdout split, stops as soon as one is within tolerance of the actuals, and
+never runs a candidate costlier than the caller's ``max_cost``.
+"""
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from time import process_time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from app.ml.param_cache import ArimaWarmStart
+
+if TYPE_CHECKING:
+    from app.ml.trainer import LinearCandidate, TrainedForecastModel
+
+logger = logging.getLogger("agrisenta.forecast.registry")
+
+# Candidates above this cost are "expensive" and are dropped once a run has
+# spent its CPU budget.
+CHEAP_MODEL_MAX_COST = 10.0
+
+
+@dataclass(slots=True)
+class ModelContext:
+    """One series and its holdout split, shared by every candidate."""
+
+    prices: np.ndarray
+    train_size: int
+    linear: "LinearCandidate"
+    warm_start: ArimaWarmStart | None = None
+
+    @property
+    def train_values(self) -> np.ndarray:
+        return self.prices[: self.train_size]
+
+    @property
+    def test_values(self) -> np.ndarray:
+        return self.prices[self.train_size :]
+
+
+@dataclass(slots=True)
+class ModelEvaluation:
+    """Holdout score of one candidate plus a callback that refits it on the full series."""
+
+    holdout_mae: float
+    refit: Callable[[], "TrainedForecastModel"]
+    warm_start: ArimaWarmStart | None = None
+    optimizer_iterations: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class ModelSpec:
+    name: str
+    cost: float
+    evaluate: Callable[[ModelContext], ModelEvaluation]
+
+
+@dataclass(slots=True)
+class ModelSelection:
+    spec: ModelSpec | None
+    evaluation: ModelEvaluation | None
+    model_seconds: dict[str, float] = field(default_factory=dict)
+    warm_start: ArimaWarmStart | None = None
+    optimizer_iterations: int = 0
+
+
+_REGISTRY: dict[str, ModelSpec] = {}
+
+
+def register_model(spec: ModelSpec) -> ModelSpec:
+    """Add ``spec`` to the registry, replacing any candidate with the same name."""
+    _REGISTRY[spec.name] = spec
+    return spec
+
+
+def registered_models(max_cost: float | None = None) -> list[ModelSpec]:
+    """Registered candidates, cheapest first, optionally capped at ``max_cost``."""
+    specs = sorted(_REGISTRY.values(), key=lambda spec: (spec.cost, spec.name))
+    if max_cost is None:
+        return specs
+    return [spec for spec in specs if spec.cost <= max_cost]
+
+
+def select_model(context: ModelContext, *, tolerance: float, max_cost: float | None = None) -> ModelSelection:
+    """Evaluate candidates cheapest first and return the one with the lowest holdout MAE.
+
+    Evaluation stops early once the best MAE is within ``tolerance`` times the
+    mean absolute holdout price.  A candidate that raises is skipped.  CPU
+    seconds spent per candidate are recorded on the returned selection.
+    """
+    threshold = tolerance * float(np.mean(np.abs(context.test_values)))
+    selection = ModelSelection(spec=None, evaluation=None)
+
+    for spec in registered_models(max_cost):
+        best = selection.evaluation
+        if best is not None and best.holdout_mae <= threshold:
+            logger.debug(
+                "%s is within tolerance (MAE %.4f), skipping %s and costlier",
+                selection.spec.name,
+                best.holdout_mae,
+                spec.name,
+            )
+            break
+
+        started = process_time()
+        try:
+            evaluation = spec.evaluate(context)
+        except Exception as exc:
+            logger.debug("Candidate %s failed: %s", spec.name, exc)
+            continue
+        finally:
+            selection.model_seconds[spec.name] = process_time() - started
+
+        logger.debug(
+            "Candidate %s: MAE %.4f in %.4fs CPU", spec.name, evaluation.holdout_mae, selection.model_seconds[spec.name]
+        )
+        selection.optimizer_iterations += evaluation.optimizer_iterations
+        if evaluation.warm_start is not None:
+            selection.warm_start = evaluation.warm_start
+        if best is None or evaluation.holdout_mae < best.holdout_mae:
+            selection.spec = spec
+            selection.evaluation = evaluation
+
+    return selection
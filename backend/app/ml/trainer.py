@@ -1,92 +1,199 @@
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from time import process_time
 
 import numpy as np
-from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_absolute_error
 from statsmodels.tsa.arima.model import ARIMA
 
+from app.ml.baselines import (
+    BaselineForecaster,
+    fit_naive,
+    fit_seasonal_naive,
+    fit_simple_exponential_smoothing,
+)
+from app.ml.batch_trend import MIN_HOLDOUT_LENGTH, LinearTrend, holdout_train_size, train_linear_trends
+from app.ml.param_cache import ArimaOrder, ArimaWarmStart
+from app.ml.registry import ModelContext, ModelEvaluation, ModelSpec, register_model, select_model
+
+ARIMA_ORDER: ArimaOrder = (1, 1, 1)
+# Stop trying costlier models once holdout MAE is within 1% of the mean price.
+DEFAULT_MAE_TOLERANCE = 0.01
+
 
 @dataclass(slots=True)
 class TrainedForecastModel:
     model_name: str
-    linear_model: LinearRegression | None
+    linear_model: LinearTrend | None
     arima_result: object | None
     mae: float
+    arima_warm_start: ArimaWarmStart | None = None
+    optimizer_iterations: int = 0
+    baseline: BaselineForecaster | None = None
+    model_seconds: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class LinearCandidate:
+    """Holdout MAE and full-history fit of the linear-trend model for one series."""
+
+    holdout_mae: float
+    full_trend: LinearTrend
+
+
+def linear_candidates(series: list[np.ndarray]) -> list[LinearCandidate]:
+    """Fit the linear-trend model for many series in one vectorized pass."""
+    if not series:
+        return []
+    batch = train_linear_trends(series)
+    return [
+        LinearCandidate(holdout_mae=float(batch.holdout_mae[index]), full_trend=batch.trend(index))
+        for index in range(len(series))
+    ]
+
 
+def _fit_arima(values: np.ndarray, start_params: list[float] | np.ndarray | None = None) -> object:
+    """Fit ARIMA, starting the optimizer from ``start_params`` when given.
 
-def _train_linear_regression(prices: list[float], train_size: int) -> tuple[LinearRegression, float]:
-    x_all = np.arange(len(prices), dtype=float).reshape(-1, 1)
-    y_all = np.array(prices, dtype=float)
+    A warm start that fails to converge or errors is retried from scratch.
+    """
+    if start_params is not None:
+        try:
+            fitted = ARIMA(values, order=ARIMA_ORDER).fit(start_params=np.asarray(start_params, dtype=float))
+            if fitted.mle_retvals.get("converged", True):
+                return fitted
+        except Exception:
+            pass
+    return ARIMA(values, order=ARIMA_ORDER).fit()
 
-    model = LinearRegression()
-    model.fit(x_all[:train_size], y_all[:train_size])
 
-    predictions = model.predict(x_all[train_size:])
-    mae = float(mean_absolute_error(y_all[train_size:], predictions))
-    return model, mae
+def _optimizer_iterations(fitted: object) -> int:
+    return int(getattr(fitted, "mle_retvals", {}).get("iterations", 0))
 
 
-def _train_arima(prices: list[float], train_size: int) -> tuple[object, float]:
+def _train_arima(prices: list[float], train_size: int, start_params: list[float] | None = None) -> tuple[object, float]:
     train_values = np.array(prices[:train_size], dtype=float)
     test_values = np.array(prices[train_size:], dtype=float)
 
-    fitted = ARIMA(train_values, order=(1, 1, 1)).fit()
+    fitted = _fit_arima(train_values, start_params)
     forecast = fitted.forecast(steps=len(test_values))
     mae = float(mean_absolute_error(test_values, forecast))
     return fitted, mae
 
 
-def _fit_linear_full(prices: list[float]) -> LinearRegression:
-    """Retrain LinearRegression on the entire dataset for production forecasting."""
-    x_all = np.arange(len(prices), dtype=float).reshape(-1, 1)
-    y_all = np.array(prices, dtype=float)
-    model = LinearRegression()
-    model.fit(x_all, y_all)
-    return model
+def _fit_arima_full(prices: list[float], start_params: np.ndarray | None = None) -> object:
+    """Retrain ARIMA on the entire dataset for production forecasting.
 
+    ``start_params`` is normally the holdout fit's optimum, which is already
+    close to the full-data optimum.
+    """
+    return _fit_arima(np.array(prices, dtype=float), start_params)
 
-def _fit_arima_full(prices: list[float]) -> object:
-    """Retrain ARIMA on the entire dataset for production forecasting."""
-    return ARIMA(np.array(prices, dtype=float), order=(1, 1, 1)).fit()
 
+def _linear_model(trend: LinearTrend) -> TrainedForecastModel:
+    return TrainedForecastModel(model_name="linear_regression", linear_model=trend, arima_result=None, mae=0.0)
 
-def train_best_model(prices: list[float]) -> TrainedForecastModel:
-    if len(prices) < 8:
-        model = _fit_linear_full(prices)
-        return TrainedForecastModel(model_name="linear_regression", linear_model=model, arima_result=None, mae=0.0)
 
-    train_size = max(5, int(len(prices) * 0.8))
-    if train_size >= len(prices):
-        train_size = len(prices) - 1
+def _evaluate_linear(context: ModelContext) -> ModelEvaluation:
+    trend = context.linear.full_trend
+    return ModelEvaluation(holdout_mae=context.linear.holdout_mae, refit=lambda: _linear_model(trend))
 
-    _, linear_mae = _train_linear_regression(prices, train_size)
 
-    try:
-        _, arima_mae = _train_arima(prices, train_size)
-    except Exception:
-        # ARIMA failed — use linear regression retrained on full data
-        full_model = _fit_linear_full(prices)
-        return TrainedForecastModel(
-            model_name="linear_regression",
-            linear_model=full_model,
-            arima_result=None,
-            mae=linear_mae,
-        )
+def _evaluate_arima(context: ModelContext) -> ModelEvaluation:
+    start_params = None
+    if context.warm_start is not None and context.warm_start.is_compatible(context.prices, ARIMA_ORDER):
+        start_params = context.warm_start.params
 
-    # Pick winner, then retrain on full data for production use
-    if arima_mae <= linear_mae:
-        full_arima = _fit_arima_full(prices)
+    holdout_arima, mae = _train_arima(context.prices, context.train_size, start_params)
+
+    def refit() -> TrainedForecastModel:
+        full_arima = _fit_arima_full(context.prices, holdout_arima.params)
         return TrainedForecastModel(
             model_name="arima_1_1_1",
             linear_model=None,
             arima_result=full_arima,
-            mae=arima_mae,
+            mae=0.0,
+            arima_warm_start=ArimaWarmStart.from_fit(ARIMA_ORDER, full_arima.params, context.prices),
+            optimizer_iterations=_optimizer_iterations(full_arima),
+        )
+
+    return ModelEvaluation(
+        holdout_mae=mae,
+        refit=refit,
+        warm_start=ArimaWarmStart.from_fit(ARIMA_ORDER, holdout_arima.params, context.train_values),
+        optimizer_iterations=_optimizer_iterations(holdout_arima),
+    )
+
+
+def _baseline_evaluator(
+    name: str, fit: Callable[[np.ndarray], BaselineForecaster]
+) -> Callable[[ModelContext], ModelEvaluation]:
+    def evaluate(context: ModelContext) -> ModelEvaluation:
+        holdout = fit(context.train_values).forecast(len(context.test_values))
+        mae = float(np.mean(np.abs(context.test_values - holdout)))
+        return ModelEvaluation(
+            holdout_mae=mae,
+            refit=lambda: TrainedForecastModel(
+                model_name=name, linear_model=None, arima_result=None, mae=0.0, baseline=fit(context.prices)
+            ),
         )
 
-    full_linear = _fit_linear_full(prices)
-    return TrainedForecastModel(
-        model_name="linear_regression",
-        linear_model=full_linear,
-        arima_result=None,
-        mae=linear_mae,
+    return evaluate
+
+
+register_model(ModelSpec(name="naive", cost=1.0, evaluate=_baseline_evaluator("naive", fit_naive)))
+register_model(
+    ModelSpec(name="seasonal_naive_7", cost=1.0, evaluate=_baseline_evaluator("seasonal_naive_7", fit_seasonal_naive))
+)
+register_model(ModelSpec(name="ses", cost=2.0, evaluate=_baseline_evaluator("ses", fit_simple_exponential_smoothing)))
+register_model(ModelSpec(name="linear_regression", cost=2.0, evaluate=_evaluate_linear))
+register_model(ModelSpec(name="arima_1_1_1", cost=100.0, evaluate=_evaluate_arima))
+
+
+def train_best_model(
+    prices: list[float],
+    *,
+    warm_start: ArimaWarmStart | None = None,
+    linear: LinearCandidate | None = None,
+    tolerance: float = DEFAULT_MAE_TOLERANCE,
+    max_cost: float | None = None,
+) -> TrainedForecastModel:
+    """Pick the registered model with the lowest MAE on an 80/20 split.
+
+    Candidates run cheapest first; once one is within ``tolerance`` of the
+    mean holdout price, costlier ones are skipped.  ``max_cost`` excludes
+    expensive candidates outright (the engine sets it once a run's CPU
+    budget is spent).
+
+    ``warm_start`` holds ARIMA parameters from a previous fit of the same
+    pair; it seeds the holdout fit when it is still compatible with
+    ``prices``.  The returned model carries fresh parameters for next time
+    whenever ARIMA was evaluated.  ``linear`` is the series' entry from
+    :func:`linear_candidates` when the caller has already fitted the linear
+    trend as part of a batch.
+    """
+    prices = np.asarray(prices, dtype=float)
+    if linear is None:
+        linear = linear_candidates([prices])[0]
+
+    if len(prices) < MIN_HOLDOUT_LENGTH:
+        return _linear_model(linear.full_trend)
+
+    context = ModelContext(
+        prices=prices, train_size=holdout_train_size(len(prices)), linear=linear, warm_start=warm_start
     )
+    selection = select_model(context, tolerance=tolerance, max_cost=max_cost)
+    if selection.spec is None:
+        return _linear_model(linear.full_trend)
+
+    # Retrain the winner on full data for production use
+    started = process_time()
+    trained = selection.evaluation.refit()
+    selection.model_seconds[selection.spec.name] += process_time() - started
+
+    trained.mae = selection.evaluation.holdout_mae
+    trained.model_seconds = selection.model_seconds
+    trained.optimizer_iterations += selection.optimizer_iterations
+    if trained.arima_warm_start is None:
+        trained.arima_warm_start = selection.warm_start
+    return trained
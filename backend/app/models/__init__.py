@@ -1,10 +1,15 @@
 from app.models.commodity import Commodity
 from app.models.daily_price import DailyPrice
+from app.models.forecast_fit_state import ForecastFitState
 from app.models.harvest_record import HarvestRecord
+from app.models.latest_price_snapshot import LatestPriceSnapshot
 from app.models.market import Market
 from app.models.price_alert import PriceAlert
 from app.models.price_forecast import PriceForecast
+from app.models.price_rollup import DailyPriceRollup, MonthlyPriceRollup, WeeklyPriceRollup
+from app.models.price_spike import PriceSpike
 from app.models.region import Region
+from app.models.rolling_price_stat import RollingPriceStat
 from app.models.scrape_log import ScrapeLog
 from app.models.user import User
 from app.models.vendor import Vendor
@@ -15,6 +20,13 @@ __all__ = [
     "Market",
     "DailyPrice",
     "PriceForecast",
+    "ForecastFitState",
+    "LatestPriceSnapshot",
+    "DailyPriceRollup",
+    "WeeklyPriceRollup",
+    "MonthlyPriceRollup",
+    "RollingPriceStat",
+    "PriceSpike",
     "ScrapeLog",
     "User",
     "Vendor",
@@ -1,4 +1,6 @@
-from sqlalchemy import Index, String
+from decimal import Decimal
+
+from sqlalchemy import Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, TimestampMixin
@@ -16,3 +18,5 @@ class Commodity(TimestampMixin, Base):
     category: Mapped[str] = mapped_column(String(50), nullable=False)
     unit: Mapped[str] = mapped_column(String(20), nullable=False)
     image_url: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Suggested retail price cap; ingested prices above it raise a ceiling_breach alert.
+    price_ceiling: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True)
@@ -4,8 +4,11 @@ from decimal import Decimal
 from sqlalchemy import Date, ForeignKey, Index, Numeric, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
+from app.config import get_settings
 from app.models.base import Base, TimestampMixin
 
+settings = get_settings()
+
 
 class DailyPrice(TimestampMixin, Base):
     __tablename__ = "daily_prices"
@@ -18,6 +21,10 @@ class DailyPrice(TimestampMixin, Base):
             name="uq_daily_prices_commodity_market_date_source",
         ),
         Index("ix_daily_prices_date_commodity_region", "date", "commodity_id", "region_id"),
+        # Lets the forecast loader stream each pair's series in order without a sort.
+        Index("ix_daily_prices_commodity_region_date", "commodity_id", "region_id", "date"),
+        # Monthly RANGE partitions on PostgreSQL; see app.utils.partitions.
+        {"postgresql_partition_by": "RANGE (date)"} if settings.daily_prices_partitioned else {},
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -32,5 +39,8 @@ class DailyPrice(TimestampMixin, Base):
     price_avg: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True)
     price_prevailing: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
 
-    date: Mapped[dt_date] = mapped_column(Date, nullable=False, index=True)
+    # A partitioned table's primary key must include the partition key.
+    date: Mapped[dt_date] = mapped_column(
+        Date, nullable=False, index=True, primary_key=settings.daily_prices_partitioned
+    )
     source: Mapped[str] = mapped_column(String(40), nullable=False)
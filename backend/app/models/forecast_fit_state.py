@@ -0,0 +1,30 @@
+from datetime import date, datetime
+
+from sqlalchemy import JSON, Date, DateTime, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ForecastFitState(Base):
+    """Fingerprint of the price history used for a pair's most recent forecast fit."""
+
+    __tablename__ = "forecast_fit_states"
+    __table_args__ = (UniqueConstraint("commodity_id", "region_id", name="uq_forecast_fit_states_pair"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    commodity_id: Mapped[int] = mapped_column(ForeignKey("commodities.id", ondelete="CASCADE"), nullable=False)
+    region_id: Mapped[int] = mapped_column(ForeignKey("regions.id", ondelete="CASCADE"), nullable=False)
+
+    last_price_date: Mapped[date] = mapped_column(Date, nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # None when the pair was too short to fit or its fit failed; the fingerprint is still
+    # recorded so the pair is only revisited once its history changes.
+    model_used: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    # Fitted ARIMA parameters reused to warm-start the next fit (see app.ml.param_cache).
+    model_params: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+
+    fitted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -0,0 +1,38 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, Numeric, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class LatestPriceSnapshot(Base):
+    """Per commodity and market price totals for the two most recent dates in ``daily_prices``.
+
+    Rebuilt by ``refresh_latest_price_snapshot`` after every ingestion so the
+    latest-price list and the price board read a few thousand rows instead of
+    aggregating the full history.  Sums and counts (rather than averages) let
+    readers roll markets up to regions or commodities exactly.
+    """
+
+    __tablename__ = "latest_price_snapshots"
+    __table_args__ = (
+        UniqueConstraint("commodity_id", "market_id", name="uq_latest_price_snapshots_commodity_market"),
+        Index("ix_latest_price_snapshots_region_commodity", "region_id", "commodity_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    commodity_id: Mapped[int] = mapped_column(ForeignKey("commodities.id", ondelete="CASCADE"), nullable=False)
+    market_id: Mapped[int] = mapped_column(ForeignKey("markets.id", ondelete="CASCADE"), nullable=False, index=True)
+    region_id: Mapped[int] = mapped_column(ForeignKey("regions.id", ondelete="CASCADE"), nullable=False)
+
+    latest_date: Mapped[date] = mapped_column(Date, nullable=False)
+    latest_price_sum: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    latest_price_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    previous_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    previous_price_sum: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    previous_price_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
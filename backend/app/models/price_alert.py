@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy import Date, DateTime, ForeignKey, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, TimestampMixin
@@ -24,4 +24,6 @@ class PriceAlert(TimestampMixin, Base):
     threshold_price: Mapped[float | None] = mapped_column(Numeric(12, 2), nullable=True)
     message: Mapped[str] = mapped_column(Text, nullable=False)
     triggered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Date of the price that triggered the alert; ingestion raises at most one alert per type and date.
+    price_date: Mapped[date | None] = mapped_column(Date, nullable=True, index=True)
     is_resolved: Mapped[bool] = mapped_column(default=False, nullable=False)
@@ -0,0 +1,56 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, Numeric, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column
+
+from app.models.base import Base
+
+
+class PriceRollupMixin:
+    """Prevailing-price aggregates for one commodity and region over one period.
+
+    Sums, counts and the sum of squares (rather than averages) let readers
+    combine periods, regions or commodities exactly and derive the mean and
+    variance of any combination.  Maintained by ``app.services.rollup_service``.
+    """
+
+    __rollup_grain__: str
+
+    @declared_attr.directive
+    def __table_args__(cls) -> tuple:
+        table = f"price_rollups_{cls.__rollup_grain__}"
+        return (
+            UniqueConstraint("commodity_id", "region_id", "period_start", name=f"uq_{table}_commodity_region_period"),
+            Index(f"ix_{table}_period_commodity", "period_start", "commodity_id"),
+        )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    commodity_id: Mapped[int] = mapped_column(ForeignKey("commodities.id", ondelete="CASCADE"), nullable=False)
+    region_id: Mapped[int] = mapped_column(ForeignKey("regions.id", ondelete="CASCADE"), nullable=False, index=True)
+    period_start: Mapped[date] = mapped_column(Date, nullable=False)
+
+    price_sum: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False)
+    price_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    price_min: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    price_max: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    price_sum_sq: Mapped[Decimal] = mapped_column(Numeric(24, 4), nullable=False)
+
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class DailyPriceRollup(PriceRollupMixin, Base):
+    __tablename__ = "price_rollups_daily"
+    __rollup_grain__ = "daily"
+
+
+class WeeklyPriceRollup(PriceRollupMixin, Base):
+    """Weeks start on Monday, matching ``date_trunc('week', ...)``."""
+
+    __tablename__ = "price_rollups_weekly"
+    __rollup_grain__ = "weekly"
+
+
+class MonthlyPriceRollup(PriceRollupMixin, Base):
+    __tablename__ = "price_rollups_monthly"
+    __rollup_grain__ = "monthly"
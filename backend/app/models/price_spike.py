@@ -0,0 +1,35 @@
+from datetime import date as dt_date
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class PriceSpike(Base):
+    """A price more than ``SPIKE_THRESHOLD_SIGMA`` rolling standard deviations from its rolling mean.
+
+    Recorded by ``app.services.rolling_stats_service`` as prices are
+    ingested, with the window statistics as of that row.
+    """
+
+    __tablename__ = "price_spikes"
+    __table_args__ = (
+        Index("ix_price_spikes_date", "date"),
+        Index("ix_price_spikes_commodity_region_date", "commodity_id", "region_id", "date"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    commodity_id: Mapped[int] = mapped_column(ForeignKey("commodities.id", ondelete="CASCADE"), nullable=False)
+    region_id: Mapped[int] = mapped_column(ForeignKey("regions.id", ondelete="CASCADE"), nullable=False)
+    market_id: Mapped[int] = mapped_column(ForeignKey("markets.id", ondelete="CASCADE"), nullable=False)
+    source: Mapped[str] = mapped_column(String(40), nullable=False)
+    date: Mapped[dt_date] = mapped_column(Date, nullable=False)
+
+    price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    rolling_mean: Mapped[float] = mapped_column(Float, nullable=False)
+    rolling_std: Mapped[float] = mapped_column(Float, nullable=False)
+
+    detected_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
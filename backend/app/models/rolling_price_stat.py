@@ -0,0 +1,34 @@
+from datetime import date, datetime
+
+from sqlalchemy import JSON, Date, DateTime, Float, ForeignKey, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class RollingPriceStat(Base):
+    """Running window over a commodity/region pair's most recent prevailing prices.
+
+    ``window_values`` holds the last ``SPIKE_WINDOW_ROWS`` prices (oldest
+    first) so the value leaving the window is known; the running sum and sum
+    of squares give the mean and standard deviation without rescanning.
+    ``last_date`` is the date of the newest row folded in.  Maintained by
+    ``app.services.rolling_stats_service``.
+    """
+
+    __tablename__ = "rolling_price_stats"
+    __table_args__ = (UniqueConstraint("commodity_id", "region_id", name="uq_rolling_price_stats_pair"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    commodity_id: Mapped[int] = mapped_column(ForeignKey("commodities.id", ondelete="CASCADE"), nullable=False)
+    region_id: Mapped[int] = mapped_column(ForeignKey("regions.id", ondelete="CASCADE"), nullable=False)
+
+    window_values: Mapped[list[float]] = mapped_column(JSON, nullable=False, default=list)
+    window_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    window_sum_sq: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    last_date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -13,6 +13,12 @@ class ScrapeLog(Base):
     source: Mapped[str] = mapped_column(String(40), nullable=False, index=True)
     status: Mapped[str] = mapped_column(String(20), nullable=False)
     rows_ingested: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Scraped rows dropped because a commodity, market or region name did not resolve.
+    rows_unmatched: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # How the ingested rows merged: new, existing with different prices, or existing and identical.
+    rows_inserted: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rows_changed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rows_unchanged: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     duration_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
     executed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
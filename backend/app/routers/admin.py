@@ -12,8 +12,11 @@ router = APIRouter(prefix="/admin/scrape", tags=["Admin"], dependencies=[Depends
 
 
 @router.post("/trigger", response_model=ScrapeTriggerResponse)
-async def trigger_scrape(source: str = Query(default="DA", pattern="^(DA|PSA|da|psa)$")) -> ScrapeTriggerResponse:
-    result = await run_ingestion_pipeline(source=source)
+async def trigger_scrape(
+    source: str = Query(default="DA", pattern="^(DA|PSA|BANTAY_PRESYO|ALL|da|psa|bantay_presyo|all)$"),
+    force: bool = Query(default=False, description="Load upstream pages even if unchanged since the last load"),
+) -> ScrapeTriggerResponse:
+    result = await run_ingestion_pipeline(source=source, force=force)
     return ScrapeTriggerResponse(**result)
 
 
@@ -1,8 +1,9 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import cached
 from app.database import get_db_session
 from app.schemas.analytics import (
     CheapestRegionResponse,
@@ -25,12 +26,18 @@ router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
 @router.get("/weekly-variance", response_model=list[WeeklyVarianceResponse])
-async def weekly_variance(db: AsyncSession = Depends(get_db_session)) -> list[WeeklyVarianceResponse]:
-    rows = await get_weekly_variance(db)
+@cached("analytics:weekly-variance")
+async def weekly_variance(
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
+    db: AsyncSession = Depends(get_db_session),
+) -> list[WeeklyVarianceResponse]:
+    rows = await get_weekly_variance(db, from_date=from_date, to_date=to_date)
     return [WeeklyVarianceResponse(**row) for row in rows]
 
 
 @router.get("/regional-comparison", response_model=list[RegionalComparisonResponse])
+@cached("analytics:regional-comparison")
 async def regional_comparison(
     commodity_id: int | None = None,
     from_date: date | None = Query(default=None, alias="from"),
@@ -48,15 +55,37 @@ async def regional_comparison(
 
 @router.get("/price-spikes", response_model=list[PriceSpikeResponse])
 async def price_spikes(
+    response: Response,
     commodity_id: int | None = None,
     region_id: int | None = None,
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
     db: AsyncSession = Depends(get_db_session),
 ) -> list[PriceSpikeResponse]:
-    rows = await get_price_spikes(db, commodity_id=commodity_id, region_id=region_id)
-    return [PriceSpikeResponse(**row) for row in rows]
+    """Recorded spikes, newest first; the total across all pages is in ``X-Total-Count``."""
+    items, total = await _cached_price_spikes(
+        db=db,
+        commodity_id=commodity_id,
+        region_id=region_id,
+        from_date=from_date,
+        to_date=to_date,
+        limit=limit,
+        offset=offset,
+    )
+    response.headers["X-Total-Count"] = str(total)
+    return items
+
+
+@cached("analytics:price-spikes")
+async def _cached_price_spikes(*, db: AsyncSession, **filters) -> tuple[list[PriceSpikeResponse], int]:
+    rows, total = await get_price_spikes(db, **filters)
+    return [PriceSpikeResponse(**row) for row in rows], total
 
 
 @router.get("/cheapest-region/{commodity_id}", response_model=CheapestRegionResponse)
+@cached("analytics:cheapest-region")
 async def cheapest_region(commodity_id: int, db: AsyncSession = Depends(get_db_session)) -> CheapestRegionResponse:
     row = await get_cheapest_region(db, commodity_id=commodity_id)
     if row is None:
@@ -65,18 +94,27 @@ async def cheapest_region(commodity_id: int, db: AsyncSession = Depends(get_db_s
 
 
 @router.get("/rolling-average/{commodity_id}", response_model=list[RollingAverageResponse])
+@cached("analytics:rolling-average")
 async def rolling_average(
     commodity_id: int,
     region_id: int | None = None,
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
     db: AsyncSession = Depends(get_db_session),
 ) -> list[RollingAverageResponse]:
-    rows = await get_rolling_average(db, commodity_id=commodity_id, region_id=region_id)
+    rows = await get_rolling_average(
+        db, commodity_id=commodity_id, region_id=region_id, from_date=from_date, to_date=to_date
+    )
     return [RollingAverageResponse(**row) for row in rows]
 
 
 @router.get("/seasonal/{commodity_id}", response_model=list[SeasonalPatternResponse])
+@cached("analytics:seasonal")
 async def seasonal_pattern(
-    commodity_id: int, db: AsyncSession = Depends(get_db_session)
+    commodity_id: int,
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
+    db: AsyncSession = Depends(get_db_session),
 ) -> list[SeasonalPatternResponse]:
-    rows = await get_seasonal_pattern(db, commodity_id=commodity_id)
+    rows = await get_seasonal_pattern(db, commodity_id=commodity_id, from_date=from_date, to_date=to_date)
     return [SeasonalPatternResponse(**row) for row in rows]
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import cached
 from app.database import get_db_session
 from app.models import Commodity
 from app.schemas import CommodityResponse
@@ -10,6 +11,7 @@ router = APIRouter(prefix="/commodities", tags=["Commodities"])
 
 
 @router.get("", response_model=list[CommodityResponse])
+@cached("commodities")
 async def list_commodities(
     search: str | None = Query(default=None, max_length=100),
     category: str | None = Query(default=None),
@@ -22,4 +24,4 @@ async def list_commodities(
         stmt = stmt.where(Commodity.category == category)
     stmt = stmt.order_by(Commodity.name.asc())
     result = await db.execute(stmt)
-    return list(result.scalars().all())
+    return [CommodityResponse.model_validate(commodity) for commodity in result.scalars().all()]
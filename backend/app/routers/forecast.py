@@ -1,15 +1,39 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import cached
 from app.database import get_db_session
 from app.schemas.forecast import ForecastPointResponse, ForecastSummaryResponse
 from app.services.forecast_service import get_forecast_by_commodity, get_forecast_summary
+from app.services.job_tracker import FORECAST_JOB, job_tracker
 
 router = APIRouter(prefix="/forecast", tags=["Forecast"])
 
+# Seconds clients are told to wait while the startup forecast is still running.
+FORECAST_RETRY_AFTER_SECONDS = 30
+
+
+def _forecasts_pending(response: Response) -> bool:
+    """Whether the startup forecast job is still running; flags the response if so."""
+    if not job_tracker.is_active(FORECAST_JOB):
+        return False
+    response.headers["Retry-After"] = str(FORECAST_RETRY_AFTER_SECONDS)
+    response.headers["X-Forecast-Status"] = "pending"
+    return True
+
 
 @router.get("/summary", response_model=list[ForecastSummaryResponse])
-async def forecast_summary(db: AsyncSession = Depends(get_db_session)) -> list[ForecastSummaryResponse]:
+async def forecast_summary(
+    response: Response, db: AsyncSession = Depends(get_db_session)
+) -> list[ForecastSummaryResponse]:
+    if _forecasts_pending(response):
+        return []
+    return await _cached_forecast_summary(db=db)
+
+
+# Cached below the pending check so placeholder responses are never stored.
+@cached("forecast:summary")
+async def _cached_forecast_summary(*, db: AsyncSession) -> list[ForecastSummaryResponse]:
     rows = await get_forecast_summary(db)
     return [ForecastSummaryResponse(**row) for row in rows]
 
@@ -17,8 +41,11 @@ async def forecast_summary(db: AsyncSession = Depends(get_db_session)) -> list[F
 @router.get("/{commodity_id}", response_model=list[ForecastPointResponse])
 async def forecast_by_commodity(
     commodity_id: int,
+    response: Response,
     region_id: int | None = None,
     db: AsyncSession = Depends(get_db_session),
 ) -> list[ForecastPointResponse]:
+    if _forecasts_pending(response):
+        return []
     rows = await get_forecast_by_commodity(db, commodity_id=commodity_id, region_id=region_id)
     return [ForecastPointResponse.model_validate(row) for row in rows]
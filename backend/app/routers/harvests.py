@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.data_version import mark_data_changed
 from app.database import get_db_session
 from app.dependencies.auth import require_admin
 from app.models.commodity import Commodity
@@ -113,6 +114,7 @@ async def create_harvest(
     db.add(record)
     await db.commit()
     await db.refresh(record)
+    mark_data_changed("harvest created")
     return {"id": record.id, "message": "Harvest record created"}
 
 
@@ -128,3 +130,4 @@ async def delete_harvest(
         raise HTTPException(404, "Harvest record not found")
     await db.delete(record)
     await db.commit()
+    mark_data_changed("harvest deleted")
@@ -1,4 +1,8 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.cache import response_cache
+from app.services.job_tracker import JobStatus, job_tracker
 
 router = APIRouter(tags=["Health"])
 
@@ -6,3 +10,25 @@ router = APIRouter(tags=["Health"])
 @router.get("/health")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def readiness() -> JSONResponse:
+    """Report startup job progress; 503 until seeding and the initial forecast have succeeded."""
+    jobs = job_tracker.jobs
+    if job_tracker.is_ready():
+        status = "ready"
+    elif any(job.status is JobStatus.FAILED for job in jobs.values()):
+        status = "failed"
+    else:
+        status = "starting"
+    return JSONResponse(
+        status_code=200 if status == "ready" else 503,
+        content={"status": status, "jobs": {name: job.to_dict() for name, job in jobs.items()}},
+    )
+
+
+@router.get("/health/cache")
+async def cache_stats() -> dict[str, int | float]:
+    """Hit/miss counters for the in-process response cache."""
+    return {**response_cache.stats.to_dict(), "entries": len(response_cache)}
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import cached
 from app.database import get_db_session
 from app.models.market import Market
 from app.schemas.market import MarketResponse
@@ -12,6 +13,7 @@ router = APIRouter(prefix="/markets", tags=["markets"])
 
 
 @router.get("", response_model=list[MarketResponse])
+@cached("markets")
 async def list_markets(db: AsyncSession = Depends(get_db_session)):
     result = await db.execute(select(Market).order_by(Market.name))
-    return result.scalars().all()
+    return [MarketResponse.model_validate(market) for market in result.scalars().all()]
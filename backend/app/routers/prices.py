@@ -1,6 +1,6 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db_session
@@ -10,7 +10,13 @@ from app.schemas.price import (
     PaginatedLatestPriceResponse,
     PriceHistoryResponse,
 )
-from app.services.price_service import get_daily_prices, get_latest_prices, get_price_history
+from app.services.price_service import (
+    get_daily_prices,
+    get_latest_prices,
+    get_latest_prices_after,
+    get_price_history,
+)
+from app.utils.cursor import decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/prices", tags=["Prices"])
 
@@ -41,8 +47,32 @@ async def list_latest_prices(
     region_id: int | None = Query(default=None, description="Filter by region ID"),
     limit: int = Query(default=20, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    pagination: str = Query(default="offset", pattern="^(offset|cursor)$", description="Pagination mode"),
+    cursor: str | None = Query(default=None, max_length=512, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db_session),
 ) -> PaginatedLatestPriceResponse:
+    if pagination == "cursor" or cursor is not None:
+        try:
+            after = decode_cursor(cursor, size=2) if cursor else None
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        items, next_key, total = await get_latest_prices_after(
+            db,
+            search=search,
+            category=category,
+            region_id=region_id,
+            limit=limit,
+            after=after,
+        )
+        return PaginatedLatestPriceResponse(
+            items=[LatestPriceResponse(**row) for row in items],
+            total=total,
+            limit=limit,
+            offset=0,
+            next_cursor=encode_cursor(next_key) if next_key is not None else None,
+            total_is_estimate=True,
+        )
+
     items, total = await get_latest_prices(
         db,
         search=search,
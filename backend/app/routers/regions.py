@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import cached
 from app.database import get_db_session
 from app.models import Region
 from app.schemas import RegionResponse
@@ -10,6 +11,7 @@ router = APIRouter(prefix="/regions", tags=["Barangays"])
 
 
 @router.get("", response_model=list[RegionResponse])
+@cached("regions")
 async def list_regions(db: AsyncSession = Depends(get_db_session)) -> list[RegionResponse]:
     result = await db.execute(select(Region).order_by(Region.name.asc()))
-    return list(result.scalars().all())
+    return [RegionResponse.model_validate(region) for region in result.scalars().all()]
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.data_version import mark_data_changed
 from app.database import get_db_session
 from app.dependencies.auth import require_admin
 from app.models.market import Market
@@ -67,6 +68,7 @@ async def create_vendor(
     db.add(vendor)
     await db.commit()
     await db.refresh(vendor)
+    mark_data_changed("vendor created")
     return {"id": vendor.id, "name": vendor.name, "message": "Vendor created"}
 
 
@@ -82,3 +84,4 @@ async def delete_vendor(
         raise HTTPException(404, "Vendor not found")
     await db.delete(vendor)
     await db.commit()
+    mark_data_changed("vendor deleted")
@@ -7,6 +7,16 @@ class ScrapeTriggerResponse(BaseModel):
     status: str
     source: str
     rows_ingested: int
+    alerts_created: int = 0
+    # Per-source outcome: "success", "unchanged" (skipped, upstream not modified) or "failed".
+    sources: dict[str, str] = {}
+    rows_unmatched: int = 0
+    # Ingested rows that were new, existing with different prices, or already up to date.
+    rows_inserted: int = 0
+    rows_changed: int = 0
+    rows_unchanged: int = 0
+    # Most frequent unresolved names, as "kind: name (rows)".
+    unmatched_names: list[str] = []
 
 
 class ScrapeLogResponse(BaseModel):
@@ -14,6 +24,10 @@ class ScrapeLogResponse(BaseModel):
     source: str
     status: str
     rows_ingested: int
+    rows_unmatched: int = 0
+    rows_inserted: int = 0
+    rows_changed: int = 0
+    rows_unchanged: int = 0
     error_message: str | None
     duration_seconds: float | None
     executed_at: datetime
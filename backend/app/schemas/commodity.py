@@ -1,4 +1,5 @@
 from datetime import datetime
+from decimal import Decimal
 
 from pydantic import BaseModel
 
@@ -9,6 +10,7 @@ class CommodityResponse(BaseModel):
     category: str
     unit: str
     image_url: str | None
+    price_ceiling: Decimal | None = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -35,6 +35,9 @@ class PaginatedLatestPriceResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    # Cursor pagination only: token for the next page, and whether ``total`` is cached.
+    next_cursor: str | None = None
+    total_is_estimate: bool = False
 
 
 class PriceHistoryResponse(BaseModel):
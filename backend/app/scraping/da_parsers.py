@@ -0,0 +1,74 @@
+"""Interchangeable HTML table parsers for the DA price monitoring page.
+
+Each backend returns the stripped ``<td>`` texts of every ``<tr>`` inside a
+``<table>``, in document order, one list per row (empty for header rows),
+matching ``BeautifulSoup.select("table tr")`` with ``get_text(strip=True)``
+per cell.  The C-based backends walk the parsed tree directly instead of
+building BeautifulSoup's Python object model, which dominates parse time on
+the large multi-region pages.  ``lxml`` is a dependency; ``selectolax`` is
+used when installed.
+"""
+
+from collections.abc import Callable
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # pragma: no cover - lxml is in requirements.txt
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+TableRows = list[list[str]]
+RowParser = Callable[[str], TableRows]
+
+# Fastest first; "auto" picks the first one that is installed.
+_PREFERENCE = ("selectolax", "lxml", "html.parser")
+
+
+def parse_rows_html_parser(html: str) -> TableRows:
+    soup = BeautifulSoup(html, "html.parser")
+    return [[cell.get_text(strip=True) for cell in row.find_all("td")] for row in soup.select("table tr")]
+
+
+def parse_rows_lxml(html: str) -> TableRows:
+    if not html.strip():
+        return []
+    root = lxml_html.document_fromstring(html)
+    return [
+        ["".join(text.strip() for text in cell.itertext()) for cell in row.iter("td")]
+        for row in root.xpath("//table//tr")
+    ]
+
+
+def parse_rows_selectolax(html: str) -> TableRows:
+    tree = LexborHTMLParser(html)
+    return [[cell.text(deep=True, separator="", strip=True) for cell in row.css("td")] for row in tree.css("table tr")]
+
+
+PARSER_BACKENDS: dict[str, RowParser] = {
+    "html.parser": parse_rows_html_parser,
+    "lxml": parse_rows_lxml,
+    "selectolax": parse_rows_selectolax,
+}
+
+
+def available_backends() -> list[str]:
+    installed = {"html.parser": True, "lxml": lxml_html is not None, "selectolax": LexborHTMLParser is not None}
+    return [name for name in _PREFERENCE if installed[name]]
+
+
+def get_row_parser(backend: str = "auto") -> RowParser:
+    """The row parser for ``backend``, or the fastest installed one for ``"auto"``."""
+    available = available_backends()
+    if backend == "auto":
+        return PARSER_BACKENDS[available[0]]
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown DA parser backend {backend!r}; expected one of {', '.join(PARSER_BACKENDS)}")
+    if backend not in available:
+        raise ValueError(f"DA parser backend {backend!r} is not installed")
+    return PARSER_BACKENDS[backend]
@@ -1,4 +1,18 @@
-from app.scraping.types import RawPriceRecord
+"""Normalise scraped prices before loading.
+
+Cleaning works on column batches: the price range filter and rounding are
+array operations, and names are normalised once per distinct value (a feed
+repeats a few hundred commodity, market and region names across every
+row) and scattered back by position.
+"""
+
+from collections.abc import Callable
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from app.scraping.types import PriceRecordBatch, RawPriceRecord
 
 COMMODITY_NAME_MAP = {
     "well milled rice": "Well-Milled Rice",
@@ -6,31 +20,45 @@ COMMODITY_NAME_MAP = {
     "pork liempo": "Pork Liempo",
 }
 
+# Prevailing prices outside (MIN_PRICE, MAX_PRICE] are scrape errors.
+MIN_PRICE = 0.0
+MAX_PRICE = 10000.0
 
+
+@lru_cache(maxsize=8192)
 def normalize_commodity_name(value: str) -> str:
     key = value.strip().lower()
     return COMMODITY_NAME_MAP.get(key, value.strip().title())
 
 
+def _strip(value: str) -> str:
+    return value.strip()
+
+
+def _strip_upper(value: str) -> str:
+    return value.strip().upper()
+
+
+def _map_distinct(values: np.ndarray, transform: Callable[[str], str]) -> np.ndarray:
+    """``transform`` applied to each distinct value once, then broadcast back to every row."""
+    codes, uniques = pd.factorize(values)
+    return np.array([transform(value) for value in uniques], dtype=object)[codes]
+
+
+def clean_price_batch(batch: PriceRecordBatch) -> PriceRecordBatch:
+    prices = batch.price_prevailing
+    batch = batch.take((prices > MIN_PRICE) & (prices <= MAX_PRICE))
+    return PriceRecordBatch(
+        commodity_name=_map_distinct(batch.commodity_name, normalize_commodity_name),
+        market_name=_map_distinct(batch.market_name, _strip),
+        region_code=_map_distinct(batch.region_code, _strip_upper),
+        date=batch.date,
+        price_prevailing=np.round(batch.price_prevailing, 2),
+        price_low=batch.price_low,
+        price_high=batch.price_high,
+        source=batch.source,
+    )
+
+
 def clean_price_records(records: list[RawPriceRecord]) -> list[RawPriceRecord]:
-    cleaned: list[RawPriceRecord] = []
-
-    for record in records:
-        if record.price_prevailing <= 0 or record.price_prevailing > 10000:
-            continue
-
-        normalized_name = normalize_commodity_name(record.commodity_name)
-        cleaned.append(
-            RawPriceRecord(
-                commodity_name=normalized_name,
-                market_name=record.market_name.strip(),
-                region_code=record.region_code.strip().upper(),
-                date=record.date,
-                price_prevailing=round(record.price_prevailing, 2),
-                price_low=record.price_low,
-                price_high=record.price_high,
-                source=record.source,
-            )
-        )
-
-    return cleaned
+    return list(clean_price_batch(PriceRecordBatch.from_records(records)).records())
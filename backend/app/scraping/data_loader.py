@@ -1,69 +1,396 @@
+"""Load cleaned price batches into ``daily_prices``.
+
+Names are resolved to ids column-wise, then the rows are merged in one
+set-based pass.  Batches may arrive as a stream (the PSA extract, one per
+CSV chunk), each resolved as it arrives.  On PostgreSQL the resolved columns
+are ``COPY``-ed into a temporary stage table in ``daily_price_upsert_batch_rows``
+chunks, so a stream is never held in memory, and merged with a single
+``INSERT ... SELECT ... ON CONFLICT``; prices stay ``float64`` until the
+database rounds them to ``numeric``.  Other dialects (SQLite in tests) fall
+back to chunked ``executemany`` upserts.
+
+A conflicting row is only rewritten when one of its prices differs, so a
+rescrape of an unchanged page writes nothing; the snapshot, rollups and
+rolling stats are only refreshed when some row was inserted or changed.
+The keys of those rows are kept server-side in ``daily_price_changes``
+(see ``app.services.price_changes``), never returned as Python rows.
+Everything runs in the caller's transaction, so the pipeline can commit
+prices, alerts and scrape logs together.
+"""
+
+import logging
+from collections import Counter
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+from dataclasses import dataclass, field
 from decimal import Decimal
 
-from sqlalchemy import Select, select
-from sqlalchemy.dialects.postgresql import insert
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Commodity, DailyPrice, Market, Region
-from app.scraping.types import RawPriceRecord
+from app.config import get_settings
+from app.models import DailyPrice
+from app.scraping.name_resolver import NameResolver
+from app.scraping.types import PriceRecordBatch, RawPriceRecord
+from app.services.price_changes import (
+    CHANGE_COLUMNS,
+    daily_price_changes,
+    prepare_price_changes,
+    record_price_changes,
+)
+from app.services.price_service import refresh_latest_price_snapshot
+from app.services.rolling_stats_service import advance_rolling_stats
+from app.services.rollup_service import RollupScope, refresh_rollups
+from app.utils.bulk import copy_records, is_postgresql
 
+settings = get_settings()
+logger = logging.getLogger("agrisenta.ingestion")
 
-async def _lookup_ids(session: AsyncSession, query: Select[tuple]) -> dict[str, int]:
-    result = await session.execute(query)
-    return {key: identifier for key, identifier in result.all()}
+# Columns of a resolved row, in stage-table (COPY) order.
+STAGE_COLUMNS = (
+    "commodity_id",
+    "market_id",
+    "region_id",
+    "date",
+    "source",
+    "price_prevailing",
+    "price_low",
+    "price_high",
+)
+# The ``uq_daily_prices_commodity_market_date_source`` key.
+KEY_COLUMNS = ("commodity_id", "market_id", "date", "source")
+PRICE_COLUMNS = ("price_low", "price_high", "price_avg", "price_prevailing")
 
+_MERGE_SQL = (
+    "INSERT INTO daily_prices (commodity_id, market_id, region_id, date, source, "
+    "price_prevailing, price_low, price_high, price_avg) "
+    "SELECT commodity_id, market_id, region_id, date, source, round(price_prevailing::numeric, 2), "
+    "round(nullif(price_low, 'NaN')::numeric, 2), round(nullif(price_high, 'NaN')::numeric, 2), "
+    "round(price_prevailing::numeric, 2) "
+    "FROM daily_price_stage "
+    "ON CONFLICT ON CONSTRAINT uq_daily_prices_commodity_market_date_source DO UPDATE SET "
+    "price_low = EXCLUDED.price_low, price_high = EXCLUDED.price_high, price_avg = EXCLUDED.price_avg, "
+    "price_prevailing = EXCLUDED.price_prevailing, updated_at = now() "
+    "WHERE (daily_prices.price_prevailing, daily_prices.price_low, daily_prices.price_high, daily_prices.price_avg) "
+    "IS DISTINCT FROM (EXCLUDED.price_prevailing, EXCLUDED.price_low, EXCLUDED.price_high, EXCLUDED.price_avg) "
+    "RETURNING commodity_id, market_id, region_id, date, source"
+)
+# The keys the merge wrote go straight into the changes table, without a round trip.
+_MERGE_CHANGES_SQL = (
+    f"WITH written AS ({_MERGE_SQL}) "
+    "INSERT INTO daily_price_changes (commodity_id, market_id, region_id, date, source) "
+    "SELECT commodity_id, market_id, region_id, date, source FROM written"
+)
 
-async def upsert_daily_prices(session: AsyncSession, records: list[RawPriceRecord]) -> int:
-    if not records:
-        return 0
 
-    commodity_ids = await _lookup_ids(session, select(Commodity.name, Commodity.id))
-    region_ids = await _lookup_ids(session, select(Region.code, Region.id))
-    market_ids = await _lookup_ids(session, select(Market.name, Market.id))
+@dataclass(slots=True)
+class ResolvedPrices:
+    """Rows ready for ``daily_prices``: resolved id columns plus the batch's date, source and prices.
 
-    rows_to_insert: list[dict] = []
+    Prices are ``float64`` with ``NaN`` for a missing low/high, as in
+    :class:`PriceRecordBatch`.
+    """
 
-    for record in records:
-        commodity_id = commodity_ids.get(record.commodity_name)
-        region_id = region_ids.get(record.region_code)
-        market_id = market_ids.get(record.market_name)
+    commodity_id: np.ndarray
+    market_id: np.ndarray
+    region_id: np.ndarray
+    date: np.ndarray
+    source: np.ndarray
+    price_prevailing: np.ndarray
+    price_low: np.ndarray
+    price_high: np.ndarray
 
-        if not (commodity_id and region_id and market_id):
-            continue
+    def __len__(self) -> int:
+        return len(self.date)
+
+    def chunks(self, size: int) -> Iterator["ResolvedPrices"]:
+        for start in range(0, len(self), size):
+            yield ResolvedPrices(*(getattr(self, column)[start : start + size] for column in STAGE_COLUMNS))
+
+    def records(self) -> Iterator[tuple]:
+        """Row tuples in ``STAGE_COLUMNS`` order, as ``COPY`` takes them."""
+        return zip(*(getattr(self, column).tolist() for column in STAGE_COLUMNS), strict=True)
+
+    @classmethod
+    def concat(cls, parts: list["ResolvedPrices"]) -> "ResolvedPrices":
+        return cls(*(np.concatenate([getattr(part, column) for part in parts]) for column in STAGE_COLUMNS))
+
+    def dedupe(self) -> "ResolvedPrices":
+        """Keep the last row per ``daily_prices`` key, for rows gathered from several batches."""
+        keys = pd.DataFrame({column: getattr(self, column) for column in KEY_COLUMNS})
+        keep = ~keys.duplicated(keep="last").to_numpy()
+        return self if keep.all() else ResolvedPrices(*(getattr(self, column)[keep] for column in STAGE_COLUMNS))
+
+
+@dataclass(slots=True)
+class UpsertResult:
+    """What an upsert merged; the keys of the rows it wrote are in ``daily_price_changes``.
+
+    Rows dropped because a name did not resolve are counted per source in
+    ``unmatched_rows`` and per ``(kind, name)`` in ``unmatched_names``.  The
+    rows that were merged are counted per source as ``inserted``, ``changed``
+    or ``unchanged`` (an existing row whose prices already matched).
+    """
+
+    unmatched_rows: Counter[str] = field(default_factory=Counter)
+    unmatched_names: Counter[tuple[str, str]] = field(default_factory=Counter)
+    inserted: Counter[str] = field(default_factory=Counter)
+    changed: Counter[str] = field(default_factory=Counter)
+    unchanged: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def merged(self) -> Counter[str]:
+        """Rows per source that resolved and were merged, whether or not they wrote anything."""
+        return self.inserted + self.changed + self.unchanged
+
+    @property
+    def written(self) -> Counter[str]:
+        """Rows per source that were inserted or changed."""
+        return self.inserted + self.changed
+
+    @property
+    def row_count(self) -> int:
+        return self.merged.total()
+
+
+def _decimal(value: float) -> Decimal | None:
+    # NaN marks a missing low/high in batch columns; PostgreSQL rounds to the column's scale, so round here too.
+    return None if value != value else Decimal(str(round(value, 2)))
+
+
+def _count_unmatched(batch: PriceRecordBatch, resolved: dict[str, tuple[np.ndarray, np.ndarray]]) -> UpsertResult:
+    result = UpsertResult()
+    unknown = np.zeros(len(batch), dtype=bool)
+    for kind, (names, ids) in resolved.items():
+        missing = ids == 0
+        if missing.any():
+            unknown |= missing
+            for name, count in Counter(names[missing].tolist()).items():
+                result.unmatched_names[(kind, name)] += count
+    if unknown.any():
+        result.unmatched_rows.update(Counter(batch.source[unknown].tolist()))
+    return result
+
+
+def _resolve_batch(batch: PriceRecordBatch, resolver: NameResolver) -> tuple[ResolvedPrices, UpsertResult]:
+    """The batch rows whose names all resolve, as id columns, plus a result counting what was dropped."""
+    commodity_column = resolver.commodities.resolve_column(batch.commodity_name)
+    region_column = resolver.regions.resolve_column(batch.region_code)
+    market_column = resolver.markets.resolve_column(batch.market_name)
+    result = _count_unmatched(
+        batch,
+        {
+            "commodity": (batch.commodity_name, commodity_column),
+            "market": (batch.market_name, market_column),
+            "region": (batch.region_code, region_column),
+        },
+    )
+    known = (commodity_column > 0) & (region_column > 0) & (market_column > 0)
+    # Two spellings may resolve to the same row, which one upsert statement may not touch twice.
+    positions = np.flatnonzero(known)
+    keys = pd.DataFrame(
+        {
+            "commodity": commodity_column[positions],
+            "market": market_column[positions],
+            "date": batch.date[positions],
+            "source": batch.source[positions],
+        }
+    )
+    known[positions[keys.duplicated(keep="last").to_numpy()]] = False
+
+    batch = batch.take(known)
+    prices = ResolvedPrices(
+        commodity_id=commodity_column[known],
+        market_id=market_column[known],
+        region_id=region_column[known],
+        date=batch.date,
+        source=batch.source,
+        price_prevailing=batch.price_prevailing,
+        price_low=batch.price_low,
+        price_high=batch.price_high,
+    )
+    return prices, result
 
-        prevailing = Decimal(str(record.price_prevailing))
-        low = Decimal(str(record.price_low)) if record.price_low is not None else None
-        high = Decimal(str(record.price_high)) if record.price_high is not None else None
 
-        rows_to_insert.append(
-            {
+async def _stage_postgresql(session: AsyncSession, prices: ResolvedPrices, *, create: bool) -> None:
+    """``COPY`` ``prices`` into the stage table, creating it first when ``create``."""
+    if create:
+        # ``seq`` orders the rows of a streamed load, so the last row per key wins as in a single batch.
+        await session.execute(
+            text(
+                "CREATE TEMP TABLE daily_price_stage (seq bigserial, commodity_id integer, market_id integer, "
+                "region_id integer, date date, source varchar(40), price_prevailing float8, price_low float8, "
+                "price_high float8) ON COMMIT DROP"
+            )
+        )
+    # Chunks bound how many Python row tuples exist at once; COPY itself streams.
+    for chunk in prices.chunks(settings.daily_price_upsert_batch_rows):
+        await copy_records(session, "daily_price_stage", STAGE_COLUMNS, chunk.records())
+
+
+async def _merge_postgresql(session: AsyncSession, *, dedupe: bool) -> tuple[Counter[str], Counter[str], Counter[str]]:
+    """Merge the stage table in one statement, first dropping superseded rows of a key when ``dedupe``.
+
+    The keys written go into ``daily_price_changes``.  Returns the number of
+    rows inserted or changed, of staged keys that already existed and of
+    superseded rows dropped, per source.
+    """
+    # A fresh temp table has no statistics; without them a large stage gets a poor join plan.
+    await session.execute(text("ANALYZE daily_price_stage"))
+    superseded: Counter[str] = Counter()
+    if dedupe:
+        # Each batch was deduplicated as it was resolved; only keys repeated across batches remain.
+        dropped = await session.execute(
+            text(
+                "DELETE FROM daily_price_stage AS s USING daily_price_stage AS t "
+                "WHERE t.commodity_id = s.commodity_id AND t.market_id = s.market_id "
+                "AND t.date = s.date AND t.source = s.source AND t.seq > s.seq RETURNING s.source"
+            )
+        )
+        superseded.update(dropped.scalars())
+
+    existing = await session.execute(
+        text(
+            "SELECT s.source, count(*) FROM daily_price_stage AS s JOIN daily_prices AS d "
+            "ON d.commodity_id = s.commodity_id AND d.market_id = s.market_id "
+            "AND d.date = s.date AND d.source = s.source GROUP BY s.source"
+        )
+    )
+    existing_by_source = Counter(dict(existing.all()))
+    await session.execute(text(_MERGE_CHANGES_SQL))
+    await session.execute(text("DROP TABLE daily_price_stage"))
+    written = await session.execute(
+        select(daily_price_changes.c.source, func.count()).group_by(daily_price_changes.c.source)
+    )
+    return Counter(dict(written.all())), existing_by_source, superseded
+
+
+async def _merge_executemany(session: AsyncSession, prices: ResolvedPrices) -> tuple[Counter[str], Counter[str]]:
+    table = DailyPrice.__table__
+    statement = sqlite_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(KEY_COLUMNS),
+        set_={column: statement.excluded[column] for column in PRICE_COLUMNS} | {"updated_at": func.now()},
+        where=or_(*(table.c[column].is_distinct_from(statement.excluded[column]) for column in PRICE_COLUMNS)),
+    )
+
+    written: Counter[str] = Counter()
+    existing_by_source: Counter[str] = Counter()
+    for chunk in prices.chunks(settings.daily_price_upsert_batch_rows):
+        # A tuple IN over every key would exceed SQLite's bound-parameter limit; narrow by scope instead.
+        existing = await session.execute(
+            select(*(table.c[column] for column in KEY_COLUMNS + PRICE_COLUMNS)).where(
+                table.c.commodity_id.in_(np.unique(chunk.commodity_id).tolist()),
+                table.c.date.between(min(chunk.date), max(chunk.date)),
+            )
+        )
+        stored = {tuple(row[: len(KEY_COLUMNS)]): tuple(row[len(KEY_COLUMNS) :]) for row in existing}
+
+        chunk_rows = []
+        for commodity_id, market_id, region_id, row_date, source, prevailing, low, high in chunk.records():
+            row = {
                 "commodity_id": commodity_id,
                 "market_id": market_id,
                 "region_id": region_id,
-                "price_prevailing": prevailing,
-                "price_low": low,
-                "price_high": high,
-                "price_avg": prevailing,
-                "date": record.date,
-                "source": record.source,
+                "date": row_date,
+                "source": source,
+                "price_prevailing": _decimal(prevailing),
+                "price_low": _decimal(low),
+                "price_high": _decimal(high),
+                "price_avg": _decimal(prevailing),
             }
-        )
+            key = (commodity_id, market_id, row_date, source)
+            if key in stored:
+                existing_by_source[source] += 1
+                if stored[key] == tuple(row[column] for column in PRICE_COLUMNS):
+                    continue
+            chunk_rows.append(row)
+        if chunk_rows:
+            await session.execute(statement, chunk_rows)
+            await record_price_changes(
+                session, [{column: row[column] for column in CHANGE_COLUMNS} for row in chunk_rows]
+            )
+            written.update(row["source"] for row in chunk_rows)
+    return written, existing_by_source
 
-    if not rows_to_insert:
-        return 0
-
-    statement = insert(DailyPrice).values(rows_to_insert)
-    upsert_statement = statement.on_conflict_do_update(
-        constraint="uq_daily_prices_commodity_market_date_source",
-        set_={
-            "price_low": statement.excluded.price_low,
-            "price_high": statement.excluded.price_high,
-            "price_avg": statement.excluded.price_avg,
-            "price_prevailing": statement.excluded.price_prevailing,
-        },
-    )
 
-    await session.execute(upsert_statement)
-    await session.commit()
+async def _iter_batches(
+    records: list[RawPriceRecord] | PriceRecordBatch | AsyncIterable[PriceRecordBatch],
+) -> AsyncIterator[PriceRecordBatch]:
+    if isinstance(records, PriceRecordBatch):
+        yield records
+    elif isinstance(records, list):
+        yield PriceRecordBatch.from_records(records)
+    else:
+        async for batch in records:
+            yield batch
+
+
+async def upsert_daily_prices(
+    session: AsyncSession,
+    records: list[RawPriceRecord] | PriceRecordBatch | AsyncIterable[PriceRecordBatch],
+    resolver: NameResolver | None = None,
+) -> UpsertResult:
+    """Upsert ``records`` into ``daily_prices``, resolving names with ``resolver`` (loaded here if not given).
+
+    ``records`` may be a stream of batches; each is resolved and staged as
+    it arrives, and the last row per key across the stream wins.  Runs
+    inside the session's transaction and does not commit; the keys written
+    stay in ``daily_price_changes`` for the rest of the transaction (see
+    ``app.services.alert_service.create_price_alerts``).  The caller commits,
+    then calls ``app.data_version.mark_data_changed`` if ``written`` is not empty.
+    """
+    postgresql = is_postgresql(session)
+    await prepare_price_changes(session)
+    result = UpsertResult()
+    staged: Counter[str] = Counter()
+    batches_staged = 0
+    # Without a stage table, the resolved batches are merged from memory.
+    resolved: list[ResolvedPrices] = []
+    async for batch in _iter_batches(records):
+        if not len(batch):
+            continue
+        if resolver is None:
+            resolver = await NameResolver.load(session)
+        prices, unmatched = _resolve_batch(batch, resolver)
+        result.unmatched_rows.update(unmatched.unmatched_rows)
+        result.unmatched_names.update(unmatched.unmatched_names)
+        if not len(prices):
+            continue
+        if postgresql:
+            await _stage_postgresql(session, prices, create=not batches_staged)
+        else:
+            resolved.append(prices)
+        staged.update(prices.source.tolist())
+        batches_staged += 1
+    if not batches_staged:
+        return result
+
+    if postgresql:
+        written, existing, superseded = await _merge_postgresql(session, dedupe=batches_staged > 1)
+        staged -= superseded
+    else:
+        prices = ResolvedPrices.concat(resolved).dedupe()
+        staged = Counter(prices.source.tolist())
+        written, existing = await _merge_executemany(session, prices)
+    result.inserted = staged - existing
+    result.changed = written - result.inserted
+    result.unchanged = existing - result.changed
+    logger.info(
+        "Upserted %d daily prices from %d batches: %d inserted, %d changed, %d unchanged",
+        staged.total(),
+        batches_staged,
+        result.inserted.total(),
+        result.changed.total(),
+        result.unchanged.total(),
+    )
+    if not written:
+        # Nothing was written, so the snapshot, rollups and rolling stats are still current.
+        return result
 
-    return len(rows_to_insert)
+    await refresh_latest_price_snapshot(session)
+    await refresh_rollups(session, await RollupScope.from_changes(session))
+    await advance_rolling_stats(session)
+    return result
@@ -0,0 +1,307 @@
+"""Shared HTTP client for the scrapers.
+
+One pooled ``httpx.AsyncClient`` (HTTP/2 when ``h2`` is installed) is reused
+across scrapes.  Transport errors and 429/5xx responses are retried with
+capped, fully jittered exponential backoff, honouring a numeric
+``Retry-After``.
+
+Conditional GETs use a small on-disk cache of each URL's validators
+(``ETag``/``Last-Modified``), body hash, body and the scrape date it was
+loaded for.  Scraped rows are dated with the scrape day, so only a re-scrape
+on the same date may be skipped: there a ``304`` or a body identical to the
+last one loaded raises :class:`UpstreamNotModified`, and the pipeline skips
+parsing and upserting that source.  On a new date an unchanged page is
+returned (from the cached body after a ``304``) so that day's prices load.  New validators are only
+staged by a fetch, in the :class:`ValidatorStaging` of the run that made it,
+and written by :meth:`ValidatorStaging.commit` once that run has loaded the
+data, so a run that fails after downloading does not make the next run skip
+the page, and overlapping runs (the scheduler and an admin trigger) never
+commit or discard each other's validators.  Large extracts are streamed to a
+file by :meth:`ScraperHttpClient.download` rather than held in memory.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import random
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, replace
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger("agrisenta.scraping.http")
+settings = get_settings()
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class UpstreamNotModified(Exception):
+    """The upstream resource is unchanged since the data was last loaded."""
+
+    def __init__(self, url: str) -> None:
+        super().__init__(f"{url} not modified")
+        self.url = url
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    url: str
+    body_sha256: str
+    etag: str | None = None
+    last_modified: str | None = None
+    # Omitted for bodies over the size cap; the hash still detects repeats.
+    body: str | None = None
+    stored_at: str = ""
+    # ISO date the body was loaded for; entries written before it existed match no date.
+    scrape_date: str | None = None
+
+
+class ValidatorCache:
+    """Per-URL validators and bodies, one JSON file per URL under ``directory``."""
+
+    def __init__(self, directory: str | Path, *, max_body_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_body_bytes = max_body_bytes
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()[:32]}.json"
+
+    def get(self, url: str) -> CacheEntry | None:
+        try:
+            return CacheEntry(**json.loads(self._path(url).read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return None
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Ignoring unreadable HTTP cache entry for %s: %s", url, exc)
+            return None
+
+    def staging(self) -> "ValidatorStaging":
+        """A fresh staging area for one pipeline run."""
+        return ValidatorStaging(self)
+
+    def write(self, entries: Iterable[CacheEntry]) -> int:
+        """Write ``entries``, replacing each URL's file atomically; returns how many were written."""
+        entries = list(entries)
+        if not entries:
+            return 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for entry in entries:
+            path = self._path(entry.url)
+            temporary = path.with_suffix(".tmp")
+            try:
+                temporary.write_text(json.dumps(asdict(entry)), encoding="utf-8")
+                temporary.replace(path)
+                written += 1
+            except OSError as exc:
+                logger.warning("Could not write HTTP cache entry for %s: %s", entry.url, exc)
+        return written
+
+
+class ValidatorStaging:
+    """Validators fetched by one run, written to the cache only once that run's data is loaded."""
+
+    def __init__(self, cache: ValidatorCache) -> None:
+        self.cache = cache
+        self._entries: dict[str, CacheEntry] = {}
+
+    def stage(self, url: str, response: httpx.Response, *, scrape_date: date, body_sha256: str | None = None) -> None:
+        """Stage ``response``'s validators; a streamed download passes the hash of the body it wrote."""
+        body = None
+        if body_sha256 is None:
+            body_sha256 = hashlib.sha256(response.content).hexdigest()
+            if len(response.content) <= self.cache.max_body_bytes:
+                body = response.text
+        self._entries[url] = CacheEntry(
+            url=url,
+            body_sha256=body_sha256,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            body=body,
+            stored_at=datetime.now(UTC).isoformat(),
+            scrape_date=scrape_date.isoformat(),
+        )
+
+    def stage_unchanged(self, entry: CacheEntry, *, scrape_date: date) -> None:
+        """Stage a cached entry whose body was loaded again, for ``scrape_date``."""
+        self._entries[entry.url] = replace(
+            entry, stored_at=datetime.now(UTC).isoformat(), scrape_date=scrape_date.isoformat()
+        )
+
+    def commit(self) -> int:
+        """Write the staged entries; returns how many were written."""
+        written = self.cache.write(self._entries.values())
+        self._entries.clear()
+        return written
+
+    def discard(self, url: str | None = None) -> None:
+        """Drop the staged entry for ``url``, or every staged entry."""
+        if url is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(url, None)
+
+
+def _retry_delay(attempt: int, response: httpx.Response | None) -> float:
+    cap = settings.scrape_http_backoff_max_seconds
+    if response is not None:
+        retry_after = response.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), cap)
+    return random.uniform(0, min(cap, settings.scrape_http_backoff_base_seconds * 2**attempt))
+
+
+def _conditional_headers(cached: CacheEntry | None) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
+
+def _is_unchanged(response: httpx.Response, cached: CacheEntry | None, body_sha256: str | None = None) -> bool:
+    if cached is None:
+        return False
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        return True
+    # Many government sites ignore validators; an identical body is just as unchanged.
+    if body_sha256 is None:
+        body_sha256 = hashlib.sha256(response.content).hexdigest()
+    return body_sha256 == cached.body_sha256
+
+
+class ScraperHttpClient:
+    def __init__(self, cache: ValidatorCache, *, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self.cache = cache
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE and self._transport is None,
+                timeout=settings.scrape_http_timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=settings.scrape_http_max_connections,
+                    max_keepalive_connections=settings.scrape_http_max_connections,
+                ),
+                headers={"User-Agent": f"agrisenta-scraper/{settings.app_version}"},
+                follow_redirects=True,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, url: str, *, headers: dict[str, str] | None = None, stream: bool = False) -> httpx.Response:
+        """GET ``url``, retrying transport errors and 429/5xx responses.
+
+        With ``stream`` the body is left unread; the caller must close the response.
+        """
+        attempts = max(settings.scrape_http_max_attempts, 1)
+        attempt = 0
+        while True:
+            attempt += 1
+            response: httpx.Response | None = None
+            try:
+                request = self.client.build_request("GET", url, headers=headers)
+                response = await self.client.send(request, stream=stream)
+            except httpx.TransportError as exc:
+                if attempt >= attempts:
+                    raise
+                logger.warning("GET %s failed (%s), attempt %d/%d", url, exc, attempt, attempts)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= attempts:
+                    if response.is_error:
+                        await response.aclose()
+                        response.raise_for_status()
+                    return response
+                await response.aclose()
+                logger.warning("GET %s returned %d, attempt %d/%d", url, response.status_code, attempt, attempts)
+            await asyncio.sleep(_retry_delay(attempt - 1, response))
+
+    async def get_text(
+        self, url: str, *, staging: ValidatorStaging, scrape_date: date | None = None, conditional: bool = True
+    ) -> str:
+        """Body of ``url`` for ``scrape_date`` (default: today, UTC), revalidated against the cached copy.
+
+        When ``conditional`` and the cached copy was loaded for the same
+        date, an unchanged body raises :class:`UpstreamNotModified`; otherwise
+        a ``304`` is answered from the cached body.  New validators are put in
+        ``staging`` until the caller's data is loaded (see :meth:`ValidatorStaging.commit`).
+        """
+        scrape_date = scrape_date or datetime.now(UTC).date()
+        cached = self.cache.get(url)
+        skippable = conditional and cached is not None and cached.scrape_date == scrape_date.isoformat()
+        if cached is not None and not skippable and cached.body is None:
+            # Nothing to answer a 304 with; fetch the full body.
+            cached = None
+
+        response = await self.get(url, headers=_conditional_headers(cached))
+        if _is_unchanged(response, cached):
+            if skippable:
+                logger.info("%s unchanged since %s", url, cached.stored_at)
+                raise UpstreamNotModified(url)
+            staging.stage_unchanged(cached, scrape_date=scrape_date)
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                return cached.body
+            return response.text
+        staging.stage(url, response, scrape_date=scrape_date)
+        return response.text
+
+    async def download(
+        self,
+        url: str,
+        destination: Path,
+        *,
+        staging: ValidatorStaging,
+        scrape_date: date | None = None,
+        conditional: bool = True,
+    ) -> None:
+        """Stream the body of ``url`` into ``destination``, for extracts too large to hold in memory.
+
+        Only the body's hash is cached, so validators are only sent for a
+        conditional re-scrape on the cached copy's date; an unchanged body
+        then raises :class:`UpstreamNotModified`.  New validators are put in
+        ``staging`` as for :meth:`get_text`.
+        """
+        scrape_date = scrape_date or datetime.now(UTC).date()
+        cached = self.cache.get(url)
+        if not conditional or cached is None or cached.scrape_date != scrape_date.isoformat():
+            cached = None
+        response = await self.get(url, headers=_conditional_headers(cached), stream=True)
+        try:
+            if cached is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+                logger.info("%s unchanged since %s", url, cached.stored_at)
+                raise UpstreamNotModified(url)
+            digest = hashlib.sha256()
+            with destination.open("wb") as file:
+                async for part in response.aiter_bytes():
+                    digest.update(part)
+                    file.write(part)
+        finally:
+            await response.aclose()
+
+        body_sha256 = digest.hexdigest()
+        if _is_unchanged(response, cached, body_sha256):
+            logger.info("%s unchanged since %s", url, cached.stored_at)
+            raise UpstreamNotModified(url)
+        staging.stage(url, response, scrape_date=scrape_date, body_sha256=body_sha256)
+
+
+scraper_http = ScraperHttpClient(
+    ValidatorCache(settings.scrape_http_cache_dir, max_body_bytes=settings.scrape_http_cache_max_body_bytes)
+)
@@ -0,0 +1,184 @@
+"""Resolve scraped commodity, market and region names to database ids.
+
+Upstream feeds spell names inconsistently: "WELL MILLED RICE",
+"Rice, well-milled", "Talong" for "Eggplant (Talong)", "Red Onions".  A
+:class:`NameResolver` is built once per ingestion run from the reference
+tables and answers each distinct name in three steps:
+
+1. the exact name, or a known alias (``ALIASES``, plus each half of a
+   "Name (Other Name)" entry when that half is unambiguous);
+2. the normalized token key: case, accents and punctuation folded, tokens
+   sorted, so word order and hyphenation do not matter;
+3. the best character-trigram match above ``FUZZY_MIN_SCORE``, provided it
+   clearly beats the runner-up.
+
+Each distinct input is resolved once and memoized; the rest of the rows
+only pay for a dictionary lookup.  Names that still do not resolve are
+counted, so the loader can report what it dropped instead of losing it
+silently.
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Commodity, Market, Region
+
+# Dice coefficient over trigram sets; below this a candidate is not a match.
+FUZZY_MIN_SCORE = 0.75
+# The best candidate must beat the runner-up by this much, or the name is ambiguous.
+FUZZY_MIN_MARGIN = 0.05
+
+# Spellings seen in DA/PSA feeds, keyed by kind and normalized alias.
+ALIASES: dict[str, dict[str, str]] = {
+    "commodity": {
+        "well milled rice": "Well-Milled Rice",
+        "wmr": "Well-Milled Rice",
+        "regular milled rice": "Regular-Milled Rice",
+        "rmr": "Regular-Milled Rice",
+        "onion red": "Red Onion",
+        "red onion local": "Red Onion",
+        "onion white": "White Onion",
+        "pork belly": "Pork Liempo",
+        "liempo": "Pork Liempo",
+        "mung bean": "Mongo (Mung Bean)",
+        "monggo": "Mongo (Mung Bean)",
+    },
+    "market": {},
+    "region": {},
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(value: str) -> str:
+    """Lower-case ASCII words separated by single spaces."""
+    folded = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii").lower()
+    return _NON_WORD.sub(" ", folded).strip()
+
+
+def token_key(value: str) -> str:
+    """Normalized tokens in sorted order, so "Rice, Well-Milled" matches "Well-Milled Rice"."""
+    return " ".join(sorted(normalize_name(value).split()))
+
+
+def trigrams(value: str) -> frozenset[str]:
+    padded = f"  {normalize_name(value)} "
+    return frozenset(padded[index : index + 3] for index in range(len(padded) - 2))
+
+
+_PARENTHETICAL = re.compile(r"^(?P<outer>[^()]+?)\s*\((?P<inner>[^()]+)\)$")
+
+
+def _name_variants(name: str) -> list[str]:
+    """``name`` plus, for "Eggplant (Talong)", the outer and inner names."""
+    match = _PARENTHETICAL.match(name.strip())
+    if match is None:
+        return [name]
+    return [name, match["outer"], match["inner"]]
+
+
+@dataclass(slots=True)
+class NameIndex:
+    """Lookup tables for one kind of name (commodity, market or region)."""
+
+    kind: str
+    exact: dict[str, int] = field(default_factory=dict)
+    by_key: dict[str, int] = field(default_factory=dict)
+    grams: dict[int, frozenset[str]] = field(default_factory=dict)
+    postings: dict[str, set[int]] = field(default_factory=lambda: defaultdict(set))
+    resolved: dict[str, int | None] = field(default_factory=dict)
+    matched_by: Counter = field(default_factory=Counter)
+
+    @classmethod
+    def build(cls, kind: str, names: Iterable[tuple[str, int]], aliases: dict[str, str] | None = None) -> "NameIndex":
+        index = cls(kind)
+        entries = list(names)
+        by_name = {name: identifier for name, identifier in entries}
+        keyed: dict[str, set[int]] = defaultdict(set)
+        for name, identifier in entries:
+            index.exact[name] = identifier
+            for variant in _name_variants(name):
+                keyed[token_key(variant)].add(identifier)
+            index.grams[identifier] = index.grams.get(identifier, frozenset()) | trigrams(name)
+        for alias, target in (aliases or {}).items():
+            if target in by_name:
+                keyed[token_key(alias)].add(by_name[target])
+        # A key that points at two entries ("garlic" for local and imported) identifies neither.
+        index.by_key = {key: next(iter(ids)) for key, ids in keyed.items() if len(ids) == 1}
+        for identifier, grams in index.grams.items():
+            for gram in grams:
+                index.postings[gram].add(identifier)
+        return index
+
+    def _fuzzy(self, name: str) -> int | None:
+        grams = trigrams(name)
+        if not grams:
+            return None
+        shared = Counter(identifier for gram in grams for identifier in self.postings.get(gram, ()))
+        scores = sorted(
+            (
+                (2 * count / (len(grams) + len(self.grams[identifier])), identifier)
+                for identifier, count in shared.items()
+            ),
+            reverse=True,
+        )
+        if not scores or scores[0][0] < FUZZY_MIN_SCORE:
+            return None
+        if len(scores) > 1 and scores[0][0] - scores[1][0] < FUZZY_MIN_MARGIN:
+            return None
+        return scores[0][1]
+
+    def resolve(self, name: str) -> int | None:
+        """The id for ``name``, or ``None``; memoized per distinct input."""
+        if name in self.resolved:
+            return self.resolved[name]
+        identifier = self.exact.get(name)
+        how = "exact"
+        if identifier is None:
+            identifier, how = self.by_key.get(token_key(name)), "normalized"
+        if identifier is None:
+            identifier, how = self._fuzzy(name), "fuzzy"
+        self.resolved[name] = identifier
+        self.matched_by["unmatched" if identifier is None else how] += 1
+        return identifier
+
+    def resolve_column(self, names: np.ndarray) -> np.ndarray:
+        """Ids for a column of names, 0 where a name does not resolve."""
+        codes, uniques = pd.factorize(names)
+        ids = np.array([self.resolve(name) or 0 for name in uniques], dtype=np.int64)
+        return ids[codes] if len(codes) else np.zeros(0, dtype=np.int64)
+
+
+@dataclass(slots=True)
+class NameResolver:
+    commodities: NameIndex
+    markets: NameIndex
+    regions: NameIndex
+
+    @classmethod
+    async def load(cls, session: AsyncSession) -> "NameResolver":
+        commodities = (await session.execute(select(Commodity.name, Commodity.id))).all()
+        markets = (await session.execute(select(Market.name, Market.id))).all()
+        regions = (await session.execute(select(Region.code, Region.name, Region.id))).all()
+        return cls(
+            commodities=NameIndex.build("commodity", commodities, ALIASES["commodity"]),
+            markets=NameIndex.build("market", markets, ALIASES["market"]),
+            # Feeds give either the code or the region's name.
+            regions=NameIndex.build(
+                "region",
+                [(code, identifier) for code, _, identifier in regions],
+                ALIASES["region"] | {name: code for code, name, _ in regions},
+            ),
+        )
+
+    def match_summary(self) -> dict[str, dict[str, int]]:
+        """Distinct names resolved per kind and step (exact, normalized, fuzzy, unmatched)."""
+        return {index.kind: dict(index.matched_by) for index in (self.commodities, self.markets, self.regions)}
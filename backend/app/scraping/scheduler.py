@@ -4,6 +4,7 @@ from apscheduler.triggers.cron import CronTrigger
 from app.config import get_settings
 from app.services.forecast_service import regenerate_all_forecasts
 from app.services.pipeline_service import run_ingestion_pipeline
+from app.utils.partitions import run_partition_maintenance
 
 settings = get_settings()
 
@@ -14,8 +15,8 @@ def create_scheduler() -> AsyncIOScheduler:
     scheduler.add_job(
         run_ingestion_pipeline,
         CronTrigger.from_crontab(settings.scrape_schedule_cron),
-        kwargs={"source": "DA"},
-        id="daily-da-scrape",
+        kwargs={"source": "ALL"},
+        id="daily-scrape",
         replace_existing=True,
     )
 
@@ -27,4 +28,12 @@ def create_scheduler() -> AsyncIOScheduler:
         replace_existing=True,
     )
 
+    if settings.daily_prices_partitioned:
+        scheduler.add_job(
+            run_partition_maintenance,
+            CronTrigger.from_crontab(settings.partition_maintenance_cron),
+            id="daily-prices-partition-maintenance",
+            replace_existing=True,
+        )
+
     return scheduler
@@ -11,16 +11,24 @@ async def create_scrape_log(
     rows_ingested: int,
     error_message: str | None,
     duration_seconds: float,
+    rows_unmatched: int = 0,
+    rows_inserted: int = 0,
+    rows_changed: int = 0,
+    rows_unchanged: int = 0,
 ) -> ScrapeLog:
+    """Add a scrape log row to the session's transaction; the caller commits."""
     log = ScrapeLog(
         source=source,
         status=status,
         rows_ingested=rows_ingested,
+        rows_unmatched=rows_unmatched,
+        rows_inserted=rows_inserted,
+        rows_changed=rows_changed,
+        rows_unchanged=rows_unchanged,
         error_message=error_message,
         duration_seconds=duration_seconds,
     )
 
     session.add(log)
-    await session.commit()
-    await session.refresh(log)
+    await session.flush()
     return log
@@ -1,24 +1,27 @@
-from datetime import UTC, datetime
-
-import httpx
-from bs4 import BeautifulSoup
+from datetime import UTC, date, datetime
 
+from app.config import get_settings
+from app.scraping.da_parsers import get_row_parser
+from app.scraping.http_client import ValidatorStaging, scraper_http
 from app.scraping.types import RawPriceRecord
 
+settings = get_settings()
+
 
-async def scrape_da_prices(url: str, timeout_seconds: int = 30) -> list[RawPriceRecord]:
-    async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-        response = await client.get(url)
-        response.raise_for_status()
+async def scrape_da_prices(url: str, *, staging: ValidatorStaging, conditional: bool = True) -> list[RawPriceRecord]:
+    """Parse the DA price monitoring table; raises ``UpstreamNotModified`` when ``conditional`` and unchanged since today's load."""
+    scrape_date = datetime.now(UTC).date()
+    html = await scraper_http.get_text(url, staging=staging, scrape_date=scrape_date, conditional=conditional)
+    return parse_da_prices(html, scrape_date)
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    table_rows = soup.select("table tr")
+
+def parse_da_prices(html: str, scrape_date: date, *, backend: str | None = None) -> list[RawPriceRecord]:
+    """Price records from a DA page, parsed with ``backend`` (default: ``settings.da_parser_backend``)."""
+    table_rows = get_row_parser(backend or settings.da_parser_backend)(html)
 
     records: list[RawPriceRecord] = []
-    scrape_date = datetime.now(UTC).date()
 
-    for row in table_rows[1:]:
-        columns = [column.get_text(strip=True) for column in row.find_all("td")]
+    for columns in table_rows[1:]:
         if len(columns) < 5:
             continue
 
@@ -1,43 +1,99 @@
 import asyncio
-from datetime import UTC, datetime
-from functools import partial
+import tempfile
+from collections.abc import AsyncIterator, Iterator
+from datetime import UTC, date, datetime
+from pathlib import Path
 
 import pandas as pd
 
-from app.scraping.types import RawPriceRecord
+from app.config import get_settings
+from app.scraping.http_client import ValidatorStaging, scraper_http
+from app.scraping.types import PriceRecordBatch
 
+settings = get_settings()
 
-def _read_csv_sync(csv_url: str) -> pd.DataFrame:
-    """Read CSV in a way that can be offloaded to a thread."""
-    return pd.read_csv(csv_url)
+# Lower-cased CSV header -> PriceRecordBatch field.  Low/high are optional.
+PSA_COLUMNS = {
+    "commodity": "commodity_name",
+    "market": "market_name",
+    "region_code": "region_code",
+    "price_prevailing": "price_prevailing",
+    "price_low": "price_low",
+    "price_high": "price_high",
+}
+REQUIRED_COLUMNS = frozenset({"commodity", "market", "region_code", "price_prevailing"})
+TEXT_COLUMNS = ("commodity", "market", "region_code")
 
 
-async def scrape_psa_prices(csv_url: str) -> list[RawPriceRecord]:
+def _chunk_to_batch(chunk: pd.DataFrame, scrape_date: date) -> PriceRecordBatch:
+    """Coerce one chunk's columns; rows with a missing name or a non-numeric price are dropped."""
+    prices = {
+        column: pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype="float64")
+        for column in ("price_prevailing", "price_low", "price_high")
+        if column in chunk
+    }
+    valid = ~pd.isna(prices["price_prevailing"])
+    for column in TEXT_COLUMNS:
+        valid &= chunk[column].notna().to_numpy()
+
+    return PriceRecordBatch.from_columns(
+        **{PSA_COLUMNS[column]: chunk[column].to_numpy(dtype=object)[valid] for column in TEXT_COLUMNS},
+        **{PSA_COLUMNS[column]: values[valid] for column, values in prices.items()},
+        date=scrape_date,
+        source="PSA",
+    )
+
+
+def _read_csv_chunks(csv_path: Path, scrape_date: date, chunksize: int) -> Iterator[PriceRecordBatch]:
+    """The coerced, valid rows of each chunk of needed columns, one batch per chunk.
+
+    The full extract never sits in memory, as a DataFrame or as a batch.
+    Nothing is yielded when a required column is missing.
+    """
+    reader = pd.read_csv(
+        csv_path,
+        usecols=lambda column: column.strip().lower() in PSA_COLUMNS,
+        dtype=str,
+        chunksize=chunksize,
+    )
+    with reader:
+        for chunk in reader:
+            chunk.columns = chunk.columns.str.strip().str.lower()
+            if not REQUIRED_COLUMNS.issubset(chunk.columns):
+                return
+            yield _chunk_to_batch(chunk, scrape_date)
+
+
+async def _stream_chunks(
+    chunks: Iterator[PriceRecordBatch], directory: tempfile.TemporaryDirectory
+) -> AsyncIterator[PriceRecordBatch]:
+    """Read ``chunks`` one at a time on a worker thread; removes the downloaded extract when done."""
     loop = asyncio.get_running_loop()
-    dataframe = await loop.run_in_executor(None, partial(_read_csv_sync, csv_url))
-    now_date = datetime.now(UTC).date()
-
-    records: list[RawPriceRecord] = []
-    required_columns = {"commodity", "market", "region_code", "price_prevailing"}
-
-    if not required_columns.issubset(set(dataframe.columns.str.lower())):
-        return records
-
-    normalized_columns = {column.lower(): column for column in dataframe.columns}
-
-    for _, row in dataframe.iterrows():
-        try:
-            records.append(
-                RawPriceRecord(
-                    commodity_name=str(row[normalized_columns["commodity"]]),
-                    market_name=str(row[normalized_columns["market"]]),
-                    region_code=str(row[normalized_columns["region_code"]]),
-                    date=now_date,
-                    price_prevailing=float(row[normalized_columns["price_prevailing"]]),
-                    source="PSA",
-                )
-            )
-        except (TypeError, ValueError):
-            continue
-
-    return records
+    try:
+        while (batch := await loop.run_in_executor(None, next, chunks, None)) is not None:
+            yield batch
+    finally:
+        chunks.close()
+        directory.cleanup()
+
+
+async def scrape_psa_prices(
+    csv_url: str, *, staging: ValidatorStaging, conditional: bool = True
+) -> AsyncIterator[PriceRecordBatch]:
+    """Download the PSA extract to a temporary file and stream it back a chunk at a time.
+
+    Raises ``UpstreamNotModified`` when unchanged.  The download goes through
+    ``scraper_http`` for its pooling, retries and validators, which are put in
+    ``staging``; the CSV is only parsed as the returned stream is consumed.
+    """
+    scrape_date = datetime.now(UTC).date()
+    directory = tempfile.TemporaryDirectory(prefix="agrisenta-psa-")
+    csv_path = Path(directory.name) / "extract.csv"
+    try:
+        await scraper_http.download(
+            csv_url, csv_path, staging=staging, scrape_date=scrape_date, conditional=conditional
+        )
+    except BaseException:
+        directory.cleanup()
+        raise
+    return _stream_chunks(_read_csv_chunks(csv_path, scrape_date, settings.psa_csv_chunk_rows), directory)
@@ -1,6 +1,9 @@
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, fields
 from datetime import date
 
+import numpy as np
+
 
 @dataclass(slots=True)
 class RawPriceRecord:
@@ -12,3 +15,77 @@ class RawPriceRecord:
     price_low: float | None = None
     price_high: float | None = None
     source: str = "DA"
+
+
+RECORD_FIELDS = tuple(field.name for field in fields(RawPriceRecord))
+PRICE_FIELDS = ("price_prevailing", "price_low", "price_high")
+
+
+@dataclass(slots=True)
+class PriceRecordBatch:
+    """``RawPriceRecord`` fields as equal-length column arrays.
+
+    Text and date columns are object arrays; price columns are ``float64``
+    with ``NaN`` for a missing low/high.  Large extracts are filtered and
+    transformed a column at a time instead of allocating a record per row.
+    """
+
+    commodity_name: np.ndarray
+    market_name: np.ndarray
+    region_code: np.ndarray
+    date: np.ndarray
+    price_prevailing: np.ndarray
+    price_low: np.ndarray
+    price_high: np.ndarray
+    source: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.price_prevailing)
+
+    @classmethod
+    def from_columns(cls, **columns: Sequence | np.ndarray) -> "PriceRecordBatch":
+        """Batch from per-field sequences; missing low/high become ``NaN``, a scalar ``date``/``source`` is repeated."""
+        size = len(columns["price_prevailing"])
+        arrays = {}
+        for name in RECORD_FIELDS:
+            value = columns.get(name)
+            if name in PRICE_FIELDS:
+                arrays[name] = np.full(size, np.nan) if value is None else np.asarray(value, dtype=np.float64)
+            elif isinstance(value, (str, date)):
+                arrays[name] = np.full(size, value, dtype=object)
+            else:
+                arrays[name] = np.asarray(value, dtype=object)
+        return cls(**arrays)
+
+    @classmethod
+    def from_records(cls, records: Iterable[RawPriceRecord]) -> "PriceRecordBatch":
+        records = list(records)
+        columns = {name: [getattr(record, name) for record in records] for name in RECORD_FIELDS}
+        for name in ("price_low", "price_high"):
+            columns[name] = [np.nan if value is None else value for value in columns[name]]
+        return cls.from_columns(**columns)
+
+    @classmethod
+    def empty(cls) -> "PriceRecordBatch":
+        return cls.from_columns(**{name: [] for name in RECORD_FIELDS})
+
+    @classmethod
+    def concat(cls, batches: Sequence["PriceRecordBatch"]) -> "PriceRecordBatch":
+        if not batches:
+            return cls.empty()
+        return cls(**{name: np.concatenate([getattr(batch, name) for batch in batches]) for name in RECORD_FIELDS})
+
+    def take(self, selector: np.ndarray) -> "PriceRecordBatch":
+        """Rows picked by a boolean mask or an index array."""
+        return PriceRecordBatch(**{name: getattr(self, name)[selector] for name in RECORD_FIELDS})
+
+    def records(self) -> Iterator[RawPriceRecord]:
+        columns = [getattr(self, name).tolist() for name in RECORD_FIELDS]
+        for values in zip(*columns, strict=True):
+            record = RawPriceRecord(*values)
+            # NaN marks a missing low/high in the columns.
+            if record.price_low != record.price_low:
+                record.price_low = None
+            if record.price_high != record.price_high:
+                record.price_high = None
+            yield record
@@ -0,0 +1,198 @@
+"""Raises ``PriceAlert`` rows for freshly ingested prices.
+
+Only the rows an ingestion just upserted (the keys in ``daily_price_changes``)
+are checked: against their pair's rolling baseline (the spikes
+``advance_rolling_stats`` recorded for them) and against the commodity's
+``price_ceiling``.  Both are joins in the database, so only the rows that
+break a threshold reach Python.  Each commodity/region gets at most
+one alert per type and price date, built from its most extreme row, and a
+re-scrape of the same day does not raise the same alert again.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+from sqlalchemy import and_, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Commodity, DailyPrice, PriceAlert, PriceSpike, Region
+from app.services.price_changes import daily_price_changes, daily_price_join
+
+logger = logging.getLogger("agrisenta.alerts")
+
+SPIKE = "spike"
+DROP = "drop"
+CEILING_BREACH = "ceiling_breach"
+
+# Minimum deviation for each severity, checked from the top: standard
+# deviations from the rolling mean for spikes and drops, fraction above the
+# ceiling for ceiling breaches.  Anything smaller is "low".
+SPIKE_SEVERITY = ((3.0, "high"), (2.5, "medium"))
+CEILING_SEVERITY = ((0.20, "high"), (0.10, "medium"))
+
+AlertKey = tuple[int, int, date, str]
+
+
+def _severity(deviation: float, levels: tuple[tuple[float, str], ...]) -> str:
+    for minimum, severity in levels:
+        if deviation >= minimum:
+            return severity
+    return "low"
+
+
+@dataclass(slots=True)
+class AlertCandidate:
+    commodity_id: int
+    region_id: int
+    price_date: date
+    alert_type: str
+    deviation: float
+    current_price: Decimal
+    threshold_price: Decimal
+    detail: str
+
+
+async def _spike_candidates(session: AsyncSession) -> list[AlertCandidate]:
+    # Replays re-record older spikes; only those on the rows from this ingestion are new.
+    changes = daily_price_changes.c
+    result = await session.execute(
+        select(
+            PriceSpike.commodity_id,
+            PriceSpike.region_id,
+            PriceSpike.date,
+            PriceSpike.price,
+            PriceSpike.rolling_mean,
+            PriceSpike.rolling_std,
+        )
+        .join(
+            daily_price_changes,
+            and_(
+                PriceSpike.commodity_id == changes.commodity_id,
+                PriceSpike.region_id == changes.region_id,
+                PriceSpike.market_id == changes.market_id,
+                PriceSpike.date == changes.date,
+                PriceSpike.source == changes.source,
+            ),
+        )
+        .where(PriceSpike.rolling_std > 0)
+    )
+    candidates = []
+    for spike in result.mappings():
+        price = float(spike["price"])
+        mean = spike["rolling_mean"]
+        sigmas = abs(price - mean) / spike["rolling_std"]
+        candidates.append(
+            AlertCandidate(
+                commodity_id=spike["commodity_id"],
+                region_id=spike["region_id"],
+                price_date=spike["date"],
+                alert_type=SPIKE if price > mean else DROP,
+                deviation=sigmas,
+                current_price=spike["price"],
+                threshold_price=Decimal(str(round(mean, 2))),
+                detail=f"{sigmas:.1f}σ {'above' if price > mean else 'below'} its 30-price average of ₱{mean:.2f}",
+            )
+        )
+    return candidates
+
+
+async def _ceiling_candidates(session: AsyncSession) -> list[AlertCandidate]:
+    result = await session.execute(
+        select(
+            DailyPrice.commodity_id,
+            DailyPrice.region_id,
+            DailyPrice.date,
+            DailyPrice.price_prevailing,
+            Commodity.price_ceiling,
+        )
+        .join(daily_price_changes, daily_price_join())
+        .join(Commodity, Commodity.id == DailyPrice.commodity_id)
+        .where(Commodity.price_ceiling > 0, DailyPrice.price_prevailing > Commodity.price_ceiling)
+    )
+    candidates = []
+    for row in result.mappings():
+        ceiling = row["price_ceiling"]
+        price = row["price_prevailing"]
+        over = float((price - ceiling) / ceiling)
+        candidates.append(
+            AlertCandidate(
+                commodity_id=row["commodity_id"],
+                region_id=row["region_id"],
+                price_date=row["date"],
+                alert_type=CEILING_BREACH,
+                deviation=over,
+                current_price=price,
+                threshold_price=ceiling,
+                detail=f"{over:.0%} above its price ceiling of ₱{ceiling}",
+            )
+        )
+    return candidates
+
+
+async def _existing_alert_keys(session: AsyncSession, keys: set[AlertKey]) -> set[AlertKey]:
+    result = await session.execute(
+        select(PriceAlert.commodity_id, PriceAlert.region_id, PriceAlert.price_date, PriceAlert.alert_type).where(
+            tuple_(PriceAlert.commodity_id, PriceAlert.region_id, PriceAlert.price_date, PriceAlert.alert_type).in_(
+                keys
+            )
+        )
+    )
+    return {tuple(row) for row in result.all()}
+
+
+async def create_price_alerts(session: AsyncSession) -> int:
+    """Bulk-insert alerts for the rows in ``daily_price_changes`` and the spikes recorded on them.
+
+    Runs in the caller's transaction, after the upsert that filled the
+    changes table, and returns the number of alerts created.
+    """
+    strongest: dict[AlertKey, AlertCandidate] = {}
+    for candidate in await _spike_candidates(session) + await _ceiling_candidates(session):
+        key = (candidate.commodity_id, candidate.region_id, candidate.price_date, candidate.alert_type)
+        current = strongest.get(key)
+        if current is None or candidate.deviation > current.deviation:
+            strongest[key] = candidate
+    if not strongest:
+        return 0
+
+    for key in await _existing_alert_keys(session, set(strongest)):
+        strongest.pop(key, None)
+    if not strongest:
+        return 0
+
+    commodity_result = await session.execute(
+        select(Commodity.id, Commodity.name).where(Commodity.id.in_({key[0] for key in strongest}))
+    )
+    commodity_names = dict(commodity_result.all())
+    region_result = await session.execute(
+        select(Region.id, Region.name).where(Region.id.in_({key[1] for key in strongest}))
+    )
+    region_names = dict(region_result.all())
+
+    triggered_at = datetime.now(UTC)
+    alerts = []
+    for candidate in strongest.values():
+        severity_levels = CEILING_SEVERITY if candidate.alert_type == CEILING_BREACH else SPIKE_SEVERITY
+        name = commodity_names.get(candidate.commodity_id, f"Commodity {candidate.commodity_id}")
+        region = region_names.get(candidate.region_id, f"region {candidate.region_id}")
+        alerts.append(
+            {
+                "commodity_id": candidate.commodity_id,
+                "region_id": candidate.region_id,
+                "alert_type": candidate.alert_type,
+                "severity": _severity(candidate.deviation, severity_levels),
+                "current_price": candidate.current_price,
+                "threshold_price": candidate.threshold_price,
+                "message": f"{name} in {region} at ₱{candidate.current_price} on {candidate.price_date:%b %d}: "
+                f"{candidate.detail}",
+                "triggered_at": triggered_at,
+                "price_date": candidate.price_date,
+                "is_resolved": False,
+            }
+        )
+
+    await session.execute(insert(PriceAlert), alerts)
+    logger.info("Created %d price alerts", len(alerts))
+    return len(alerts)
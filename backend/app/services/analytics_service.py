@@ -1,23 +1,118 @@
-from datetime import date
-
-from sqlalchemy import Date, Float, Integer, and_, cast, func, select
+from datetime import date, timedelta
+
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Float,
+    Integer,
+    Numeric,
+    Select,
+    and_,
+    cast,
+    func,
+    literal,
+    literal_column,
+    select,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.base import ReadOnlyColumnCollection
+
+from app.models import (
+    Commodity,
+    DailyPrice,
+    DailyPriceRollup,
+    MonthlyPriceRollup,
+    PriceSpike,
+    Region,
+    WeeklyPriceRollup,
+)
+from app.services.rollup_service import week_start
+
+# Rolling statistics use a 30-row window; date-bounded queries read this many
+# extra days before ``from_date`` so rows at the start of the range still get a
+# full window when the series has a row per day.
+ROLLING_WINDOW_DAYS = 30
+
+
+def _bound_dates(statement: Select, from_date: date | None, to_date: date | None) -> Select:
+    """Add date bounds, which also let PostgreSQL prune ``daily_prices`` partitions."""
+    if from_date is not None:
+        statement = statement.where(DailyPrice.date >= from_date)
+    if to_date is not None:
+        statement = statement.where(DailyPrice.date <= to_date)
+    return statement
+
+
+def _window_start(from_date: date | None) -> date | None:
+    return from_date - timedelta(days=ROLLING_WINDOW_DAYS - 1) if from_date is not None else None
+
 
-from app.models import Commodity, DailyPrice, Region
+PriceRollup = DailyPriceRollup | WeeklyPriceRollup | MonthlyPriceRollup
 
 
-async def get_weekly_variance(session: AsyncSession) -> list[dict]:
-    week_start_expr = cast(func.date_trunc("week", DailyPrice.date), Date)
+def _rollup_average(rollup: type[PriceRollup] | ReadOnlyColumnCollection) -> ColumnElement:
+    # The numeric literal keeps SQLite from truncating when both sums happen to be integers.
+    return func.sum(rollup.price_sum) / (func.sum(rollup.price_count) * literal_column("1.0", Numeric))
+
+
+def _rollup_for_range(from_date: date | None, to_date: date | None) -> type[PriceRollup]:
+    """Monthly rollups for all-time queries; daily rollups when the range may cut through a month."""
+    if from_date is None and to_date is None:
+        return MonthlyPriceRollup
+    return DailyPriceRollup
+
+
+def _bound_periods(
+    statement: Select, rollup: type[PriceRollup], from_date: date | None, to_date: date | None
+) -> Select:
+    if from_date is not None:
+        statement = statement.where(rollup.period_start >= from_date)
+    if to_date is not None:
+        statement = statement.where(rollup.period_start <= to_date)
+    return statement
+
+
+async def get_weekly_variance(
+    session: AsyncSession, *, from_date: date | None = None, to_date: date | None = None
+) -> list[dict]:
+    """Average price per commodity and week (starting Monday), with the week-over-week change.
+
+    The range starts at the week containing ``from_date``.  It ends exactly at
+    ``to_date``: when that falls mid-week, the last week averages only its days
+    up to ``to_date``, read from the daily rollups.
+    """
+    rollup = WeeklyPriceRollup
+    # Read one extra week so the first week in range has a week-over-week change.
+    first_week = week_start(from_date) if from_date is not None else None
+    partial_week = week_start(to_date) if to_date is not None and to_date.weekday() != 6 else None
+
+    weeks = select(rollup.period_start.label("week_start"), rollup.commodity_id, rollup.price_sum, rollup.price_count)
+    if first_week is not None:
+        weeks = weeks.where(rollup.period_start >= first_week - timedelta(days=7))
+    if partial_week is not None:
+        weeks = weeks.where(rollup.period_start < partial_week)
+        days = select(
+            literal(partial_week, Date).label("week_start"),
+            DailyPriceRollup.commodity_id,
+            DailyPriceRollup.price_sum,
+            DailyPriceRollup.price_count,
+        ).where(DailyPriceRollup.period_start >= partial_week, DailyPriceRollup.period_start <= to_date)
+        periods = union_all(weeks, days).subquery()
+    else:
+        if to_date is not None:
+            weeks = weeks.where(rollup.period_start <= to_date)
+        periods = weeks.subquery()
 
     weekly_base = (
         select(
-            week_start_expr.label("week_start"),
-            DailyPrice.commodity_id.label("commodity_id"),
+            periods.c.week_start,
+            periods.c.commodity_id,
             Commodity.name.label("commodity_name"),
-            func.avg(DailyPrice.price_prevailing).label("weekly_avg_price"),
+            _rollup_average(periods.c).label("weekly_avg_price"),
         )
-        .join(Commodity, Commodity.id == DailyPrice.commodity_id)
-        .group_by(week_start_expr, DailyPrice.commodity_id, Commodity.name)
+        .join(Commodity, Commodity.id == periods.c.commodity_id)
+        .group_by(periods.c.week_start, periods.c.commodity_id, Commodity.name)
         .subquery()
     )
 
@@ -31,13 +126,18 @@ async def get_weekly_variance(session: AsyncSession) -> list[dict]:
         Float,
     ).label("wow_percent_change")
 
-    statement = select(
+    weekly_change = select(
         weekly_base.c.week_start,
         weekly_base.c.commodity_id,
         weekly_base.c.commodity_name,
         weekly_base.c.weekly_avg_price,
         wow_percent,
-    ).order_by(weekly_base.c.week_start.desc(), weekly_base.c.commodity_name.asc())
+    ).subquery()
+
+    statement = select(weekly_change)
+    if first_week is not None:
+        statement = statement.where(weekly_change.c.week_start >= first_week)
+    statement = statement.order_by(weekly_change.c.week_start.desc(), weekly_change.c.commodity_name.asc())
 
     result = await session.execute(statement)
     return [dict(row._mapping) for row in result]
@@ -50,23 +150,20 @@ async def get_regional_comparison(
     from_date: date | None,
     to_date: date | None,
 ) -> list[dict]:
+    rollup = _rollup_for_range(from_date, to_date)
+    average = _rollup_average(rollup)
     statement = select(
         Region.id.label("region_id"),
         Region.name.label("region_name"),
         Region.code.label("region_code"),
-        func.avg(DailyPrice.price_prevailing).label("avg_price"),
-    ).join(Region, Region.id == DailyPrice.region_id)
+        average.label("avg_price"),
+    ).join(Region, Region.id == rollup.region_id)
 
     if commodity_id is not None:
-        statement = statement.where(DailyPrice.commodity_id == commodity_id)
-    if from_date is not None:
-        statement = statement.where(DailyPrice.date >= from_date)
-    if to_date is not None:
-        statement = statement.where(DailyPrice.date <= to_date)
+        statement = statement.where(rollup.commodity_id == commodity_id)
+    statement = _bound_periods(statement, rollup, from_date, to_date)
 
-    statement = statement.group_by(Region.id, Region.name, Region.code).order_by(
-        func.avg(DailyPrice.price_prevailing).asc()
-    )
+    statement = statement.group_by(Region.id, Region.name, Region.code).order_by(average.asc())
 
     result = await session.execute(statement)
     return [dict(row._mapping) for row in result]
@@ -77,59 +174,41 @@ async def get_price_spikes(
     *,
     commodity_id: int | None,
     region_id: int | None,
-) -> list[dict]:
-    rolling_base = select(
-        DailyPrice.commodity_id,
-        DailyPrice.region_id,
-        DailyPrice.date,
-        DailyPrice.price_prevailing.label("avg_price"),
-        cast(
-            func.avg(DailyPrice.price_prevailing).over(
-                partition_by=(DailyPrice.commodity_id, DailyPrice.region_id),
-                order_by=DailyPrice.date,
-                rows=(-29, 0),
-            ),
-            Float,
-        ).label("rolling_mean_30"),
-        cast(
-            func.stddev_samp(DailyPrice.price_prevailing).over(
-                partition_by=(DailyPrice.commodity_id, DailyPrice.region_id),
-                order_by=DailyPrice.date,
-                rows=(-29, 0),
-            ),
-            Float,
-        ).label("rolling_std_30"),
-    )
-
+    from_date: date | None = None,
+    to_date: date | None = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> tuple[list[dict], int]:
+    """A page of recorded spikes, newest first, and the total matching the filters."""
+    conditions = []
     if commodity_id is not None:
-        rolling_base = rolling_base.where(DailyPrice.commodity_id == commodity_id)
+        conditions.append(PriceSpike.commodity_id == commodity_id)
     if region_id is not None:
-        rolling_base = rolling_base.where(DailyPrice.region_id == region_id)
-
-    rolling_subquery = rolling_base.subquery()
+        conditions.append(PriceSpike.region_id == region_id)
+    if from_date is not None:
+        conditions.append(PriceSpike.date >= from_date)
+    if to_date is not None:
+        conditions.append(PriceSpike.date <= to_date)
 
     statement = (
         select(
-            rolling_subquery.c.commodity_id,
-            rolling_subquery.c.region_id,
-            rolling_subquery.c.date,
-            rolling_subquery.c.avg_price,
-            rolling_subquery.c.rolling_mean_30,
-            rolling_subquery.c.rolling_std_30,
-        )
-        .where(
-            and_(
-                rolling_subquery.c.rolling_std_30.is_not(None),
-                func.abs(rolling_subquery.c.avg_price - rolling_subquery.c.rolling_mean_30)
-                > (2 * rolling_subquery.c.rolling_std_30),
-            )
+            PriceSpike.commodity_id,
+            PriceSpike.region_id,
+            PriceSpike.date,
+            PriceSpike.price.label("avg_price"),
+            PriceSpike.rolling_mean.label("rolling_mean_30"),
+            PriceSpike.rolling_std.label("rolling_std_30"),
         )
-        .order_by(rolling_subquery.c.date.desc())
-        .limit(200)
+        .where(*conditions)
+        .order_by(PriceSpike.date.desc(), PriceSpike.id.desc())
+        .limit(limit)
+        .offset(offset)
     )
-
     result = await session.execute(statement)
-    return [dict(row._mapping) for row in result]
+    items = [dict(row._mapping) for row in result]
+
+    total = await session.scalar(select(func.count()).select_from(PriceSpike).where(*conditions))
+    return items, total or 0
 
 
 async def get_cheapest_region(session: AsyncSession, *, commodity_id: int) -> dict | None:
@@ -160,7 +239,14 @@ async def get_cheapest_region(session: AsyncSession, *, commodity_id: int) -> di
     return dict(row._mapping) if row else None
 
 
-async def get_rolling_average(session: AsyncSession, *, commodity_id: int, region_id: int | None) -> list[dict]:
+async def get_rolling_average(
+    session: AsyncSession,
+    *,
+    commodity_id: int,
+    region_id: int | None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> list[dict]:
     statement = select(
         DailyPrice.date,
         DailyPrice.price_prevailing.label("avg_price"),
@@ -177,21 +263,39 @@ async def get_rolling_average(session: AsyncSession, *, commodity_id: int, regio
     if region_id is not None:
         statement = statement.where(DailyPrice.region_id == region_id)
 
-    statement = statement.order_by(DailyPrice.date.asc())
+    if from_date is not None or to_date is not None:
+        rolling_subquery = _bound_dates(statement, _window_start(from_date), to_date).subquery()
+        statement = select(rolling_subquery.c.date, rolling_subquery.c.avg_price, rolling_subquery.c.rolling_30_day_avg)
+        if from_date is not None:
+            statement = statement.where(rolling_subquery.c.date >= from_date)
+        statement = statement.order_by(rolling_subquery.c.date.asc())
+    else:
+        statement = statement.order_by(DailyPrice.date.asc())
 
     result = await session.execute(statement)
     return [dict(row._mapping) for row in result]
 
 
-async def get_seasonal_pattern(session: AsyncSession, *, commodity_id: int) -> list[dict]:
-    month_expr = cast(func.extract("month", DailyPrice.date), Integer)
+async def get_seasonal_pattern(
+    session: AsyncSession,
+    *,
+    commodity_id: int,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> list[dict]:
+    rollup = _rollup_for_range(from_date, to_date)
+    month_expr = cast(func.extract("month", rollup.period_start), Integer)
 
     statement = (
-        select(
-            month_expr.label("month"),
-            func.avg(DailyPrice.price_prevailing).label("avg_price"),
+        _bound_periods(
+            select(
+                month_expr.label("month"),
+                _rollup_average(rollup).label("avg_price"),
+            ).where(rollup.commodity_id == commodity_id),
+            rollup,
+            from_date,
+            to_date,
         )
-        .where(DailyPrice.commodity_id == commodity_id)
         .group_by(month_expr)
         .order_by(month_expr.asc())
     )
@@ -1,81 +1,255 @@
+import hashlib
 import logging
-from collections import defaultdict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from datetime import UTC, date, datetime
-from decimal import Decimal
 
-from sqlalchemy import delete, func, select
+import numpy as np
+from sqlalchemy import extract, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.data_version import mark_data_changed
 from app.database import AsyncSessionLocal
-from app.ml.predictor import generate_forecast_points
-from app.ml.trainer import train_best_model
-from app.models import Commodity, DailyPrice, PriceForecast, Region
+from app.ml.engine import ForecastRunStats, PairForecastJob, run_forecast_jobs
+from app.ml.param_cache import ArimaParamCache, ArimaWarmStart
+from app.ml.trainer import ARIMA_ORDER
+from app.models import Commodity, DailyPrice, ForecastFitState, PriceForecast, Region
+from app.services.forecast_writer import ForecastBuffer, write_forecasts
 
 logger = logging.getLogger("agrisenta.forecast")
+settings = get_settings()
 
 
-async def _build_history_by_pair(session: AsyncSession) -> dict[tuple[int, int], list[tuple[date, float]]]:
+@dataclass(slots=True)
+class PairSignature:
+    last_price_date: date
+    row_count: int
+    content_hash: str
+
+
+async def _load_pair_signatures(session: AsyncSession, *, horizon_days: int) -> dict[tuple[int, int], PairSignature]:
+    """Fingerprint every pair's history with one grouped aggregate query.
+
+    The hash covers the horizon, the row count, the last date, the price
+    total and a total weighted by each row's day number, so new rows,
+    deleted rows and re-scraped prices all mark a pair as dirty without
+    loading its series; the weighting catches corrections that offset each
+    other on different days.
+    """
+    day_number = extract("epoch", DailyPrice.date) / 86400
     statement = select(
-        DailyPrice.commodity_id, DailyPrice.region_id, DailyPrice.date, DailyPrice.price_prevailing
-    ).order_by(DailyPrice.commodity_id.asc(), DailyPrice.region_id.asc(), DailyPrice.date.asc())
+        DailyPrice.commodity_id,
+        DailyPrice.region_id,
+        func.max(DailyPrice.date),
+        func.count(),
+        func.sum(DailyPrice.price_prevailing),
+        func.sum(DailyPrice.price_prevailing * day_number),
+    ).group_by(DailyPrice.commodity_id, DailyPrice.region_id)
     result = await session.execute(statement)
 
-    grouped: dict[tuple[int, int], list[tuple[date, float]]] = defaultdict(list)
-    for commodity_id, region_id, row_date, price_prevailing in result.all():
-        grouped[(commodity_id, region_id)].append((row_date, float(price_prevailing)))
+    signatures: dict[tuple[int, int], PairSignature] = {}
+    for commodity_id, region_id, last_date, row_count, price_total, weighted_total in result.all():
+        fingerprint = (
+            f"{horizon_days}|{last_date.isoformat()}|{row_count}|{float(price_total):.2f}|{float(weighted_total):.2f}"
+        )
+        signatures[(commodity_id, region_id)] = PairSignature(
+            last_price_date=last_date,
+            row_count=row_count,
+            content_hash=hashlib.sha256(fingerprint.encode()).hexdigest(),
+        )
+    return signatures
+
+
+async def _load_fit_states(session: AsyncSession) -> dict[tuple[int, int], ForecastFitState]:
+    result = await session.execute(select(ForecastFitState))
+    return {(state.commodity_id, state.region_id): state for state in result.scalars().all()}
+
+
+async def _find_dirty_pairs(
+    session: AsyncSession, *, horizon_days: int, force: bool = False
+) -> tuple[dict[tuple[int, int], PairSignature], dict[tuple[int, int], ForecastFitState]]:
+    """Return the signatures of pairs whose history changed since their last fit, plus all fit states."""
+    signatures = await _load_pair_signatures(session, horizon_days=horizon_days)
+    states = await _load_fit_states(session)
 
-    return grouped
+    dirty = {
+        pair: signature
+        for pair, signature in signatures.items()
+        if force or pair not in states or states[pair].content_hash != signature.content_hash
+    }
+    return dirty, states
+
+
+def _record_fit_state(
+    session: AsyncSession,
+    states: dict[tuple[int, int], ForecastFitState],
+    pair: tuple[int, int],
+    signature: PairSignature,
+    model_used: str | None,
+) -> ForecastFitState:
+    state = states.get(pair)
+    if state is None:
+        state = ForecastFitState(commodity_id=pair[0], region_id=pair[1])
+        session.add(state)
+        states[pair] = state
+    state.last_price_date = signature.last_price_date
+    state.row_count = signature.row_count
+    state.content_hash = signature.content_hash
+    state.model_used = model_used
+    return state
+
+
+@dataclass(slots=True)
+class PairHistory:
+    commodity_id: int
+    region_id: int
+    dates: np.ndarray  # datetime64[D]
+    prices: np.ndarray  # float64
+
+    @property
+    def last_date(self) -> date:
+        return self.dates[-1].astype(date)
+
+
+def _to_pair_history(pair: tuple[int, int], dates: list[date], prices: list[float]) -> PairHistory:
+    return PairHistory(
+        commodity_id=pair[0],
+        region_id=pair[1],
+        dates=np.array(dates, dtype="datetime64[D]"),
+        prices=np.array(prices, dtype=np.float64),
+    )
 
 
-async def regenerate_all_forecasts(horizon_days: int = 7) -> dict[str, int]:
-    generated_rows = 0
+async def _iter_history_by_pair(
+    session: AsyncSession, *, commodity_ids: set[int] | None = None, batch_size: int = 5000
+) -> AsyncIterator[PairHistory]:
+    """Stream each pair's price history in (commodity, region, date) order.
+
+    Rows arrive through a server-side cursor ``batch_size`` at a time and only
+    the pair currently being assembled is buffered, so peak memory is bounded
+    by the longest single series rather than the whole ``daily_prices`` table.
+    """
+    statement = (
+        select(DailyPrice.commodity_id, DailyPrice.region_id, DailyPrice.date, DailyPrice.price_prevailing)
+        .order_by(DailyPrice.commodity_id.asc(), DailyPrice.region_id.asc(), DailyPrice.date.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    if commodity_ids is not None:
+        statement = statement.where(DailyPrice.commodity_id.in_(commodity_ids))
+
+    current_pair: tuple[int, int] | None = None
+    dates: list[date] = []
+    prices: list[float] = []
+
+    result = await session.stream(statement)
+    async for partition in result.partitions():
+        for commodity_id, region_id, row_date, price_prevailing in partition:
+            pair = (commodity_id, region_id)
+            if pair != current_pair:
+                if current_pair is not None:
+                    yield _to_pair_history(current_pair, dates, prices)
+                current_pair = pair
+                dates = []
+                prices = []
+            dates.append(row_date)
+            prices.append(float(price_prevailing))
+
+    if current_pair is not None:
+        yield _to_pair_history(current_pair, dates, prices)
+
+
+async def regenerate_all_forecasts(
+    horizon_days: int = 7, *, max_workers: int | None = None, force: bool = False
+) -> dict[str, int | float | str]:
+    """Refit forecasts for pairs whose price history changed since their last fit.
+
+    ``force=True`` ignores the stored fit states and refits every pair.
+    """
+    buffer = ForecastBuffer()
+    stats = ForecastRunStats()
+    workers = max_workers if max_workers is not None else settings.forecast_max_workers
 
     async with AsyncSessionLocal() as session:
-        history_map = await _build_history_by_pair(session)
-        logger.info("Found %d commodity-region pairs for forecasting", len(history_map))
+        dirty, states = await _find_dirty_pairs(session, horizon_days=horizon_days, force=force)
+        pairs_unchanged = len(states.keys() - dirty.keys())
+        too_short: set[tuple[int, int]] = set()
+        logger.info("%d commodity-region pairs changed since their last fit", len(dirty))
 
-        for (commodity_id, region_id), series in history_map.items():
-            prices = [price for _, price in series]
-            if len(prices) < 5:
-                continue
+        param_cache = ArimaParamCache()
+        for (commodity_id, region_id), state in states.items():
+            warm_start = ArimaWarmStart.from_dict(state.model_params)
+            if warm_start is not None:
+                param_cache.put(commodity_id, region_id, warm_start)
 
-            trained_model = train_best_model(prices)
-            last_date = series[-1][0]
-            points = generate_forecast_points(
-                trained=trained_model,
-                history=prices,
-                start_date=last_date,
-                horizon_days=horizon_days,
-            )
+        async def _dirty_jobs() -> AsyncIterator[PairForecastJob]:
+            if not dirty:
+                return
+            async for history in _iter_history_by_pair(session, commodity_ids={pair[0] for pair in dirty}):
+                pair = (history.commodity_id, history.region_id)
+                if pair not in dirty:
+                    continue
+                if len(history.prices) < 5:
+                    too_short.add(pair)
+                    continue
+                yield PairForecastJob(
+                    commodity_id=history.commodity_id,
+                    region_id=history.region_id,
+                    prices=history.prices,
+                    last_date=history.last_date,
+                    horizon_days=horizon_days,
+                    warm_start=param_cache.get(history.commodity_id, history.region_id, ARIMA_ORDER, history.prices),
+                    tolerance=settings.forecast_mae_tolerance,
+                )
 
-            if not points:
+        cpu_budget = settings.forecast_cpu_budget_seconds or None
+        async for result in run_forecast_jobs(
+            _dirty_jobs(), max_workers=workers, stats=stats, cpu_budget_seconds=cpu_budget
+        ):
+            if not result.points:
                 continue
+            buffer.add(result.commodity_id, result.region_id, result.last_date, result.model_name, result.points)
 
-            await session.execute(
-                delete(PriceForecast).where(
-                    PriceForecast.commodity_id == commodity_id,
-                    PriceForecast.region_id == region_id,
-                    PriceForecast.forecast_date > last_date,
-                )
-            )
-
-            for point in points:
-                session.add(
-                    PriceForecast(
-                        commodity_id=commodity_id,
-                        region_id=region_id,
-                        forecast_date=point["forecast_date"],
-                        predicted_price=Decimal(str(round(point["predicted_price"], 2))),
-                        confidence_lower=Decimal(str(round(point["confidence_lower"], 2))),
-                        confidence_upper=Decimal(str(round(point["confidence_upper"], 2))),
-                        model_used=trained_model.model_name,
-                    )
-                )
-                generated_rows += 1
+            pair = (result.commodity_id, result.region_id)
+            state = _record_fit_state(session, states, pair, dirty[pair], result.model_name)
+            if result.warm_start is not None:
+                state.model_params = result.warm_start.to_dict()
+
+        # Pairs too short to fit keep their existing forecasts until more rows arrive.
+        # Failed fits and pairs lost with a worker are left dirty so the next run retries them.
+        for pair in too_short:
+            _record_fit_state(session, states, pair, dirty[pair], None)
 
+        generated_rows = await write_forecasts(session, buffer)
         await session.commit()
+    if generated_rows:
+        mark_data_changed("forecasts regenerated")
 
-    return {"status": "success", "rows_generated": generated_rows}
+    logger.info(
+        "Fitted %d pairs on %d workers in %.2fs (%.1f pairs/sec, %d failed, %d warm-started, %d optimizer iterations)",
+        stats.pairs_completed,
+        stats.workers,
+        stats.elapsed_seconds,
+        stats.pairs_per_second,
+        stats.pairs_failed,
+        stats.pairs_warm_started,
+        stats.optimizer_iterations,
+    )
+    if stats.model_seconds:
+        logger.info(
+            "Model CPU time: %s (%d pairs limited to cheap models by the budget)",
+            ", ".join(f"{name}={seconds:.2f}s" for name, seconds in sorted(stats.model_seconds.items())),
+            stats.pairs_budget_limited,
+        )
+    return {
+        "status": "success",
+        "rows_generated": generated_rows,
+        "pairs_fitted": stats.pairs_completed,
+        "pairs_failed": stats.pairs_failed,
+        "pairs_unchanged": pairs_unchanged,
+        "pairs_warm_started": stats.pairs_warm_started,
+        "pairs_per_second": round(stats.pairs_per_second, 2),
+    }
 
 
 async def get_forecast_by_commodity(
@@ -0,0 +1,155 @@
+"""Bulk writer that swaps freshly fitted forecasts into ``price_forecasts``.
+
+Points are buffered column by column while fits stream in, then replaced in
+one set-based pass: a single ``DELETE`` of every refitted pair's future rows
+and one bulk load of the new rows, all inside the caller's transaction.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import and_, bindparam, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import PriceForecast
+from app.utils.bulk import copy_records, is_postgresql
+
+FORECAST_COLUMNS = (
+    "commodity_id",
+    "region_id",
+    "forecast_date",
+    "predicted_price",
+    "confidence_lower",
+    "confidence_upper",
+    "model_used",
+)
+
+
+@dataclass(slots=True)
+class ForecastBuffer:
+    """Columnar staging area for forecast points, plus the pairs they replace."""
+
+    commodity_ids: list[int] = field(default_factory=list)
+    region_ids: list[int] = field(default_factory=list)
+    forecast_dates: list[date] = field(default_factory=list)
+    predicted_prices: list[float] = field(default_factory=list)
+    confidence_lowers: list[float] = field(default_factory=list)
+    confidence_uppers: list[float] = field(default_factory=list)
+    models_used: list[str] = field(default_factory=list)
+    replaced_pairs: list[tuple[int, int, date]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.forecast_dates)
+
+    def add(self, commodity_id: int, region_id: int, last_date: date, model_name: str, points: list[dict]) -> None:
+        """Stage ``points`` for a pair; its existing forecasts after ``last_date`` will be replaced."""
+        self.replaced_pairs.append((commodity_id, region_id, last_date))
+        for point in points:
+            self.commodity_ids.append(commodity_id)
+            self.region_ids.append(region_id)
+            self.forecast_dates.append(point["forecast_date"])
+            self.predicted_prices.append(point["predicted_price"])
+            self.confidence_lowers.append(point["confidence_lower"])
+            self.confidence_uppers.append(point["confidence_upper"])
+            self.models_used.append(model_name)
+
+    def records(self) -> Iterator[tuple]:
+        return zip(
+            self.commodity_ids,
+            self.region_ids,
+            self.forecast_dates,
+            self.predicted_prices,
+            self.confidence_lowers,
+            self.confidence_uppers,
+            self.models_used,
+            strict=True,
+        )
+
+
+async def _write_postgresql(session: AsyncSession, buffer: ForecastBuffer) -> None:
+    await session.execute(
+        text(
+            "CREATE TEMP TABLE forecast_replaced_pairs "
+            "(commodity_id integer, region_id integer, last_date date) ON COMMIT DROP"
+        )
+    )
+    await session.execute(
+        text(
+            "CREATE TEMP TABLE forecast_stage (commodity_id integer, region_id integer, forecast_date date, "
+            "predicted_price float8, confidence_lower float8, confidence_upper float8, model_used varchar(50)) "
+            "ON COMMIT DROP"
+        )
+    )
+    await copy_records(
+        session, "forecast_replaced_pairs", ("commodity_id", "region_id", "last_date"), buffer.replaced_pairs
+    )
+    await copy_records(session, "forecast_stage", FORECAST_COLUMNS, buffer.records())
+
+    await session.execute(
+        text(
+            "DELETE FROM price_forecasts AS f USING forecast_replaced_pairs AS p "
+            "WHERE f.commodity_id = p.commodity_id AND f.region_id = p.region_id AND f.forecast_date > p.last_date"
+        )
+    )
+    await session.execute(
+        text(
+            f"INSERT INTO price_forecasts ({', '.join(FORECAST_COLUMNS)}) "
+            "SELECT commodity_id, region_id, forecast_date, round(predicted_price::numeric, 2), "
+            "round(confidence_lower::numeric, 2), round(confidence_upper::numeric, 2), model_used "
+            "FROM forecast_stage"
+        )
+    )
+    await session.execute(text("DROP TABLE forecast_stage, forecast_replaced_pairs"))
+
+
+def _to_decimal(value: float) -> Decimal:
+    return Decimal(str(round(value, 2)))
+
+
+async def _write_executemany(session: AsyncSession, buffer: ForecastBuffer) -> None:
+    table = PriceForecast.__table__
+    await session.execute(
+        table.delete().where(
+            and_(
+                table.c.commodity_id == bindparam("pair_commodity_id"),
+                table.c.region_id == bindparam("pair_region_id"),
+                table.c.forecast_date > bindparam("pair_last_date"),
+            )
+        ),
+        [
+            {"pair_commodity_id": commodity_id, "pair_region_id": region_id, "pair_last_date": last_date}
+            for commodity_id, region_id, last_date in buffer.replaced_pairs
+        ],
+    )
+    await session.execute(
+        insert(table),
+        [
+            {
+                "commodity_id": commodity_id,
+                "region_id": region_id,
+                "forecast_date": forecast_date,
+                "predicted_price": _to_decimal(predicted),
+                "confidence_lower": _to_decimal(lower),
+                "confidence_upper": _to_decimal(upper),
+                "model_used": model_used,
+            }
+            for commodity_id, region_id, forecast_date, predicted, lower, upper, model_used in buffer.records()
+        ],
+    )
+
+
+async def write_forecasts(session: AsyncSession, buffer: ForecastBuffer) -> int:
+    """Replace the buffered pairs' forecasts in one set-based pass; return the rows written.
+
+    Runs inside the session's transaction and does not commit.
+    """
+    if not buffer.replaced_pairs:
+        return 0
+
+    if is_postgresql(session):
+        await _write_postgresql(session, buffer)
+    else:
+        await _write_executemany(session, buffer)
+    return len(buffer)
@@ -0,0 +1,116 @@
+"""In-process tracker for startup jobs that run after the server is accepting requests.
+
+Jobs are registered as pending up front and run one after another on a
+single background task, so ``/health/ready`` can report every job from the
+moment the app starts.  A job name the tracker has never seen counts as
+finished; that keeps routers usable when the app is started without
+background jobs (tests, ``STARTUP_MODE=blocking``).
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from enum import StrEnum
+
+logger = logging.getLogger("agrisenta.jobs")
+
+SEED_JOB = "seed"
+FORECAST_JOB = "forecast"
+
+
+class JobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class BackgroundJob:
+    name: str
+    status: JobStatus = JobStatus.PENDING
+    detail: str | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (JobStatus.PENDING, JobStatus.RUNNING)
+
+    def to_dict(self) -> dict:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = ((self.finished_at or datetime.now(UTC)) - self.started_at).total_seconds()
+        return {
+            "status": self.status.value,
+            "detail": self.detail,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "elapsed_seconds": round(elapsed, 2) if elapsed is not None else None,
+        }
+
+
+JobStep = tuple[str, Callable[[], Awaitable[str | None]]]
+
+
+class JobTracker:
+    def __init__(self) -> None:
+        self._jobs: dict[str, BackgroundJob] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def jobs(self) -> dict[str, BackgroundJob]:
+        return dict(self._jobs)
+
+    def is_active(self, name: str) -> bool:
+        job = self._jobs.get(name)
+        return job is not None and job.is_active
+
+    def is_ready(self) -> bool:
+        return all(job.status is JobStatus.SUCCEEDED for job in self._jobs.values())
+
+    async def _run(self, steps: list[JobStep]) -> None:
+        for index, (name, step) in enumerate(steps):
+            job = self._jobs[name]
+            job.status = JobStatus.RUNNING
+            job.started_at = datetime.now(UTC)
+            try:
+                job.detail = await step()
+                job.status = JobStatus.SUCCEEDED
+            except Exception as exc:
+                logger.exception("Startup job %s failed", name)
+                job.status = JobStatus.FAILED
+                job.detail = str(exc)
+                for skipped_name, _ in steps[index + 1 :]:
+                    skipped = self._jobs[skipped_name]
+                    skipped.status = JobStatus.FAILED
+                    skipped.detail = f"skipped because {name} failed"
+                return
+            finally:
+                job.finished_at = datetime.now(UTC)
+            logger.info("Startup job %s finished in %.1fs", name, (job.finished_at - job.started_at).total_seconds())
+
+    def start(self, steps: list[JobStep]) -> asyncio.Task:
+        """Register ``steps`` as pending and run them in order on a background task."""
+        for name, _ in steps:
+            self._jobs[name] = BackgroundJob(name=name)
+        self._task = asyncio.create_task(self._run(steps))
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def reset(self) -> None:
+        self._jobs.clear()
+        self._task = None
+
+
+job_tracker = JobTracker()
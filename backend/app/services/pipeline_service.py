@@ -1,57 +1,268 @@
+"""Scrape, clean and load daily prices from one or all upstream sources.
+
+An ``"ALL"`` run fetches every source in ``settings.scrape_sources``
+concurrently, each under its own timeout, then streams the cleaned records
+into a single upsert, so the snapshot, rollup, rolling-stat and alert work
+downstream runs once per run rather than once per source.  A large extract
+(PSA) is only downloaded under the timeout; its CSV chunks are parsed,
+cleaned and staged one at a time during the load, so a chunk that fails to
+parse fails the load.
+A source that fails or times out is logged and skipped; the others still
+load.  A source whose upstream page is unchanged since it was loaded today is
+skipped without parsing (see ``app.scraping.http_client``); when every
+source is unchanged nothing is upserted at all.  Every source gets its own
+scrape log row.  Each run stages the validators it fetched in its own
+``ValidatorStaging`` and commits them only once its data is loaded.
+"""
+
+import asyncio
 import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from functools import partial
 from time import perf_counter
 
 from app.config import get_settings
+from app.data_version import mark_data_changed
 from app.database import AsyncSessionLocal
-from app.scraping.data_cleaner import clean_price_records
-from app.scraping.data_loader import upsert_daily_prices
+from app.scraping.data_cleaner import clean_price_batch
+from app.scraping.data_loader import UpsertResult, upsert_daily_prices
+from app.scraping.http_client import UpstreamNotModified, ValidatorStaging, scraper_http
+from app.scraping.name_resolver import NameResolver
 from app.scraping.scrape_logger import create_scrape_log
+from app.scraping.scraper_bantay_presyo import scrape_bantay_presyo_prices
 from app.scraping.scraper_da import scrape_da_prices
 from app.scraping.scraper_psa import scrape_psa_prices
+from app.scraping.types import PriceRecordBatch, RawPriceRecord
+from app.services.alert_service import create_price_alerts
 
 logger = logging.getLogger("agrisenta.pipeline")
 settings = get_settings()
 
+ALL_SOURCES = "ALL"
+# Unresolved names listed in a run's result and log.
+UNMATCHED_REPORT_LIMIT = 20
+
+
+# Scrapers of large extracts (PSA) return a stream of column batches rather than a record per row.
+Scraper = Callable[[], Awaitable[list[RawPriceRecord] | PriceRecordBatch | AsyncIterator[PriceRecordBatch]]]
+
+
+def _source_scrapers(staging: ValidatorStaging, *, force: bool = False) -> dict[str, tuple[Scraper, str]]:
+    """Scraper and URL per source name; each scraper stamps its records with that name as ``source``.
+
+    Validators the scrapers fetch go into ``staging``.  ``force`` re-ingests
+    pages that are unchanged since their last load.
+    """
+    options = {"staging": staging, "conditional": not force}
+    return {
+        "DA": (partial(scrape_da_prices, settings.da_scrape_url, **options), settings.da_scrape_url),
+        "PSA": (partial(scrape_psa_prices, settings.psa_api_url, **options), settings.psa_api_url),
+        "BANTAY_PRESYO": (
+            partial(scrape_bantay_presyo_prices, settings.bantay_presyo_url),
+            settings.bantay_presyo_url,
+        ),
+    }
+
+
+@dataclass(slots=True)
+class SourceFetch:
+    source: str
+    # A streamed source's chunks are cleaned as the load consumes them.
+    records: PriceRecordBatch | AsyncIterator[PriceRecordBatch] = field(default_factory=PriceRecordBatch.empty)
+    error: str | None = None
+    unchanged: bool = False
+    duration_seconds: float = 0.0
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "failed"
+        return "unchanged" if self.unchanged else "success"
+
+
+async def _fetch_source(source: str, scrape: Scraper, url: str, staging: ValidatorStaging) -> SourceFetch:
+    """Scrape and clean one source (a streamed one is only opened); failures are captured rather than raised."""
+    started_at = perf_counter()
+    timeout = settings.scrape_source_timeout_seconds
+    try:
+        raw_records = await asyncio.wait_for(scrape(), timeout=timeout)
+    except UpstreamNotModified:
+        duration = perf_counter() - started_at
+        logger.info("Skipping %s: upstream unchanged since the last load", source)
+        return SourceFetch(source, unchanged=True, duration_seconds=duration)
+    except TimeoutError:
+        error = f"timed out after {timeout:g}s"
+    except Exception as exc:
+        error = str(exc) or type(exc).__name__
+    else:
+        if isinstance(raw_records, AsyncIterator):
+            duration = perf_counter() - started_at
+            logger.info("Fetched %s in %.2fs; its chunks are cleaned as they load", source, duration)
+            return SourceFetch(source, raw_records, duration_seconds=duration)
+        if not isinstance(raw_records, PriceRecordBatch):
+            raw_records = PriceRecordBatch.from_records(raw_records)
+        records = clean_price_batch(raw_records)
+        duration = perf_counter() - started_at
+        logger.info(
+            "Scraped %d raw records (%d clean) from %s in %.2fs", len(raw_records), len(records), source, duration
+        )
+        return SourceFetch(source, records, duration_seconds=duration)
+
+    # Whatever it fetched was not loaded, so the next run must not treat it as current.
+    staging.discard(url)
+    duration = perf_counter() - started_at
+    logger.error("Scrape failed for %s after %.2fs: %s", source, duration, error)
+    return SourceFetch(source, error=error, duration_seconds=duration)
+
+
+async def _loaded_batches(fetches: list[SourceFetch]) -> AsyncIterator[PriceRecordBatch]:
+    """Every source's cleaned records, a streamed source's one chunk at a time.
 
-async def run_ingestion_pipeline(source: str = "DA") -> dict[str, int | str]:
+    The upsert keeps the last row per ``daily_prices`` key, as a page can
+    list a commodity/market more than once.
+    """
+    for fetch in fetches:
+        if isinstance(fetch.records, PriceRecordBatch):
+            yield fetch.records
+            continue
+        async with aclosing(fetch.records) as chunks:
+            async for chunk in chunks:
+                yield clean_price_batch(chunk)
+
+
+def _describe_unmatched(upsert: UpsertResult) -> list[str]:
+    """The most frequent unresolved names, most rows first, as ``"kind: name (rows)"``."""
+    return [
+        f"{kind}: {name} ({count})"
+        for (kind, name), count in upsert.unmatched_names.most_common(UNMATCHED_REPORT_LIMIT)
+    ]
+
+
+def _log_name_resolution(upsert: UpsertResult, resolver: NameResolver) -> None:
+    logger.info("Name resolution (distinct names by step): %s", resolver.match_summary())
+    if upsert.unmatched_rows:
+        logger.warning(
+            "Dropped %d rows with unresolved names (%s); most frequent: %s",
+            upsert.unmatched_rows.total(),
+            ", ".join(f"{source}={count}" for source, count in sorted(upsert.unmatched_rows.items())),
+            "; ".join(_describe_unmatched(upsert)),
+        )
+
+
+def _resolve_sources(source: str) -> list[str]:
+    name = source.upper()
+    if name == ALL_SOURCES:
+        return [configured.upper() for configured in settings.scrape_sources]
+    return [name]
+
+
+async def run_ingestion_pipeline(source: str = "DA", *, force: bool = False) -> dict[str, object]:
+    """Ingest ``source`` (``"DA"``, ``"PSA"``, ``"BANTAY_PRESYO"`` or ``"ALL"``).
+
+    Raises when nothing could be loaded: every requested source failed, or
+    the upsert itself did.  ``force`` loads unchanged upstream pages again.
+    """
     started_at = perf_counter()
-    logger.info("Starting ingestion pipeline for source=%s", source.upper())
+    source_name = source.upper()
+    source_names = _resolve_sources(source)
+    staging = scraper_http.cache.staging()
+    scrapers = _source_scrapers(staging, force=force)
+    unknown = [name for name in source_names if name not in scrapers]
+    if unknown:
+        raise ValueError(f"Unknown scrape source(s): {', '.join(unknown)}")
+    logger.info("Starting ingestion pipeline for source=%s (%s)", source_name, ", ".join(source_names))
+
+    fetches = await asyncio.gather(*(_fetch_source(name, *scrapers[name], staging) for name in source_names))
+    succeeded = [fetch for fetch in fetches if fetch.error is None]
+    loaded = [fetch for fetch in succeeded if not fetch.unchanged]
 
     async with AsyncSessionLocal() as session:
+        if not succeeded:
+            for fetch in fetches:
+                await create_scrape_log(
+                    session,
+                    source=fetch.source,
+                    status="failed",
+                    rows_ingested=0,
+                    error_message=fetch.error,
+                    duration_seconds=fetch.duration_seconds,
+                )
+            await session.commit()
+            raise RuntimeError("; ".join(f"{fetch.source}: {fetch.error}" for fetch in fetches))
+
+        load_started_at = perf_counter()
         try:
-            if source.upper() == "PSA":
-                raw_records = await scrape_psa_prices(settings.psa_api_url)
-                source_name = "PSA"
+            if loaded:
+                resolver = await NameResolver.load(session)
+                async with aclosing(_loaded_batches(loaded)) as batches:
+                    upsert = await upsert_daily_prices(session, batches, resolver)
+                _log_name_resolution(upsert, resolver)
+                alerts_created = await create_price_alerts(session) if upsert.written else 0
             else:
-                raw_records = await scrape_da_prices(settings.da_scrape_url)
-                source_name = "DA"
-
-            logger.info("Scraped %d raw records from %s", len(raw_records), source_name)
-
-            cleaned_records = clean_price_records(raw_records)
-            rows_ingested = await upsert_daily_prices(session, cleaned_records)
-            duration = perf_counter() - started_at
+                upsert, alerts_created = UpsertResult(), 0
 
-            await create_scrape_log(
-                session,
-                source=source_name,
-                status="success",
-                rows_ingested=rows_ingested,
-                error_message=None,
-                duration_seconds=duration,
-            )
-
-            logger.info("Ingestion complete: %d rows in %.2fs", rows_ingested, duration)
-            return {"status": "success", "source": source_name, "rows_ingested": rows_ingested}
+            load_duration = perf_counter() - load_started_at
+            for fetch in fetches:
+                await create_scrape_log(
+                    session,
+                    source=fetch.source,
+                    status=fetch.status,
+                    rows_ingested=upsert.merged[fetch.source],
+                    rows_unmatched=upsert.unmatched_rows[fetch.source],
+                    rows_inserted=upsert.inserted[fetch.source],
+                    rows_changed=upsert.changed[fetch.source],
+                    rows_unchanged=upsert.unchanged[fetch.source],
+                    error_message=fetch.error,
+                    # Each source's own fetch time plus the load they shared.
+                    duration_seconds=fetch.duration_seconds + load_duration,
+                )
+            # Prices, alerts and scrape logs land together or not at all.
+            await session.commit()
         except Exception as exc:
-            duration = perf_counter() - started_at
-            logger.error("Ingestion failed for %s after %.2fs: %s", source.upper(), duration, exc)
-            await create_scrape_log(
-                session,
-                source=source.upper(),
-                status="failed",
-                rows_ingested=0,
-                error_message=str(exc),
-                duration_seconds=duration,
-            )
+            await session.rollback()
+            staging.discard()
+            load_duration = perf_counter() - load_started_at
+            logger.error("Ingestion failed for %s after %.2fs: %s", source_name, perf_counter() - started_at, exc)
+            for fetch in fetches:
+                await create_scrape_log(
+                    session,
+                    source=fetch.source,
+                    status="failed",
+                    rows_ingested=0,
+                    error_message=fetch.error or str(exc),
+                    duration_seconds=fetch.duration_seconds + load_duration,
+                )
+            await session.commit()
             raise
+        staging.commit()
+
+    if upsert.written or alerts_created:
+        mark_data_changed("daily prices ingested")
+
+    rows_ingested = upsert.row_count
+    duration = perf_counter() - started_at
+    logger.info(
+        "Ingestion complete: %d rows (%d inserted, %d changed, %d unchanged), %d alerts from %d/%d sources in %.2fs",
+        rows_ingested,
+        upsert.inserted.total(),
+        upsert.changed.total(),
+        upsert.unchanged.total(),
+        alerts_created,
+        len(succeeded),
+        len(fetches),
+        duration,
+    )
+    return {
+        "status": "success" if len(succeeded) == len(fetches) else "partial",
+        "source": source_name,
+        "rows_ingested": rows_ingested,
+        "alerts_created": alerts_created,
+        "sources": {fetch.source: fetch.status for fetch in fetches},
+        "rows_unmatched": upsert.unmatched_rows.total(),
+        "rows_inserted": upsert.inserted.total(),
+        "rows_changed": upsert.changed.total(),
+        "rows_unchanged": upsert.unchanged.total(),
+        "unmatched_names": _describe_unmatched(upsert),
+    }
@@ -0,0 +1,57 @@
+"""The keys of the ``daily_prices`` rows an ingestion inserted or changed.
+
+The upsert records them in a temporary table on the session's connection
+instead of returning every written row to Python, so a large load (a first
+PSA extract, a backfill) stays bounded in memory.  The rollup, rolling-stat
+and alert work that follows reads the table with set-based SQL.  On
+PostgreSQL the table is dropped when the transaction ends; elsewhere it is
+emptied when the next load prepares it.
+"""
+
+from sqlalchemy import Column, ColumnElement, Date, Integer, MetaData, String, Table, and_, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DailyPrice
+from app.utils.bulk import is_postgresql
+
+# Its own metadata, so ``create_all`` never creates it as a regular table.
+daily_price_changes = Table(
+    "daily_price_changes",
+    MetaData(),
+    Column("commodity_id", Integer, nullable=False),
+    Column("market_id", Integer, nullable=False),
+    Column("region_id", Integer, nullable=False),
+    Column("date", Date, nullable=False),
+    Column("source", String(40), nullable=False),
+)
+
+CHANGE_COLUMNS = tuple(column.name for column in daily_price_changes.columns)
+
+_CREATE_SQL = (
+    "CREATE TEMP TABLE IF NOT EXISTS daily_price_changes (commodity_id integer NOT NULL, "
+    "market_id integer NOT NULL, region_id integer NOT NULL, date date NOT NULL, source varchar(40) NOT NULL)"
+)
+
+
+async def prepare_price_changes(session: AsyncSession) -> None:
+    """Create the changes table for this transaction if needed, and empty it."""
+    suffix = " ON COMMIT DROP" if is_postgresql(session) else ""
+    await session.execute(text(_CREATE_SQL + suffix))
+    await session.execute(daily_price_changes.delete())
+
+
+async def record_price_changes(session: AsyncSession, keys: list[dict]) -> None:
+    """Add the keys (``CHANGE_COLUMNS`` dicts) of rows written without a set-based merge."""
+    if keys:
+        await session.execute(insert(daily_price_changes), keys)
+
+
+def daily_price_join() -> ColumnElement[bool]:
+    """Join condition between ``daily_price_changes`` and the ``daily_prices`` rows it names."""
+    changes = daily_price_changes.c
+    return and_(
+        DailyPrice.commodity_id == changes.commodity_id,
+        DailyPrice.market_id == changes.market_id,
+        DailyPrice.date == changes.date,
+        DailyPrice.source == changes.source,
+    )
@@ -1,9 +1,11 @@
 from datetime import date
+from decimal import Decimal
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import Date, Select, and_, case, delete, func, insert, literal, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Commodity, DailyPrice, Region
+from app.cache import ResponseCache
+from app.models import Commodity, DailyPrice, LatestPriceSnapshot, Region
 
 
 async def get_daily_prices(
@@ -30,29 +32,114 @@ async def get_daily_prices(
     return list(result.scalars().all())
 
 
-def _build_latest_base_query(
-    *,
-    search: str | None = None,
-    category: str | None = None,
-    region_id: int | None = None,
-):
-    """Build the base query for latest prices with optional filters.
+async def refresh_latest_price_snapshot(session: AsyncSession) -> int:
+    """Rebuild ``latest_price_snapshots`` from the two most recent dates in ``daily_prices``.
 
-    Returns (columns_query, count_subquery_conditions) that share the same
-    WHERE clauses for consistency.
+    One grouped ``INSERT ... SELECT`` over just those two dates, so the cost
+    does not grow with the length of the history.  Runs in the caller's
+    transaction and returns the number of snapshot rows written.
     """
-    latest_date_subquery = select(func.max(DailyPrice.date)).scalar_subquery()
+    dates_result = await session.execute(
+        select(DailyPrice.date).distinct().order_by(DailyPrice.date.desc()).limit(2)
+    )
+    dates = list(dates_result.scalars().all())
 
-    conditions = [DailyPrice.date == latest_date_subquery]
+    await session.execute(delete(LatestPriceSnapshot))
+    _latest_total_cache.invalidate()
+    if not dates:
+        return 0
 
+    latest_date = dates[0]
+    previous_date = dates[1] if len(dates) > 1 else None
+    is_latest = DailyPrice.date == latest_date
+    is_previous = DailyPrice.date == previous_date
+
+    summary = (
+        select(
+            DailyPrice.commodity_id,
+            DailyPrice.market_id,
+            DailyPrice.region_id,
+            literal(latest_date, Date),
+            func.coalesce(func.sum(case((is_latest, DailyPrice.price_prevailing))), 0),
+            func.count(case((is_latest, 1))),
+            literal(previous_date, Date),
+            func.coalesce(func.sum(case((is_previous, DailyPrice.price_prevailing))), 0),
+            func.count(case((is_previous, 1))),
+        )
+        .where(DailyPrice.date.in_(dates))
+        .group_by(DailyPrice.commodity_id, DailyPrice.market_id, DailyPrice.region_id)
+    )
+    result = await session.execute(
+        insert(LatestPriceSnapshot).from_select(
+            [
+                "commodity_id",
+                "market_id",
+                "region_id",
+                "latest_date",
+                "latest_price_sum",
+                "latest_price_count",
+                "previous_date",
+                "previous_price_sum",
+                "previous_price_count",
+            ],
+            summary,
+        )
+    )
+    return result.rowcount
+
+
+def _average(price_sum: Decimal | None, price_count: int | None) -> Decimal | None:
+    if not price_count:
+        return None
+    return Decimal(price_sum) / price_count
+
+
+def _latest_prices_query(*, search: str | None, category: str | None, region_id: int | None) -> Select:
+    """Latest average price per commodity and region, rolled up from the per-market snapshot."""
+    snapshot = LatestPriceSnapshot
+    conditions = [snapshot.latest_price_count > 0]
     if search:
         conditions.append(Commodity.name.ilike(f"%{search}%"))
     if category:
         conditions.append(Commodity.category == category)
     if region_id is not None:
-        conditions.append(DailyPrice.region_id == region_id)
+        conditions.append(snapshot.region_id == region_id)
 
-    return conditions, latest_date_subquery
+    return (
+        select(
+            snapshot.commodity_id,
+            Commodity.name.label("commodity_name"),
+            Commodity.category.label("commodity_category"),
+            snapshot.region_id,
+            Region.code.label("region_code"),
+            snapshot.latest_date.label("date"),
+            func.sum(snapshot.latest_price_sum).label("price_sum"),
+            func.sum(snapshot.latest_price_count).label("price_count"),
+        )
+        .join(Commodity, Commodity.id == snapshot.commodity_id)
+        .join(Region, Region.id == snapshot.region_id)
+        .where(*conditions)
+        .group_by(
+            snapshot.commodity_id,
+            Commodity.name,
+            Commodity.category,
+            snapshot.region_id,
+            Region.code,
+            snapshot.latest_date,
+        )
+    )
+
+
+def _latest_price_item(row) -> dict:
+    return {
+        "commodity_id": row.commodity_id,
+        "commodity_name": row.commodity_name,
+        "commodity_category": row.commodity_category,
+        "region_id": row.region_id,
+        "region_code": row.region_code,
+        "date": row.date,
+        "avg_price": _average(row.price_sum, row.price_count),
+    }
 
 
 async def get_latest_prices(
@@ -64,44 +151,128 @@ async def get_latest_prices(
     limit: int = 20,
     offset: int = 0,
 ) -> tuple[list[dict], int]:
-    """Return (items, total_count) for latest prices with server-side filtering."""
-    conditions, _ = _build_latest_base_query(
-        search=search, category=category, region_id=region_id
+    """Return (items, total_count) for latest prices with server-side filtering.
+
+    Reads the per-market snapshot and rolls it up to commodity and region;
+    the page and the total come back from a single query.
+    """
+    base = _latest_prices_query(search=search, category=category, region_id=region_id)
+    page_stmt = (
+        base.add_columns(func.count().over().label("total"))
+        .order_by(Commodity.name.asc(), Region.code.asc())
+        .limit(limit)
+        .offset(offset)
     )
+    result = await session.execute(page_stmt)
+    rows = result.all()
+
+    if rows:
+        total = rows[0].total
+    elif offset > 0:
+        # Past the last page: the window count is unavailable, count separately.
+        total = await session.scalar(select(func.count()).select_from(base.subquery())) or 0
+    else:
+        total = 0
+
+    return [_latest_price_item(row) for row in rows], total
+
 
-    base = (
+LatestPriceKey = tuple[str, str]
+
+# Totals for cursor pagination, keyed by filter.  Cleared whenever the
+# snapshot is rebuilt and otherwise kept for LATEST_TOTAL_TTL_SECONDS, so a
+# client scrolling through pages never pays for a count after the first one.
+# The filter includes free-text search, so the least recently used totals are
+# evicted past LATEST_TOTAL_MAX_ENTRIES.
+LATEST_TOTAL_TTL_SECONDS = 300.0
+LATEST_TOTAL_MAX_ENTRIES = 1024
+_latest_total_cache = ResponseCache(max_entries=LATEST_TOTAL_MAX_ENTRIES, ttl_seconds=LATEST_TOTAL_TTL_SECONDS)
+
+
+async def _cached_latest_total(
+    session: AsyncSession, *, search: str | None, category: str | None, region_id: int | None
+) -> int:
+    async def _count() -> int:
+        base = _latest_prices_query(search=search, category=category, region_id=region_id)
+        return await session.scalar(select(func.count()).select_from(base.subquery())) or 0
+
+    return await _latest_total_cache.get_or_load((search, category, region_id), _count)
+
+
+async def get_latest_prices_after(
+    session: AsyncSession,
+    *,
+    search: str | None = None,
+    category: str | None = None,
+    region_id: int | None = None,
+    limit: int = 20,
+    after: LatestPriceKey | None = None,
+) -> tuple[list[dict], LatestPriceKey | None, int]:
+    """Keyset-paginated latest prices: the page after ``after`` in (commodity name, region code) order.
+
+    Returns ``(items, next_key, total)``.  ``next_key`` is ``None`` on the last
+    page.  ``total`` comes from a per-filter cache rather than a fresh count,
+    so every page costs the same regardless of depth.
+    """
+    statement = _latest_prices_query(search=search, category=category, region_id=region_id)
+    if after is not None:
+        commodity_name, region_code = after
+        statement = statement.where(
+            or_(
+                Commodity.name > commodity_name,
+                and_(Commodity.name == commodity_name, Region.code > region_code),
+            )
+        )
+    statement = statement.order_by(Commodity.name.asc(), Region.code.asc()).limit(limit + 1)
+
+    result = await session.execute(statement)
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_key = (rows[-1].commodity_name, rows[-1].region_code) if has_more else None
+    total = await _cached_latest_total(session, search=search, category=category, region_id=region_id)
+    return [_latest_price_item(row) for row in rows], next_key, total
+
+
+async def get_price_board_snapshot(
+    session: AsyncSession, *, market_id: int | None = None, category: str | None = None
+) -> list[dict]:
+    """Latest and previous-date average price per commodity, from the snapshot."""
+    snapshot = LatestPriceSnapshot
+    statement = (
         select(
-            DailyPrice.commodity_id,
+            Commodity.id.label("commodity_id"),
             Commodity.name.label("commodity_name"),
-            Commodity.category.label("commodity_category"),
-            DailyPrice.region_id,
-            Region.code.label("region_code"),
-            DailyPrice.date,
-            func.avg(DailyPrice.price_prevailing).label("avg_price"),
-        )
-        .join(Commodity, Commodity.id == DailyPrice.commodity_id)
-        .join(Region, Region.id == DailyPrice.region_id)
-        .where(*conditions)
-        .group_by(
-            DailyPrice.commodity_id,
-            Commodity.name,
             Commodity.category,
-            DailyPrice.region_id,
-            Region.code,
-            DailyPrice.date,
+            Commodity.unit,
+            func.sum(snapshot.latest_price_sum).label("latest_sum"),
+            func.sum(snapshot.latest_price_count).label("latest_count"),
+            func.sum(snapshot.previous_price_sum).label("previous_sum"),
+            func.sum(snapshot.previous_price_count).label("previous_count"),
         )
+        .join(Commodity, Commodity.id == snapshot.commodity_id)
+        .group_by(Commodity.id, Commodity.name, Commodity.category, Commodity.unit)
+        .having(func.sum(snapshot.latest_price_count) > 0)
+        .order_by(Commodity.category, Commodity.name)
     )
+    if market_id:
+        statement = statement.where(snapshot.market_id == market_id)
+    if category:
+        statement = statement.where(Commodity.category == category)
 
-    # Count total matching groups
-    count_stmt = select(func.count()).select_from(base.subquery())
-    total = await session.scalar(count_stmt) or 0
-
-    # Fetch the page
-    page_stmt = base.order_by(Commodity.name.asc(), Region.code.asc()).limit(limit).offset(offset)
-    result = await session.execute(page_stmt)
-    items = [dict(row._mapping) for row in result]
-
-    return items, total
+    result = await session.execute(statement)
+    return [
+        {
+            "commodity_id": row.commodity_id,
+            "commodity_name": row.commodity_name,
+            "category": row.category,
+            "unit": row.unit,
+            "avg_price": _average(row.latest_sum, row.latest_count),
+            "prev_price": _average(row.previous_sum, row.previous_count),
+        }
+        for row in result
+    ]
 
 
 async def get_price_history(
@@ -0,0 +1,330 @@
+"""Rolling price statistics and spike detection, maintained as prices are ingested.
+
+Each commodity/region pair keeps a persisted window over its most recent
+``SPIKE_WINDOW_ROWS`` prevailing prices (rows ordered by date, then market
+and source) with a running sum and sum of squares.  Appending a row is O(1):
+add it, drop the value leaving the window, and record a ``PriceSpike`` when
+the row sits more than ``SPIKE_THRESHOLD_SIGMA`` sample standard deviations
+from the window mean (the window includes the row itself, as the original
+30-row ``avg``/``stddev_samp`` window query did).
+
+When an ingestion touches a date at or before a pair's newest folded-in date
+(a re-scrape of the same day, or a backfill), that pair is replayed from the
+earliest touched date instead, seeded with the rows just before it.  The
+touched rows are read from ``daily_price_changes``; appends are streamed in
+pair order and replays load one pair at a time, so an ingestion never holds
+its written rows in memory.
+"""
+
+import logging
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DailyPrice, PriceSpike, RollingPriceStat
+from app.services.price_changes import daily_price_changes, daily_price_join
+
+logger = logging.getLogger("agrisenta.rolling_stats")
+
+SPIKE_WINDOW_ROWS = 30
+SPIKE_THRESHOLD_SIGMA = 2.0
+# Rows per fetch when streaming appended rows.
+APPEND_BATCH_ROWS = 5000
+
+Pair = tuple[int, int]
+
+
+@dataclass(slots=True)
+class PriceRow:
+    market_id: int
+    source: str
+    date: date
+    price: Decimal
+
+    @property
+    def sort_key(self) -> tuple[date, int, str]:
+        return self.date, self.market_id, self.source
+
+
+@dataclass(slots=True)
+class RollingWindow:
+    values: deque[float] = field(default_factory=lambda: deque(maxlen=SPIKE_WINDOW_ROWS))
+    total: float = 0.0
+    total_sq: float = 0.0
+
+    @classmethod
+    def from_state(cls, state: RollingPriceStat) -> "RollingWindow":
+        return cls(deque(state.window_values, maxlen=SPIKE_WINDOW_ROWS), state.window_sum, state.window_sum_sq)
+
+    def push(self, value: float) -> None:
+        if len(self.values) == self.values.maxlen:
+            leaving = self.values[0]
+            self.total -= leaving
+            self.total_sq -= leaving * leaving
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+
+    @property
+    def mean(self) -> float:
+        return self.total / len(self.values)
+
+    @property
+    def std(self) -> float | None:
+        """Sample standard deviation, or ``None`` below two values."""
+        count = len(self.values)
+        if count < 2:
+            return None
+        # Running sums can drift a hair below zero for constant windows.
+        return math.sqrt(max((self.total_sq - self.total * self.total / count) / (count - 1), 0.0))
+
+    def spike(self, pair: Pair, row: PriceRow) -> dict | None:
+        """Fold ``row`` in; return the spike record if it is an outlier against the updated window."""
+        price = float(row.price)
+        self.push(price)
+        std = self.std
+        mean = self.mean
+        if std is None or abs(price - mean) <= SPIKE_THRESHOLD_SIGMA * std:
+            return None
+        return {
+            "commodity_id": pair[0],
+            "region_id": pair[1],
+            "market_id": row.market_id,
+            "source": row.source,
+            "date": row.date,
+            "price": row.price,
+            "rolling_mean": mean,
+            "rolling_std": std,
+        }
+
+    def state_values(self) -> dict:
+        return {"window_values": list(self.values), "window_sum": self.total, "window_sum_sq": self.total_sq}
+
+
+def _price_rows_query(pair: Pair):
+    return select(DailyPrice.market_id, DailyPrice.source, DailyPrice.date, DailyPrice.price_prevailing).where(
+        DailyPrice.commodity_id == pair[0], DailyPrice.region_id == pair[1]
+    )
+
+
+async def _replay_pair(session: AsyncSession, pair: Pair, since: date, state: RollingPriceStat | None) -> list[dict]:
+    """Recompute ``pair``'s window and spikes from ``since`` onwards."""
+    seed_result = await session.execute(
+        _price_rows_query(pair)
+        .where(DailyPrice.date < since)
+        .order_by(DailyPrice.date.desc(), DailyPrice.market_id.desc(), DailyPrice.source.desc())
+        .limit(SPIKE_WINDOW_ROWS - 1)
+    )
+    seed_rows = sorted((PriceRow(*values) for values in seed_result.all()), key=lambda row: row.sort_key)
+    window = RollingWindow()
+    for row in seed_rows:
+        window.push(float(row.price))
+
+    rows_result = await session.execute(_price_rows_query(pair).where(DailyPrice.date >= since))
+    rows = sorted((PriceRow(*values) for values in rows_result.all()), key=lambda row: row.sort_key)
+
+    await session.execute(
+        delete(PriceSpike).where(
+            PriceSpike.commodity_id == pair[0], PriceSpike.region_id == pair[1], PriceSpike.date >= since
+        )
+    )
+    spikes = [spike for row in rows if (spike := window.spike(pair, row)) is not None]
+
+    newest = rows or seed_rows
+    if not newest:
+        if state is not None:
+            await session.delete(state)
+        return spikes
+    if state is None:
+        state = RollingPriceStat(commodity_id=pair[0], region_id=pair[1])
+        session.add(state)
+    for name, value in window.state_values().items():
+        setattr(state, name, value)
+    state.last_date = newest[-1].date
+    return spikes
+
+
+async def _insert_spikes(session: AsyncSession, spikes: list[dict]) -> int:
+    if spikes:
+        await session.execute(insert(PriceSpike), spikes)
+    return len(spikes)
+
+
+async def _append_changes(session: AsyncSession, states: dict[Pair, RollingPriceStat]) -> int:
+    """Fold the changed rows of pairs whose changes all fall after their window into it.
+
+    The rows are streamed in pair order, one window at a time; their spikes
+    are a small fraction of them and are written once the stream is closed.
+    """
+    changes = daily_price_changes.c
+    appendable = (
+        select(changes.commodity_id, changes.region_id)
+        .join(
+            RollingPriceStat,
+            and_(
+                RollingPriceStat.commodity_id == changes.commodity_id, RollingPriceStat.region_id == changes.region_id
+            ),
+        )
+        .group_by(changes.commodity_id, changes.region_id, RollingPriceStat.last_date)
+        .having(func.min(changes.date) > RollingPriceStat.last_date)
+        .subquery()
+    )
+    statement = (
+        select(
+            DailyPrice.commodity_id,
+            DailyPrice.region_id,
+            DailyPrice.market_id,
+            DailyPrice.source,
+            DailyPrice.date,
+            DailyPrice.price_prevailing,
+        )
+        .join(daily_price_changes, daily_price_join())
+        .join(
+            appendable,
+            and_(DailyPrice.commodity_id == appendable.c.commodity_id, DailyPrice.region_id == appendable.c.region_id),
+        )
+        .order_by(
+            DailyPrice.commodity_id, DailyPrice.region_id, DailyPrice.date, DailyPrice.market_id, DailyPrice.source
+        )
+        .execution_options(yield_per=APPEND_BATCH_ROWS)
+    )
+
+    spikes: list[dict] = []
+    current_pair: Pair | None = None
+    window = RollingWindow()
+    last_date: date | None = None
+
+    def _finish_pair() -> None:
+        if current_pair is not None:
+            state = states[current_pair]
+            for name, value in window.state_values().items():
+                setattr(state, name, value)
+            state.last_date = last_date
+
+    result = await session.stream(statement)
+    async for partition in result.partitions():
+        for commodity_id, region_id, market_id, source, row_date, price in partition:
+            pair = (commodity_id, region_id)
+            if pair != current_pair:
+                _finish_pair()
+                current_pair = pair
+                window = RollingWindow.from_state(states[pair])
+            spike = window.spike(pair, PriceRow(market_id, source, row_date, price))
+            if spike is not None:
+                spikes.append(spike)
+            last_date = row_date
+    _finish_pair()
+    return await _insert_spikes(session, spikes)
+
+
+async def advance_rolling_stats(session: AsyncSession) -> int:
+    """Fold the rows named in ``daily_price_changes`` into the rolling stats.
+
+    Runs in the caller's transaction and returns the number of spikes
+    recorded.  A replayed pair records every spike from its replay start,
+    not only those on the changed rows.
+    """
+    changes = daily_price_changes.c
+    touched = await session.execute(
+        select(changes.commodity_id, changes.region_id, func.min(changes.date)).group_by(
+            changes.commodity_id, changes.region_id
+        )
+    )
+    earliest: dict[Pair, date] = {(commodity_id, region_id): since for commodity_id, region_id, since in touched}
+    if not earliest:
+        return 0
+
+    touched_pairs = select(changes.commodity_id, changes.region_id).distinct().subquery()
+    result = await session.execute(
+        select(RollingPriceStat).join(
+            touched_pairs,
+            and_(
+                RollingPriceStat.commodity_id == touched_pairs.c.commodity_id,
+                RollingPriceStat.region_id == touched_pairs.c.region_id,
+            ),
+        )
+    )
+    states = {(state.commodity_id, state.region_id): state for state in result.scalars()}
+    appended = {pair: state for pair, state in states.items() if earliest[pair] > state.last_date}
+
+    # Appends read the stored windows, so they run before any replay rewrites one.
+    recorded = await _append_changes(session, appended) if appended else 0
+    for pair, since in earliest.items():
+        if pair not in appended:
+            recorded += await _insert_spikes(session, await _replay_pair(session, pair, since, states.get(pair)))
+    logger.info(
+        "Rolling stats advanced for %d pairs (%d replayed), %d spikes recorded",
+        len(earliest),
+        len(earliest) - len(appended),
+        recorded,
+    )
+    return recorded
+
+
+async def rebuild_rolling_stats(session: AsyncSession, *, batch_size: int = 5000) -> int:
+    """Recompute every pair's rolling window and spike history from ``daily_prices``.
+
+    Rows are streamed in pair order, so memory holds one window at a time
+    rather than the table.  Runs in the caller's transaction and returns the
+    number of spikes recorded.
+    """
+    await session.execute(delete(PriceSpike))
+    await session.execute(delete(RollingPriceStat))
+
+    statement = (
+        select(
+            DailyPrice.commodity_id,
+            DailyPrice.region_id,
+            DailyPrice.market_id,
+            DailyPrice.source,
+            DailyPrice.date,
+            DailyPrice.price_prevailing,
+        )
+        .order_by(
+            DailyPrice.commodity_id,
+            DailyPrice.region_id,
+            DailyPrice.date,
+            DailyPrice.market_id,
+            DailyPrice.source,
+        )
+        .execution_options(yield_per=batch_size)
+    )
+
+    states: list[dict] = []
+    spikes: list[dict] = []
+    current_pair: Pair | None = None
+    window = RollingWindow()
+    last_date: date | None = None
+
+    def _finish_pair() -> None:
+        if current_pair is not None:
+            states.append(
+                {"commodity_id": current_pair[0], "region_id": current_pair[1], "last_date": last_date}
+                | window.state_values()
+            )
+
+    result = await session.stream(statement)
+    async for partition in result.partitions():
+        for commodity_id, region_id, market_id, source, row_date, price in partition:
+            pair = (commodity_id, region_id)
+            if pair != current_pair:
+                _finish_pair()
+                current_pair = pair
+                window = RollingWindow()
+            spike = window.spike(pair, PriceRow(market_id, source, row_date, price))
+            if spike is not None:
+                spikes.append(spike)
+            last_date = row_date
+    _finish_pair()
+
+    # Spikes are a small fraction of rows; write them once the stream is closed.
+    if spikes:
+        await session.execute(insert(PriceSpike), spikes)
+    if states:
+        await session.execute(insert(RollingPriceStat), states)
+    return len(spikes)
@@ -0,0 +1,158 @@
+"""Maintains the daily, weekly and monthly price rollups behind the analytics endpoints.
+
+Daily rollups are aggregated from ``daily_prices``; weekly and monthly
+rollups are aggregated from the daily rollups, so a refresh never rescans raw
+rows outside the periods it touches.  After an ingestion only the affected
+commodities, regions and periods are recomputed (not incremented), which
+keeps the rollups exact when an upsert overwrites an existing price.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy import ColumnElement, Date, cast, delete, func, insert, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DailyPrice, DailyPriceRollup, MonthlyPriceRollup, WeeklyPriceRollup
+from app.services.price_changes import daily_price_changes
+from app.utils.bulk import is_postgresql
+from app.utils.partitions import add_months, month_start
+
+ROLLUP_COLUMNS = [
+    "commodity_id",
+    "region_id",
+    "period_start",
+    "price_sum",
+    "price_count",
+    "price_min",
+    "price_max",
+    "price_sum_sq",
+]
+
+# SQLite has no date_trunc; these date() modifiers give the same Monday and first-of-month.
+_SQLITE_PERIOD_MODIFIERS = {"week": ("-6 days", "weekday 1"), "month": ("start of month",)}
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _period_bounds(unit: str, start: date, end: date) -> tuple[date, date]:
+    """First day of ``start``'s period and last day of ``end``'s period."""
+    if unit == "week":
+        return week_start(start), week_start(end) + timedelta(days=6)
+    return month_start(start), add_months(end, 1) - timedelta(days=1)
+
+
+_COARSE_ROLLUPS = ((WeeklyPriceRollup, "week"), (MonthlyPriceRollup, "month"))
+
+
+@dataclass(slots=True, frozen=True)
+class RollupScope:
+    """The commodities, regions and date span an ingestion touched."""
+
+    commodity_ids: frozenset[int]
+    region_ids: frozenset[int]
+    start: date
+    end: date
+
+    @classmethod
+    async def from_changes(cls, session: AsyncSession) -> "RollupScope | None":
+        """Scope covering the rows in ``daily_price_changes``; ``None`` when there are none."""
+        changes = daily_price_changes.c
+        span = (await session.execute(select(func.min(changes.date), func.max(changes.date)))).one()
+        if span[0] is None:
+            return None
+        commodity_ids = await session.scalars(select(changes.commodity_id).distinct())
+        region_ids = await session.scalars(select(changes.region_id).distinct())
+        return cls(frozenset(commodity_ids), frozenset(region_ids), *span)
+
+
+def _period_start(session: AsyncSession, unit: str, column: ColumnElement) -> ColumnElement:
+    if is_postgresql(session):
+        # A literal (not a bind parameter) so the SELECT and GROUP BY expressions match.
+        return cast(func.date_trunc(literal_column(f"'{unit}'"), column), Date)
+    return func.date(column, *_SQLITE_PERIOD_MODIFIERS[unit])
+
+
+def _scope_conditions(
+    scope: RollupScope | None,
+    commodity_column: ColumnElement,
+    region_column: ColumnElement,
+    date_column: ColumnElement,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[ColumnElement[bool]]:
+    if scope is None:
+        return []
+    return [
+        commodity_column.in_(scope.commodity_ids),
+        region_column.in_(scope.region_ids),
+        date_column >= (start or scope.start),
+        date_column <= (end or scope.end),
+    ]
+
+
+async def _refresh_daily(session: AsyncSession, scope: RollupScope | None) -> int:
+    rollup = DailyPriceRollup
+    await session.execute(
+        delete(rollup).where(*_scope_conditions(scope, rollup.commodity_id, rollup.region_id, rollup.period_start))
+    )
+    price = DailyPrice.price_prevailing
+    summary = (
+        select(
+            DailyPrice.commodity_id,
+            DailyPrice.region_id,
+            DailyPrice.date,
+            func.sum(price),
+            func.count(),
+            func.min(price),
+            func.max(price),
+            func.sum(price * price),
+        )
+        .where(*_scope_conditions(scope, DailyPrice.commodity_id, DailyPrice.region_id, DailyPrice.date))
+        .group_by(DailyPrice.commodity_id, DailyPrice.region_id, DailyPrice.date)
+    )
+    result = await session.execute(insert(rollup).from_select(ROLLUP_COLUMNS, summary))
+    return result.rowcount
+
+
+async def _refresh_coarse(
+    session: AsyncSession, rollup: type[WeeklyPriceRollup | MonthlyPriceRollup], unit: str, scope: RollupScope | None
+) -> int:
+    first_day, last_day = _period_bounds(unit, scope.start, scope.end) if scope is not None else (None, None)
+    await session.execute(
+        delete(rollup).where(
+            *_scope_conditions(scope, rollup.commodity_id, rollup.region_id, rollup.period_start, first_day, last_day)
+        )
+    )
+
+    daily = DailyPriceRollup
+    period = _period_start(session, unit, daily.period_start)
+    summary = (
+        select(
+            daily.commodity_id,
+            daily.region_id,
+            period,
+            func.sum(daily.price_sum),
+            func.sum(daily.price_count),
+            func.min(daily.price_min),
+            func.max(daily.price_max),
+            func.sum(daily.price_sum_sq),
+        )
+        .where(*_scope_conditions(scope, daily.commodity_id, daily.region_id, daily.period_start, first_day, last_day))
+        .group_by(daily.commodity_id, daily.region_id, period)
+    )
+    result = await session.execute(insert(rollup).from_select(ROLLUP_COLUMNS, summary))
+    return result.rowcount
+
+
+async def refresh_rollups(session: AsyncSession, scope: RollupScope | None = None) -> int:
+    """Recompute the rollups for ``scope``, or rebuild them all when ``scope`` is ``None``.
+
+    Runs in the caller's transaction and returns the number of daily rollup rows written.
+    """
+    written = await _refresh_daily(session, scope)
+    for rollup, unit in _COARSE_ROLLUPS:
+        await _refresh_coarse(session, rollup, unit, scope)
+    return written
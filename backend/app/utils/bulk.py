@@ -0,0 +1,31 @@
+"""Bulk-load helpers shared by the forecast writer, seeding and ingestion.
+
+PostgreSQL gets ``COPY`` (binary records or CSV) through the asyncpg
+connection underneath the session; other dialects (SQLite in tests) fall back to
+``executemany`` inserts issued by the callers.
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import BinaryIO
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def is_postgresql(session: AsyncSession) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+async def copy_records(
+    session: AsyncSession, table_name: str, columns: Sequence[str], records: Iterable[tuple]
+) -> None:
+    """``COPY`` ``records`` into ``table_name`` inside the session's current transaction."""
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(table_name, records=records, columns=list(columns))
+
+
+async def copy_csv(session: AsyncSession, table_name: str, columns: Sequence[str], source: BinaryIO) -> None:
+    """``COPY`` CSV rows from ``source`` into ``table_name``; PostgreSQL parses the values itself."""
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_to_table(table_name, source=source, columns=list(columns), format="csv")
@@ -0,0 +1,26 @@
+"""Opaque keyset-pagination cursors.
+
+A cursor is the URL-safe base64 of a JSON array holding the sort key of the
+last row on the previous page.  Clients must treat it as an opaque token.
+"""
+
+import base64
+import binascii
+import json
+
+
+def encode_cursor(key: tuple[str, ...]) -> str:
+    payload = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *, size: int) -> tuple[str, ...]:
+    """Decode a cursor holding ``size`` strings; raise ``ValueError`` if it is malformed."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if not isinstance(key, list) or len(key) != size or not all(isinstance(part, str) for part in key):
+        raise ValueError("Malformed cursor")
+    return tuple(key)
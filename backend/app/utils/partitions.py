@@ -0,0 +1,161 @@
+"""Monthly RANGE partition maintenance for ``daily_prices`` on PostgreSQL.
+
+Partitions are named ``daily_prices_pYYYYMM`` and cover one calendar month
+each; a ``daily_prices_default`` partition catches anything outside them.
+Create partitions ahead of time, and detach months that fall out of the
+retention window so queries and vacuum stop touching them.  PostgreSQL will
+not create a partition for a month that already has rows in the default
+partition, so :func:`ensure_partitions` moves those rows into the new
+partition (backfills older than the startup window end up there).
+All helpers are no-ops unless ``DAILY_PRICES_PARTITIONED`` is on.
+"""
+
+import logging
+import re
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+
+logger = logging.getLogger("agrisenta.partitions")
+settings = get_settings()
+
+PARENT_TABLE = "daily_prices"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month ``months`` after ``day``'s month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+async def list_partitions(connection: AsyncConnection | AsyncSession) -> list[str]:
+    result = await connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:parent AS regclass) ORDER BY child.relname"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    return list(result.scalars().all())
+
+
+async def _create_partition(connection: AsyncConnection | AsyncSession, name: str, month: date) -> None:
+    bounds = f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    range_filter = f"date >= '{month.isoformat()}' AND date < '{add_months(month, 1).isoformat()}'"
+    stranded = await connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {range_filter})"))
+    if not stranded.scalar():
+        await connection.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} FOR VALUES {bounds}"))
+        return
+
+    # The month's rows sit in the default partition, which must not overlap the new one:
+    # build the partition standalone, move the rows across, then attach it.
+    await connection.execute(
+        text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    )
+    moved = await connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {range_filter} RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        )
+    )
+    await connection.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+    logger.info("Moved %d rows from %s into %s", moved.rowcount, DEFAULT_PARTITION, name)
+
+
+async def ensure_partitions(connection: AsyncConnection | AsyncSession, *, start: date, end: date) -> list[str]:
+    """Create the monthly partitions covering ``start`` through ``end`` plus the default partition.
+
+    Rows already in the default partition for a newly created month are
+    moved into it.  Returns the names of partitions that were created.
+    """
+    if not settings.daily_prices_partitioned:
+        return []
+
+    existing = set(await list_partitions(connection))
+    created: list[str] = []
+    if DEFAULT_PARTITION not in existing:
+        await connection.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+        created.append(DEFAULT_PARTITION)
+
+    month = month_start(start)
+    while month <= end:
+        name = partition_name(month)
+        if name not in existing:
+            await _create_partition(connection, name, month)
+            created.append(name)
+        month = add_months(month, 1)
+
+    if created:
+        logger.info("Created daily_prices partitions: %s", ", ".join(created))
+    return created
+
+
+async def detach_partitions_before(
+    connection: AsyncConnection | AsyncSession, cutoff: date, *, archive_schema: str | None = None
+) -> list[str]:
+    """Detach every monthly partition for a month before ``cutoff``'s month.
+
+    Detached tables keep their rows.  With ``archive_schema`` they are also
+    moved into that schema (created if missing) so they are out of the way
+    of the live tables but still queryable.
+    """
+    if not settings.daily_prices_partitioned:
+        return []
+
+    first_kept = month_start(cutoff)
+    detached: list[str] = []
+    for name in await list_partitions(connection):
+        month = partition_month(name)
+        if month is None or month >= first_kept:
+            continue
+        await connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if archive_schema:
+            await connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+            await connection.execute(text(f'ALTER TABLE {name} SET SCHEMA "{archive_schema}"'))
+        detached.append(name)
+
+    if detached:
+        logger.info("Detached daily_prices partitions: %s", ", ".join(detached))
+    return detached
+
+
+async def maintain_partitions(connection: AsyncConnection | AsyncSession, *, today: date) -> None:
+    """Create upcoming partitions and apply the retention window from settings."""
+    await ensure_partitions(
+        connection, start=today, end=add_months(today, settings.daily_prices_partition_months_ahead)
+    )
+    if settings.daily_prices_retention_months > 0:
+        await detach_partitions_before(
+            connection,
+            add_months(today, -settings.daily_prices_retention_months),
+            archive_schema=settings.daily_prices_archive_schema or None,
+        )
+
+
+async def run_partition_maintenance() -> None:
+    """Scheduler entry point for :func:`maintain_partitions`."""
+    async with AsyncSessionLocal() as session:
+        await maintain_partitions(session, today=datetime.now(UTC).date())
+        await session.commit()
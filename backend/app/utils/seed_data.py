@@ -2,21 +2,32 @@
 
 Lagonoy is a coastal municipality in Camarines Sur (Bicol Region) facing
 Lagonoy Gulf.  This seeds barangays as "regions", 210+ local commodities,
-local markets, vendors, harvest records, and 90 days of realistic daily
-price history.
+local markets, vendors, harvest records, and a configurable number of days
+(90 by default) of realistic daily price history, generated with NumPy.
 """
 
 import hashlib
-import math
-from datetime import UTC, datetime, timedelta
+import io
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
 
-from sqlalchemy import func, select
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.models import Commodity, DailyPrice, Market, Region
 from app.models.harvest_record import HarvestRecord
 from app.models.vendor import Vendor
+from app.services.price_service import refresh_latest_price_snapshot
+from app.services.rolling_stats_service import rebuild_rolling_stats
+from app.services.rollup_service import refresh_rollups
+from app.utils.bulk import copy_csv, is_postgresql
+
+settings = get_settings()
 
 # ---------------------------------------------------------------------------
 # 38 Official Barangays of Lagonoy, Camarines Sur
@@ -426,7 +437,19 @@ _REGION_PCT: dict[str, float] = {
     "LOH": -0.04, "PIN": -0.03, "SSB": -0.03,
 }
 
-HISTORY_DAYS = 90
+SEED_SOURCE = "MAO-Lagonoy"
+SEED_INSERT_CHUNK_SIZE = 10000
+DAILY_PRICE_COLUMNS = (
+    "commodity_id",
+    "market_id",
+    "region_id",
+    "price_low",
+    "price_high",
+    "price_avg",
+    "price_prevailing",
+    "date",
+    "source",
+)
 
 # ---------------------------------------------------------------------------
 # Harvest data configuration
@@ -453,10 +476,21 @@ _FARMER_LAST_NAMES = [
 _SEASONS = ["Dry", "Wet", "Year-Round"]
 
 
-def _deterministic_noise(seed_str: str, day: int) -> float:
-    """Return a deterministic float in [-1, 1] for reproducible price curves."""
-    raw = hashlib.md5(f"{seed_str}:{day}".encode()).hexdigest()  # noqa: S324
-    return (int(raw[:8], 16) / 0xFFFFFFFF) * 2 - 1
+def _deterministic_noise_matrix(seed_strs: list[str], days: int) -> np.ndarray:
+    """Deterministic floats in [-1, 1] for reproducible price curves, one row per seed.
+
+    Cell ``[i, day]`` is derived from the MD5 of ``f"{seed_strs[i]}:{day}"``.
+    """
+    values = np.fromiter(
+        (
+            int.from_bytes(hashlib.md5(f"{seed_str}:{day}".encode()).digest()[:4], "big")  # noqa: S324
+            for seed_str in seed_strs
+            for day in range(days)
+        ),
+        dtype=np.float64,
+        count=len(seed_strs) * days,
+    )
+    return (values / 0xFFFFFFFF * 2 - 1).reshape(len(seed_strs), days)
 
 
 def _det_random(seed_str: str, index: int) -> float:
@@ -465,7 +499,160 @@ def _det_random(seed_str: str, index: int) -> float:
     return int(raw[:8], 16) / 0xFFFFFFFF
 
 
-async def seed_reference_data(session: AsyncSession) -> None:
+def _synthetic_markets(count: int) -> list[dict]:
+    """Extra load-test markets spread round-robin over the barangays."""
+    markets = []
+    for index in range(count):
+        region = SEED_REGIONS[index % len(SEED_REGIONS)]
+        markets.append(
+            {
+                "name": f"Synthetic Market {index + 1:04d}",
+                "region_code": region["code"],
+                "type": "wet",
+                "address": f"{region['name']}, Lagonoy, Camarines Sur",
+            }
+        )
+    return markets
+
+
+@dataclass(slots=True)
+class SyntheticPriceBlock:
+    """Generated daily prices for one market, as parallel columns."""
+
+    commodity_ids: np.ndarray
+    market_id: int
+    region_id: int
+    dates: np.ndarray  # datetime64[D]
+    price_prevailing: np.ndarray
+    price_low: np.ndarray
+    price_high: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.price_prevailing)
+
+    def to_rows(self) -> list[dict]:
+        return [
+            {
+                "commodity_id": commodity_id,
+                "market_id": self.market_id,
+                "region_id": self.region_id,
+                "price_low": low,
+                "price_high": high,
+                "price_avg": prevailing,
+                "price_prevailing": prevailing,
+                "date": day,
+                "source": SEED_SOURCE,
+            }
+            for commodity_id, low, high, prevailing, day in zip(
+                self.commodity_ids.tolist(),
+                self.price_low.tolist(),
+                self.price_high.tolist(),
+                self.price_prevailing.tolist(),
+                self.dates.astype(object),
+                strict=True,
+            )
+        ]
+
+    def to_csv(self) -> io.BytesIO:
+        frame = pd.DataFrame(
+            {
+                "commodity_id": self.commodity_ids,
+                "market_id": self.market_id,
+                "region_id": self.region_id,
+                "price_low": self.price_low,
+                "price_high": self.price_high,
+                "price_avg": self.price_prevailing,
+                "price_prevailing": self.price_prevailing,
+                "date": np.datetime_as_string(self.dates, unit="D"),
+                "source": SEED_SOURCE,
+            },
+            columns=list(DAILY_PRICE_COLUMNS),
+        )
+        buffer = io.BytesIO()
+        frame.to_csv(buffer, index=False, header=False, float_format="%.2f")
+        buffer.seek(0)
+        return buffer
+
+
+def iter_synthetic_prices(
+    markets: list[tuple[int, int, str]],
+    commodities: dict[str, Commodity],
+    *,
+    start_date: date,
+    history_days: int,
+) -> Iterator[SyntheticPriceBlock]:
+    """Yield one block of daily prices per ``(market_id, region_id, region_code)``.
+
+    Every (commodity, day) curve of a market is computed in one NumPy pass:
+    a regional base price with a gentle upward trend, a weekly wave and
+    MD5-seeded noise scaled by the category's volatility.  Noise is keyed by
+    barangay and commodity, so it is computed once per barangay and shared by
+    all of its markets.
+    """
+    names = [name for name in BASE_PRICES if name in commodities]
+    if not names or history_days <= 0:
+        return
+
+    commodity_ids = np.array([commodities[name].id for name in names], dtype=np.int64)
+    base_prices = np.array([float(BASE_PRICES[name]) for name in names])
+    volatility = np.array([_CATEGORY_VOLATILITY.get(commodities[name].category, 0.01) for name in names])
+    spread = np.array([float(_CATEGORY_SPREAD.get(commodities[name].category, Decimal("0.05"))) for name in names])
+
+    days = np.arange(history_days)
+    dates = np.datetime64(start_date, "D") + days
+    trend = 1 + days * 0.0004
+    weekdays = (dates.astype(np.int64) - 4) % 7  # 1970-01-01 was a Thursday
+    weekly_wave = np.sin(2 * np.pi * weekdays / 7)[None, :] * volatility[:, None] * 1.5
+
+    noise_by_region: dict[str, np.ndarray] = {}
+    for market_id, region_id, region_code in markets:
+        noise = noise_by_region.get(region_code)
+        if noise is None:
+            noise = _deterministic_noise_matrix([f"{region_code}:{name}" for name in names], history_days)
+            noise_by_region[region_code] = noise
+
+        regional_base = base_prices * (1 + _REGION_PCT.get(region_code, 0.0))
+        prevailing = regional_base[:, None] * trend[None, :] * (1 + weekly_wave + noise * volatility[:, None])
+        prevailing = np.maximum(np.round(prevailing, 2), 1.0)
+        half_spread = np.round(prevailing * spread[:, None] / 2, 2)
+
+        yield SyntheticPriceBlock(
+            commodity_ids=np.repeat(commodity_ids, history_days),
+            market_id=market_id,
+            region_id=region_id,
+            dates=np.tile(dates, len(names)),
+            price_prevailing=prevailing.ravel(),
+            price_low=np.round(prevailing - half_spread, 2).ravel(),
+            price_high=np.round(prevailing + half_spread, 2).ravel(),
+        )
+
+
+async def _write_daily_prices(session: AsyncSession, blocks: Iterable[SyntheticPriceBlock]) -> int:
+    """Stream ``blocks`` into ``daily_prices``: CSV ``COPY`` on PostgreSQL, chunked core inserts elsewhere."""
+    written = 0
+    postgresql = is_postgresql(session)
+    table = DailyPrice.__table__
+    for block in blocks:
+        if postgresql:
+            await copy_csv(session, DailyPrice.__tablename__, DAILY_PRICE_COLUMNS, block.to_csv())
+        else:
+            rows = block.to_rows()
+            for start in range(0, len(rows), SEED_INSERT_CHUNK_SIZE):
+                await session.execute(insert(table), rows[start : start + SEED_INSERT_CHUNK_SIZE])
+        written += len(block)
+    return written
+
+
+async def seed_reference_data(
+    session: AsyncSession, *, history_days: int | None = None, extra_markets: int | None = None
+) -> None:
+    """Seed every empty reference table.
+
+    ``history_days`` and ``extra_markets`` default to the ``SEED_HISTORY_DAYS``
+    and ``SEED_EXTRA_MARKETS`` settings; raise them to build load-test datasets.
+    """
+    history_days = history_days if history_days is not None else settings.seed_history_days
+    extra_markets = extra_markets if extra_markets is not None else settings.seed_extra_markets
     # ------------------------------------------------------------------
     # 1. Barangays (stored in regions table)
     # ------------------------------------------------------------------
@@ -496,14 +683,14 @@ async def seed_reference_data(session: AsyncSession) -> None:
                 type=m["type"],
                 address=m["address"],
             )
-            for m in SEED_MARKETS
+            for m in [*SEED_MARKETS, *_synthetic_markets(extra_markets)]
             if m["region_code"] in region_by_code
         ]
         session.add_all(market_records)
         await session.flush()
 
     # ------------------------------------------------------------------
-    # 4. Daily prices (HISTORY_DAYS per commodity-market pair)
+    # 4. Daily prices (history_days per commodity-market pair)
     # ------------------------------------------------------------------
     daily_price_count = await session.scalar(select(func.count(DailyPrice.id)))
     if daily_price_count == 0:
@@ -511,65 +698,21 @@ async def seed_reference_data(session: AsyncSession) -> None:
         commodities = {row.name: row for row in commodity_rows.scalars().all()}
 
         region_rows = await session.execute(select(Region))
-        regions = {row.id: row for row in region_rows.scalars().all()}
-
-        market_rows = await session.execute(select(Market))
-        markets = list(market_rows.scalars().all())
-
-        start_date = datetime.now(UTC).date() - timedelta(days=HISTORY_DAYS - 1)
+        region_codes = {row.id: row.code for row in region_rows.scalars().all()}
 
-        records: list[DailyPrice] = []
-
-        for market in markets:
-            region = regions.get(market.region_id)
-            if region is None:
-                continue
-
-            region_pct = _REGION_PCT.get(region.code, 0.0)
-
-            for commodity_name, base_price in BASE_PRICES.items():
-                commodity = commodities.get(commodity_name)
-                if commodity is None:
-                    continue
-
-                cat = commodity.category
-                volatility = _CATEGORY_VOLATILITY.get(cat, 0.01)
-                spread_pct = _CATEGORY_SPREAD.get(cat, Decimal("0.05"))
-                regional_base = base_price * (1 + Decimal(str(region_pct)))
-                pair_seed = f"{region.code}:{commodity_name}"
-
-                for day_offset in range(HISTORY_DAYS):
-                    current_date = start_date + timedelta(days=day_offset)
-                    trend_factor = Decimal(str(1 + day_offset * 0.0004))
-                    weekday = current_date.weekday()
-                    weekly_wave = Decimal(str(math.sin(2 * math.pi * weekday / 7) * volatility * 1.5))
-                    noise_val = _deterministic_noise(pair_seed, day_offset)
-                    noise = Decimal(str(noise_val * volatility))
-
-                    prevailing = (regional_base * trend_factor * (1 + weekly_wave + noise)).quantize(Decimal("0.01"))
-                    if prevailing < Decimal("1.00"):
-                        prevailing = Decimal("1.00")
-
-                    half_spread = (prevailing * spread_pct / 2).quantize(Decimal("0.01"))
-
-                    records.append(
-                        DailyPrice(
-                            commodity_id=commodity.id,
-                            market_id=market.id,
-                            region_id=region.id,
-                            price_low=prevailing - half_spread,
-                            price_high=prevailing + half_spread,
-                            price_avg=prevailing,
-                            price_prevailing=prevailing,
-                            date=current_date,
-                            source="MAO-Lagonoy",
-                        )
-                    )
+        market_rows = await session.execute(select(Market).order_by(Market.id))
+        markets = [
+            (market.id, market.region_id, region_codes[market.region_id])
+            for market in market_rows.scalars().all()
+            if market.region_id in region_codes
+        ]
 
-        batch_size = 10000
-        for i in range(0, len(records), batch_size):
-            session.add_all(records[i : i + batch_size])
-            await session.flush()
+        start_date = datetime.now(UTC).date() - timedelta(days=history_days - 1)
+        blocks = iter_synthetic_prices(markets, commodities, start_date=start_date, history_days=history_days)
+        await _write_daily_prices(session, blocks)
+        await refresh_latest_price_snapshot(session)
+        await refresh_rollups(session)
+        await rebuild_rolling_stats(session)
 
     # ------------------------------------------------------------------
     # 5. Vendors
@@ -0,0 +1,56 @@
+"""Benchmark the DA page parser backends.
+
+Builds a page of ``--mb`` megabytes by repeating the regional tables of the
+recorded fixture, checks that every installed backend extracts the same
+rows, and reports parse time per MB for each.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_da_parsers --mb 5 --repeat 3
+"""
+
+import argparse
+import re
+from pathlib import Path
+from time import perf_counter
+
+from app.scraping.da_parsers import available_backends, get_row_parser
+
+FIXTURE = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "da_price_monitoring_regional.html"
+
+
+def _build_page(megabytes: float) -> str:
+    html = FIXTURE.read_text(encoding="utf-8")
+    tables = "".join(re.findall(r"<h3>.*?</TABLE>\n", html, flags=re.DOTALL))
+    head, _, tail = html.partition("</p>\n")
+    copies = max(int(megabytes * 1_000_000 / len(tables.encode())), 1)
+    return head + "</p>\n" + tables * copies + tail
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=5.0, help="approximate page size in megabytes")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per backend; the fastest is reported")
+    args = parser.parse_args()
+
+    page = _build_page(args.mb)
+    size_mb = len(page.encode()) / 1_000_000
+    print(f"page: {size_mb:.2f} MB")
+
+    reference = None
+    for backend in reversed(available_backends()):
+        parse = get_row_parser(backend)
+        timings = []
+        for _ in range(args.repeat):
+            started = perf_counter()
+            rows = parse(page)
+            timings.append(perf_counter() - started)
+        if reference is None:
+            reference = rows
+        status = "same rows" if rows == reference else "ROWS DIFFER"
+        best = min(timings)
+        print(f"{backend:<12}: {len(rows):>8,} rows in {best:6.3f}s  ({best * 1000 / size_mb:8.1f} ms/MB)  {status}")
+
+
+if __name__ == "__main__":
+    main()
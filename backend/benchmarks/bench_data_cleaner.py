@@ -0,0 +1,100 @@
+"""Benchmark price cleaning on a large batch.
+
+Cleans ``--records`` synthetic records drawn from ``--names`` distinct
+commodity names three ways:
+- the previous per-record loop, as the baseline;
+- ``clean_price_records``, which converts the list to a batch and back;
+- ``clean_price_batch`` on columns, as the PSA path uses it.
+
+It reports records per second for each.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_data_cleaner --records 1000000 --names 300
+"""
+
+import argparse
+from datetime import date
+from time import perf_counter
+
+import numpy as np
+
+from app.scraping.data_cleaner import (
+    MAX_PRICE,
+    MIN_PRICE,
+    clean_price_batch,
+    clean_price_records,
+    normalize_commodity_name,
+)
+from app.scraping.types import PriceRecordBatch, RawPriceRecord
+
+
+def _per_record_loop(records: list[RawPriceRecord]) -> list[RawPriceRecord]:
+    """The cleaner before batching: a dataclass and a name normalisation per record."""
+    cleaned = []
+    for record in records:
+        if record.price_prevailing <= MIN_PRICE or record.price_prevailing > MAX_PRICE:
+            continue
+        cleaned.append(
+            RawPriceRecord(
+                commodity_name=normalize_commodity_name.__wrapped__(record.commodity_name),
+                market_name=record.market_name.strip(),
+                region_code=record.region_code.strip().upper(),
+                date=record.date,
+                price_prevailing=round(record.price_prevailing, 2),
+                price_low=record.price_low,
+                price_high=record.price_high,
+                source=record.source,
+            )
+        )
+    return cleaned
+
+
+def _batch(size: int, distinct_names: int) -> PriceRecordBatch:
+    rng = np.random.default_rng(7)
+    names = np.array([f"  commodity {index} " for index in range(distinct_names)], dtype=object)
+    markets = np.array([f" Market {index}" for index in range(50)], dtype=object)
+    regions = np.array([f"r{index:02d} " for index in range(17)], dtype=object)
+    return PriceRecordBatch.from_columns(
+        commodity_name=names[rng.integers(0, distinct_names, size)],
+        market_name=markets[rng.integers(0, len(markets), size)],
+        region_code=regions[rng.integers(0, len(regions), size)],
+        date=date(2026, 2, 16),
+        # A few out-of-range prices so the filter has work to do.
+        price_prevailing=rng.uniform(-10, 10_500, size),
+        source="PSA",
+    )
+
+
+def _report(label: str, count: int, elapsed: float, kept: int) -> None:
+    print(
+        f"{label:<20}: {count:>10,} records in {elapsed:6.2f}s  ({count / elapsed:12,.0f} records/sec), {kept:,} kept"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--names", type=int, default=300, help="distinct commodity names")
+    args = parser.parse_args()
+
+    batch = _batch(args.records, args.names)
+    records = list(batch.records())
+
+    started = perf_counter()
+    kept = len(_per_record_loop(records))
+    _report("per-record loop", args.records, perf_counter() - started, kept)
+
+    normalize_commodity_name.cache_clear()
+    started = perf_counter()
+    kept = len(clean_price_records(records))
+    _report("clean_price_records", args.records, perf_counter() - started, kept)
+
+    normalize_commodity_name.cache_clear()
+    started = perf_counter()
+    kept = len(clean_price_batch(batch))
+    _report("clean_price_batch", args.records, perf_counter() - started, kept)
+
+
+if __name__ == "__main__":
+    main()
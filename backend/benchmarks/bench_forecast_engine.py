@@ -0,0 +1,68 @@
+"""Benchmark the forecast engine with 1 worker versus N workers.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_forecast_engine --pairs 200 --length 90 --workers 4
+"""
+
+import argparse
+import asyncio
+import math
+from datetime import date
+
+import numpy as np
+
+from app.ml.engine import ForecastRunStats, PairForecastJob, resolve_worker_count, run_forecast_jobs
+
+
+def _synthetic_jobs(pairs: int, length: int, seed: int = 7) -> list[PairForecastJob]:
+    rng = np.random.default_rng(seed)
+    jobs: list[PairForecastJob] = []
+    for index in range(pairs):
+        base = 20 + rng.random() * 300
+        days = np.arange(length, dtype=float)
+        wave = np.sin(2 * math.pi * days / 7) * base * 0.02
+        noise = rng.normal(0, base * 0.01, size=length)
+        prices = base * (1 + days * 0.0004) + wave + noise
+        jobs.append(
+            PairForecastJob(
+                commodity_id=index,
+                region_id=1,
+                prices=[float(value) for value in prices],
+                last_date=date(2026, 1, 1),
+            )
+        )
+    return jobs
+
+
+async def _run(jobs: list[PairForecastJob], workers: int) -> ForecastRunStats:
+    stats = ForecastRunStats()
+    async for _ in run_forecast_jobs(jobs, max_workers=workers, stats=stats):
+        pass
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--length", type=int, default=90)
+    parser.add_argument("--workers", type=int, default=0, help="0 = one per CPU")
+    args = parser.parse_args()
+
+    jobs = _synthetic_jobs(args.pairs, args.length)
+    workers = resolve_worker_count(args.workers)
+
+    baseline = asyncio.run(_run(jobs, 1))
+    print(f"1 worker : {baseline.elapsed_seconds:7.2f}s  {baseline.pairs_per_second:8.1f} pairs/sec")
+
+    if workers > 1:
+        parallel = asyncio.run(_run(jobs, workers))
+        speedup = parallel.pairs_per_second / baseline.pairs_per_second if baseline.pairs_per_second else 0.0
+        print(
+            f"{workers} workers: {parallel.elapsed_seconds:7.2f}s  {parallel.pairs_per_second:8.1f} pairs/sec"
+            f"  ({speedup:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark synthetic daily-price seeding.
+
+Generates the price curves in memory and then seeds a throwaway in-memory
+SQLite database, reporting rows per second for each step.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_seed_prices --markets 50 --days 365
+"""
+
+import argparse
+import asyncio
+from datetime import date
+from time import perf_counter
+from types import SimpleNamespace
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models import DailyPrice
+from app.models.base import Base
+from app.utils.seed_data import _RAW_COMMODITIES, SEED_REGIONS, iter_synthetic_prices, seed_reference_data
+
+
+def _generate(markets: int, days: int) -> int:
+    commodities = {
+        name: SimpleNamespace(id=index + 1, category=category)
+        for index, (name, category, _, _) in enumerate(_RAW_COMMODITIES)
+    }
+    market_rows = [(index + 1, 1, SEED_REGIONS[index % len(SEED_REGIONS)]["code"]) for index in range(markets)]
+    return sum(
+        len(block)
+        for block in iter_synthetic_prices(market_rows, commodities, start_date=date(2026, 1, 1), history_days=days)
+    )
+
+
+async def _seed_sqlite(extra_markets: int, days: int) -> int:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        await seed_reference_data(session, history_days=days, extra_markets=extra_markets)
+        rows = await session.scalar(select(func.count(DailyPrice.id)))
+    await engine.dispose()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--markets", type=int, default=50, help="total markets, including the 5 real ones")
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    started = perf_counter()
+    rows = _generate(args.markets, args.days)
+    elapsed = perf_counter() - started
+    print(f"generate   : {rows:>10,} rows in {elapsed:6.2f}s  ({rows / elapsed:12,.0f} rows/sec)")
+
+    started = perf_counter()
+    rows = asyncio.run(_seed_sqlite(max(args.markets - 5, 0), args.days))
+    elapsed = perf_counter() - started
+    print(f"seed sqlite: {rows:>10,} rows in {elapsed:6.2f}s  ({rows / elapsed:12,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,11 +13,15 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
+from app.cache import response_cache
 from app.database import get_db_session
 from app.models import Commodity, DailyPrice, Market, PriceForecast, Region
 from app.models.base import Base
 from app.models.user import User
 from app.services.auth_service import create_access_token, hash_password
+from app.services.price_service import refresh_latest_price_snapshot
+from app.services.rolling_stats_service import rebuild_rolling_stats
+from app.services.rollup_service import refresh_rollups
 
 # ---------------------------------------------------------------------------
 # Engine & session factory – in-memory SQLite with StaticPool
@@ -42,6 +46,8 @@ TestSessionLocal = async_sessionmaker(test_engine, expire_on_commit=False, class
 @pytest.fixture()
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Create tables, yield a session, then tear everything down."""
+    # Each test gets a fresh database, so responses cached by earlier tests are stale.
+    response_cache.reset()
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
@@ -142,6 +148,9 @@ async def seeded_session(db_session: AsyncSession) -> AsyncSession:
         )
         db_session.add(fc)
 
+    await refresh_latest_price_snapshot(db_session)
+    await refresh_rollups(db_session)
+    await rebuild_rolling_stats(db_session)
     await db_session.commit()
     return db_session
 
@@ -0,0 +1,61 @@
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+from app.ml.batch_trend import fit_trends, forecast_trends, holdout_train_size, pad_series, train_linear_trends
+
+
+def _series() -> list[np.ndarray]:
+    rng = np.random.default_rng(3)
+    return [
+        50 + np.arange(length) * slope + rng.normal(0, 0.5, length)
+        for length, slope in ((30, 0.2), (9, -1.0), (5, 0.5))
+    ]
+
+
+def test_pad_series_left_aligns_ragged_rows() -> None:
+    values, lengths = pad_series([[1.0, 2.0, 3.0], [4.0]])
+
+    assert values.shape == (2, 3)
+    assert lengths.tolist() == [3, 1]
+    assert values[1].tolist() == [4.0, 0.0, 0.0]
+
+
+def test_fit_trends_matches_per_series_least_squares() -> None:
+    series = _series()
+    values, lengths = pad_series(series)
+    mask = np.arange(values.shape[1])[None, :] < lengths[:, None]
+
+    slopes, intercepts = fit_trends(values, mask)
+
+    for row, prices in enumerate(series):
+        expected_slope, expected_intercept = np.polyfit(np.arange(len(prices)), prices, 1)
+        assert np.isclose(slopes[row], expected_slope)
+        assert np.isclose(intercepts[row], expected_intercept)
+
+
+def test_fit_trends_single_point_is_flat() -> None:
+    slopes, intercepts = fit_trends(np.array([[7.0, 0.0]]), np.array([[True, False]]))
+
+    assert slopes.tolist() == [0.0]
+    assert intercepts.tolist() == [7.0]
+
+
+def test_holdout_mae_matches_sklearn_split() -> None:
+    series = _series()
+    batch = train_linear_trends(series)
+
+    for row, prices in enumerate(series):
+        if len(prices) < 8:
+            assert batch.holdout_mae[row] == 0.0
+            continue
+        train_size = holdout_train_size(len(prices))
+        x = np.arange(len(prices), dtype=float).reshape(-1, 1)
+        model = LinearRegression().fit(x[:train_size], prices[:train_size])
+        expected = np.mean(np.abs(prices[train_size:] - model.predict(x[train_size:])))
+        assert np.isclose(batch.holdout_mae[row], expected)
+
+
+def test_forecast_trends_continues_each_series() -> None:
+    forecasts = forecast_trends(np.array([1.0, -2.0]), np.array([10.0, 100.0]), np.array([5, 2]), horizon_days=3)
+
+    assert forecasts.tolist() == [[15.0, 16.0, 17.0], [96.0, 94.0, 92.0]]
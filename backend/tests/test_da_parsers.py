@@ -0,0 +1,67 @@
+"""Tests for the DA scraper's HTML parser backends."""
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from app.scraping.da_parsers import PARSER_BACKENDS, available_backends, get_row_parser
+from app.scraping.scraper_da import parse_da_prices
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PAGES = sorted(FIXTURES.glob("da_price_monitoring_*.html"))
+SCRAPE_DATE = date(2026, 2, 16)
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda path: path.stem)
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_match_html_parser(page, backend):
+    html = page.read_text(encoding="utf-8")
+
+    assert get_row_parser(backend)(html) == get_row_parser("html.parser")(html)
+    assert parse_da_prices(html, SCRAPE_DATE, backend=backend) == parse_da_prices(
+        html, SCRAPE_DATE, backend="html.parser"
+    )
+
+
+def test_simple_page_records():
+    html = (FIXTURES / "da_price_monitoring_simple.html").read_text(encoding="utf-8")
+
+    records = parse_da_prices(html, SCRAPE_DATE)
+
+    assert [(record.commodity_name, record.price_prevailing) for record in records] == [
+        ("Well-Milled Rice", 48.0),
+        ("Red Onion", 130.5),
+        ("Pork Liempo", 1020.0),
+    ]
+    assert {(record.market_name, record.region_code, record.date, record.source) for record in records} == {
+        ("Lagonoy Public Market", "AGO", SCRAPE_DATE, "DA")
+    }
+
+
+def test_regional_page_skips_headers_notes_and_unparseable_prices():
+    html = (FIXTURES / "da_price_monitoring_regional.html").read_text(encoding="utf-8")
+
+    records = parse_da_prices(html, SCRAPE_DATE)
+
+    # Four regional tables of seven commodities, minus the "n/a" and peso-signed prices.
+    assert len(records) == 4 * 5
+    assert {record.region_code for record in records} == {"AGO", "BAL", "GUB", "LOH"}
+    assert "Red Onion" in {record.commodity_name for record in records}
+    assert max(record.price_prevailing for record in records) == 1130.0
+
+
+@pytest.mark.parametrize("backend", list(PARSER_BACKENDS))
+def test_empty_page_has_no_rows(backend):
+    if backend not in available_backends():
+        pytest.skip(f"{backend} is not installed")
+    assert get_row_parser(backend)("") == []
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown DA parser backend"):
+        get_row_parser("html5lib")
+
+
+def test_auto_prefers_the_fastest_installed_backend():
+    assert get_row_parser("auto") is PARSER_BACKENDS[available_backends()[0]]
@@ -1,7 +1,8 @@
 from datetime import date
 
-from app.scraping.data_cleaner import clean_price_records, normalize_commodity_name
-from app.scraping.types import RawPriceRecord
+from app.scraping import data_cleaner
+from app.scraping.data_cleaner import clean_price_batch, clean_price_records, normalize_commodity_name
+from app.scraping.types import PriceRecordBatch, RawPriceRecord
 
 
 def test_normalize_known_commodity_name() -> None:
@@ -56,3 +57,45 @@ def test_clean_price_records_normalises_whitespace() -> None:
     assert cleaned[0].commodity_name == "Pork Liempo"
     assert cleaned[0].market_name == "Carbon Public Market"
     assert cleaned[0].region_code == "R07"
+
+
+def test_clean_price_batch_filters_and_rounds_columns() -> None:
+    batch = PriceRecordBatch.from_records(
+        [
+            RawPriceRecord("red onion", "Market", "r05", date(2026, 2, 1), 120.456, price_low=110.0),
+            RawPriceRecord("red onion", "Market", "r05", date(2026, 2, 1), 0.0),
+            RawPriceRecord("red onion", "Market", "r05", date(2026, 2, 1), 10000.0, source="PSA"),
+        ]
+    )
+
+    cleaned = clean_price_batch(batch)
+
+    assert cleaned.price_prevailing.tolist() == [120.46, 10000.0]
+    assert cleaned.commodity_name.tolist() == ["Red Onion", "Red Onion"]
+    assert cleaned.region_code.tolist() == ["R05", "R05"]
+    assert cleaned.price_low[0] == 110.0
+    assert cleaned.source.tolist() == ["DA", "PSA"]
+
+
+def test_clean_price_batch_normalises_each_distinct_name_once(monkeypatch) -> None:
+    calls: list[str] = []
+
+    def _normalize(value: str) -> str:
+        calls.append(value)
+        return value.strip().title()
+
+    monkeypatch.setattr(data_cleaner, "normalize_commodity_name", _normalize)
+    names = ["red onion", "pork liempo"] * 500
+    batch = PriceRecordBatch.from_columns(
+        commodity_name=names,
+        market_name=["Market"] * len(names),
+        region_code=["R05"] * len(names),
+        date=date(2026, 2, 1),
+        price_prevailing=[100.0] * len(names),
+        source="DA",
+    )
+
+    cleaned = data_cleaner.clean_price_batch(batch)
+
+    assert sorted(calls) == ["pork liempo", "red onion"]
+    assert cleaned.commodity_name.tolist()[:2] == ["Red Onion", "Pork Liempo"]
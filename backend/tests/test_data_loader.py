@@ -0,0 +1,119 @@
+"""Tests for the daily price upsert."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.models import DailyPrice
+from app.scraping import data_loader
+from app.scraping.data_loader import upsert_daily_prices
+from app.scraping.types import PriceRecordBatch, RawPriceRecord
+from app.services.price_changes import daily_price_changes
+
+MARKET = "Quezon City Public Market"
+
+
+def _records() -> list[RawPriceRecord]:
+    return [
+        # Already loaded by the seeded fixture for 2026-02-15.
+        RawPriceRecord("Well-Milled Rice", MARKET, "NCR", date(2026, 2, 15), 52.5, source="DA-BPI"),
+        RawPriceRecord("Well-Milled Rice", MARKET, "NCR", date(2026, 2, 16), 51.0, price_low=49.5, source="DA-BPI"),
+        RawPriceRecord("Red Onion", MARKET, "NCR", date(2026, 2, 16), 140.25, source="DA-BPI"),
+        RawPriceRecord("Unknown Fish", MARKET, "NCR", date(2026, 2, 16), 99.0, source="DA-BPI"),
+    ]
+
+
+async def _changes(session) -> list[tuple]:
+    """(commodity_id, date) of the rows the last upsert recorded as written."""
+    result = await session.execute(
+        select(daily_price_changes.c.commodity_id, daily_price_changes.c.date).order_by(
+            daily_price_changes.c.commodity_id, daily_price_changes.c.date
+        )
+    )
+    return list(result.all())
+
+
+async def _price(session, commodity_id: int, day: date) -> DailyPrice:
+    result = await session.execute(
+        select(DailyPrice).where(
+            DailyPrice.commodity_id == commodity_id, DailyPrice.market_id == 1, DailyPrice.date == day
+        )
+    )
+    return result.scalar_one()
+
+
+@pytest.mark.parametrize("batch_rows", [1, 50_000])
+async def test_upsert_inserts_new_rows_and_updates_existing(seeded_session, monkeypatch, batch_rows):
+    monkeypatch.setattr(data_loader.settings, "daily_price_upsert_batch_rows", batch_rows)
+
+    result = await upsert_daily_prices(seeded_session, _records())
+
+    assert result.row_count == 3
+    assert await _changes(seeded_session) == [(1, date(2026, 2, 15)), (1, date(2026, 2, 16)), (2, date(2026, 2, 16))]
+    assert result.inserted == {"DA-BPI": 2}
+    assert result.changed == {"DA-BPI": 1}
+    assert not result.unchanged
+    assert result.unmatched_rows == {"DA-BPI": 1}
+
+    seeded_session.expire_all()
+    updated = await _price(seeded_session, 1, date(2026, 2, 15))
+    assert updated.price_prevailing == Decimal("52.50")
+    assert updated.price_avg == Decimal("52.50")
+    assert updated.price_low is None
+    inserted = await _price(seeded_session, 1, date(2026, 2, 16))
+    assert inserted.price_low == Decimal("49.50")
+    assert inserted.price_high is None
+
+
+async def test_rescrape_with_the_same_prices_writes_nothing(seeded_session, monkeypatch):
+    await upsert_daily_prices(seeded_session, _records())
+    refreshes: list[int] = []
+
+    async def _refresh_snapshot(_session):
+        refreshes.append(1)
+
+    monkeypatch.setattr(data_loader, "refresh_latest_price_snapshot", _refresh_snapshot)
+    rescraped = _records()
+    rescraped[1] = RawPriceRecord("Well-Milled Rice", MARKET, "NCR", date(2026, 2, 16), 51.75, source="DA-BPI")
+
+    repeated = await upsert_daily_prices(seeded_session, _records())
+    assert not repeated.written
+    assert await _changes(seeded_session) == []
+    assert repeated.unchanged == {"DA-BPI": 3}
+    assert repeated.row_count == 3
+    assert not refreshes
+
+    changed = await upsert_daily_prices(seeded_session, rescraped)
+    assert await _changes(seeded_session) == [(1, date(2026, 2, 16))]
+    assert changed.changed == {"DA-BPI": 1}
+    assert changed.unchanged == {"DA-BPI": 2}
+    assert len(refreshes) == 1
+
+
+async def test_upsert_of_nothing_resolvable_writes_nothing(seeded_session):
+    result = await upsert_daily_prices(seeded_session, _records()[-1:])
+
+    assert result.row_count == 0
+    assert not result.inserted
+    assert result.unmatched_names == {("commodity", "Unknown Fish"): 1}
+
+
+async def test_streamed_batches_load_in_one_upsert_and_the_last_row_per_key_wins(seeded_session):
+    records = _records()
+    restated = RawPriceRecord("Red Onion", MARKET, "NCR", date(2026, 2, 16), 142.0, source="DA-BPI")
+
+    async def _stream():
+        yield PriceRecordBatch.from_records(records[:3])
+        yield PriceRecordBatch.empty()
+        yield PriceRecordBatch.from_records([records[3], restated])
+
+    result = await upsert_daily_prices(seeded_session, _stream())
+
+    assert result.inserted == {"DA-BPI": 2}
+    assert result.changed == {"DA-BPI": 1}
+    assert result.unmatched_rows == {"DA-BPI": 1}
+    seeded_session.expire_all()
+    onion = await _price(seeded_session, 2, date(2026, 2, 16))
+    assert onion.price_prevailing == Decimal("142.00")
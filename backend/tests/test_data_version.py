@@ -0,0 +1,95 @@
+"""Tests for ETag/Last-Modified conditional requests driven by the data version."""
+
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Depends
+from fastapi.routing import APIRoute
+
+from app import data_version as data_version_module
+from app.data_version import data_version, mark_data_changed
+from app.dependencies.auth import require_admin
+from app.main import app
+
+
+async def test_get_responses_carry_validators(client):
+    resp = await client.get("/api/v1/regions")
+
+    assert resp.status_code == 200
+    assert resp.headers["etag"] == data_version.etag
+    assert resp.headers["last-modified"] == data_version.last_modified
+    assert resp.headers["cache-control"] == "no-cache"
+
+
+async def test_matching_if_none_match_returns_304(client):
+    etag = (await client.get("/api/v1/regions")).headers["etag"]
+
+    resp = await client.get("/api/v1/regions", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+
+async def test_data_change_invalidates_etag(client):
+    etag = (await client.get("/api/v1/regions")).headers["etag"]
+
+    mark_data_changed("test")
+    resp = await client.get("/api/v1/regions", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert resp.json()
+
+
+async def test_if_modified_since_returns_304_only_after_the_change_second(client):
+    last_modified = (await client.get("/api/v1/commodities")).headers["last-modified"]
+    later = format_datetime(parsedate_to_datetime(last_modified) + timedelta(seconds=1), usegmt=True)
+
+    # Another change may have landed in the same second, so an equal date is not proof.
+    same_second = await client.get("/api/v1/commodities", headers={"If-Modified-Since": last_modified})
+    after = await client.get("/api/v1/commodities", headers={"If-Modified-Since": later})
+
+    assert same_second.status_code == 200
+    assert after.status_code == 304
+
+
+async def test_validators_roll_over_at_midnight(client, monkeypatch):
+    first = await client.get("/api/v1/forecast/summary")
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+    later = format_datetime(parsedate_to_datetime(last_modified) + timedelta(seconds=1), usegmt=True)
+
+    tomorrow = datetime.combine(datetime.now(UTC).date() + timedelta(days=1), datetime.min.time(), UTC)
+    monkeypatch.setattr(data_version_module, "_now", lambda: tomorrow)
+    by_etag = await client.get("/api/v1/forecast/summary", headers={"If-None-Match": etag})
+    by_date = await client.get("/api/v1/forecast/summary", headers={"If-Modified-Since": later})
+
+    assert by_etag.status_code == 200
+    assert by_etag.headers["etag"] != etag
+    assert by_date.status_code == 200
+    assert parsedate_to_datetime(by_date.headers["last-modified"]) == tomorrow
+
+
+async def test_guarded_routes_check_credentials_before_answering_304(client, monkeypatch, admin_token):
+    async def _private() -> dict[str, str]:
+        return {"vendor": "private"}
+
+    route = APIRoute(
+        "/api/v1/vendors/private", _private, dependencies=[Depends(require_admin)], dependency_overrides_provider=app
+    )
+    monkeypatch.setattr(app.router, "routes", [route, *app.router.routes])
+    etag = data_version.etag
+
+    anonymous = await client.get("/api/v1/vendors/private", headers={"If-None-Match": etag})
+    admin = await client.get(
+        "/api/v1/vendors/private", headers={"If-None-Match": etag, "Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert anonymous.status_code == 401
+    assert admin.status_code == 304
+
+
+async def test_unversioned_routes_are_not_tagged(client):
+    resp = await client.get("/api/v1/health")
+
+    assert "etag" not in resp.headers
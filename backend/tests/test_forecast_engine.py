@@ -0,0 +1,48 @@
+from datetime import date
+
+from app.ml.engine import ForecastRunStats, PairForecastJob, fit_pair, resolve_worker_count, run_forecast_jobs
+
+
+def _job(commodity_id: int, prices: list[float]) -> PairForecastJob:
+    return PairForecastJob(commodity_id=commodity_id, region_id=1, prices=prices, last_date=date(2026, 1, 10))
+
+
+def test_resolve_worker_count_defaults_to_cpu_count() -> None:
+    assert resolve_worker_count(0) >= 1
+    assert resolve_worker_count(None) >= 1
+    assert resolve_worker_count(3) == 3
+
+
+def test_fit_pair_returns_horizon_points() -> None:
+    result = fit_pair(_job(1, [120.0, 121.2, 122.1, 123.0, 123.4, 124.1, 124.8, 125.2]))
+
+    assert result.commodity_id == 1
+    assert len(result.points) == 7
+    assert result.points[0]["forecast_date"] == date(2026, 1, 11)
+
+
+async def test_run_forecast_jobs_streams_every_pair() -> None:
+    jobs = [_job(index, [45.0 + index + step * 0.4 for step in range(12)]) for index in range(3)]
+    stats = ForecastRunStats()
+
+    results = [result async for result in run_forecast_jobs(jobs, max_workers=2, stats=stats)]
+
+    assert sorted(result.commodity_id for result in results) == [0, 1, 2]
+    assert stats.workers == 2
+    assert stats.pairs_submitted == 3
+    assert stats.pairs_completed == 3
+    assert stats.pairs_per_second > 0
+
+
+async def test_spent_cpu_budget_restricts_jobs_to_cheap_models() -> None:
+    jobs = [_job(index, [45.0 + index + step * 0.4 + (step % 3) * 0.7 for step in range(20)]) for index in range(3)]
+    for job in jobs:
+        job.tolerance = 0.0
+    stats = ForecastRunStats()
+
+    results = [result async for result in run_forecast_jobs(jobs, max_workers=1, stats=stats, cpu_budget_seconds=0.0)]
+
+    assert len(results) == 3
+    assert stats.pairs_budget_limited == 3
+    assert all("arima_1_1_1" not in result.model_seconds for result in results)
+    assert "naive" in stats.model_seconds
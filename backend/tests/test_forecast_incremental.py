@@ -0,0 +1,146 @@
+"""Tests for change tracking and history streaming in the forecast service."""
+
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import select
+
+from app.models import DailyPrice, ForecastFitState
+from app.services import forecast_service
+from app.services.forecast_service import _find_dirty_pairs, _iter_history_by_pair
+from tests.conftest import TestSessionLocal
+
+
+async def _record_fit_states(session, dirty) -> None:
+    for (commodity_id, region_id), signature in dirty.items():
+        session.add(
+            ForecastFitState(
+                commodity_id=commodity_id,
+                region_id=region_id,
+                last_price_date=signature.last_price_date,
+                row_count=signature.row_count,
+                content_hash=signature.content_hash,
+                model_used="linear_regression",
+            )
+        )
+    await session.commit()
+
+
+async def test_every_pair_is_dirty_before_the_first_fit(seeded_session):
+    dirty, states = await _find_dirty_pairs(seeded_session, horizon_days=7)
+
+    assert set(dirty) == {(1, 1), (2, 1), (1, 2)}
+    assert states == {}
+    assert dirty[(1, 1)].row_count == 30
+    assert dirty[(1, 1)].last_price_date == date(2026, 2, 15)
+
+
+async def test_only_changed_pairs_are_dirty_after_a_fit(seeded_session):
+    dirty, _ = await _find_dirty_pairs(seeded_session, horizon_days=7)
+    await _record_fit_states(seeded_session, dirty)
+
+    dirty, _ = await _find_dirty_pairs(seeded_session, horizon_days=7)
+    assert dirty == {}
+
+    seeded_session.add(
+        DailyPrice(
+            commodity_id=2,
+            market_id=1,
+            region_id=1,
+            price_prevailing=Decimal("140.00"),
+            date=date(2026, 2, 16),
+            source="DA-BPI",
+        )
+    )
+    await seeded_session.commit()
+
+    dirty, _ = await _find_dirty_pairs(seeded_session, horizon_days=7)
+    assert set(dirty) == {(2, 1)}
+
+
+async def test_offsetting_corrections_mark_the_pair_dirty(seeded_session):
+    dirty, _ = await _find_dirty_pairs(seeded_session, horizon_days=7)
+    await _record_fit_states(seeded_session, dirty)
+
+    rows = (
+        (
+            await seeded_session.execute(
+                select(DailyPrice)
+                .where(DailyPrice.commodity_id == 1, DailyPrice.region_id == 1)
+                .order_by(DailyPrice.date.desc())
+                .limit(2)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    rows[0].price_prevailing += Decimal("1.00")
+    rows[1].price_prevailing -= Decimal("1.00")
+    await seeded_session.commit()
+
+    dirty, _ = await _find_dirty_pairs(seeded_session, horizon_days=7)
+    assert set(dirty) == {(1, 1)}
+
+
+async def test_force_and_horizon_change_mark_all_pairs_dirty(seeded_session):
+    dirty, _ = await _find_dirty_pairs(seeded_session, horizon_days=7)
+    await _record_fit_states(seeded_session, dirty)
+
+    forced, _ = await _find_dirty_pairs(seeded_session, horizon_days=7, force=True)
+    longer_horizon, _ = await _find_dirty_pairs(seeded_session, horizon_days=14)
+
+    assert len(forced) == 3
+    assert len(longer_horizon) == 3
+
+
+async def test_history_stream_yields_one_array_series_per_pair(seeded_session):
+    histories = [history async for history in _iter_history_by_pair(seeded_session, batch_size=7)]
+
+    assert [(h.commodity_id, h.region_id) for h in histories] == [(1, 1), (1, 2), (2, 1)]
+    first = histories[0]
+    assert first.prices.dtype == np.float64
+    assert first.dates.dtype == np.dtype("datetime64[D]")
+    assert len(first.prices) == 30
+    assert first.prices[0] == 48.0
+    assert first.last_date == date(2026, 2, 15)
+
+
+async def test_history_stream_filters_by_commodity(seeded_session):
+    histories = [history async for history in _iter_history_by_pair(seeded_session, commodity_ids={2})]
+
+    assert [(h.commodity_id, h.region_id) for h in histories] == [(2, 1)]
+
+
+async def test_failed_fits_are_retried_and_short_pairs_wait_for_new_data(seeded_session, monkeypatch):
+    submitted: list[tuple[int, int]] = []
+
+    async def _every_fit_fails(jobs, **_options):
+        async for job in jobs:
+            submitted.append((job.commodity_id, job.region_id))
+        return
+        yield
+
+    seeded_session.add_all(
+        DailyPrice(
+            commodity_id=2,
+            market_id=2,
+            region_id=2,
+            price_prevailing=Decimal("140.00"),
+            date=date(2026, 2, day),
+            source="DA-BPI",
+        )
+        for day in (14, 15)
+    )
+    await seeded_session.commit()
+    monkeypatch.setattr(forecast_service, "AsyncSessionLocal", TestSessionLocal)
+    monkeypatch.setattr(forecast_service, "run_forecast_jobs", _every_fit_fails)
+
+    first = await forecast_service.regenerate_all_forecasts()
+    second = await forecast_service.regenerate_all_forecasts()
+
+    assert sorted(submitted) == [(1, 1), (1, 1), (1, 2), (1, 2), (2, 1), (2, 1)]
+    assert first["pairs_unchanged"] == 0
+    assert second["pairs_unchanged"] == 1
+    states = (await seeded_session.execute(select(ForecastFitState))).scalars().all()
+    assert [(state.commodity_id, state.region_id, state.model_used) for state in states] == [(2, 2, None)]
@@ -0,0 +1,52 @@
+"""Tests for the bulk forecast writer."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.models import PriceForecast
+from app.services.forecast_writer import ForecastBuffer, write_forecasts
+
+
+def _points(start: date, base: float) -> list[dict]:
+    return [
+        {
+            "forecast_date": start + timedelta(days=step),
+            "predicted_price": base + step * 0.111,
+            "confidence_lower": base - 2.0,
+            "confidence_upper": base + 2.0,
+        }
+        for step in range(1, 4)
+    ]
+
+
+async def test_write_forecasts_replaces_future_rows_of_buffered_pairs(seeded_session):
+    existing = (await seeded_session.execute(select(PriceForecast))).scalars().all()
+    last_date = min(row.forecast_date for row in existing) - timedelta(days=1)
+
+    buffer = ForecastBuffer()
+    buffer.add(1, 1, last_date, "naive", _points(last_date, 60.0))
+    buffer.add(2, 1, last_date, "ses", _points(last_date, 80.0))
+
+    written = await write_forecasts(seeded_session, buffer)
+    await seeded_session.commit()
+    seeded_session.expire_all()
+
+    rows = (
+        (
+            await seeded_session.execute(
+                select(PriceForecast).order_by(PriceForecast.commodity_id, PriceForecast.forecast_date)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert written == len(buffer) == 6
+    assert len(rows) == 6
+    assert {row.model_used for row in rows if row.commodity_id == 1} == {"naive"}
+    assert rows[1].predicted_price == Decimal("60.22")
+
+
+async def test_write_forecasts_with_empty_buffer_is_a_no_op(seeded_session):
+    assert await write_forecasts(seeded_session, ForecastBuffer()) == 0
@@ -0,0 +1,204 @@
+"""Tests for the shared scraper HTTP client."""
+
+from datetime import date
+
+import httpx
+import pytest
+
+from app.scraping import http_client
+from app.scraping.http_client import ScraperHttpClient, UpstreamNotModified, ValidatorCache
+
+URL = "https://example.test/prices"
+PAGE = "<table><tr><td>Rice</td></tr></table>"
+
+
+class Upstream:
+    """A fake upstream that records requests and answers from a queue of responses."""
+
+    def __init__(self, *responses: httpx.Response | Exception) -> None:
+        self.responses = list(responses)
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(http_client.settings, "scrape_http_backoff_base_seconds", 0.0)
+    monkeypatch.setattr(http_client.settings, "scrape_http_max_attempts", 3)
+
+
+def _client(tmp_path, upstream: Upstream) -> ScraperHttpClient:
+    return ScraperHttpClient(ValidatorCache(tmp_path, max_body_bytes=1024), transport=httpx.MockTransport(upstream))
+
+
+def _page(text: str = PAGE, **headers: str) -> httpx.Response:
+    return httpx.Response(200, text=text, headers=headers)
+
+
+async def test_retries_transient_failures(tmp_path):
+    upstream = Upstream(httpx.ConnectError("refused"), httpx.Response(503), _page())
+    client = _client(tmp_path, upstream)
+    staging = client.cache.staging()
+
+    assert await client.get_text(URL, staging=staging) == PAGE
+    assert len(upstream.requests) == 3
+
+
+async def test_gives_up_after_max_attempts(tmp_path):
+    upstream = Upstream(httpx.Response(502), httpx.Response(502), httpx.Response(502))
+    client = _client(tmp_path, upstream)
+    staging = client.cache.staging()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_text(URL, staging=staging)
+    assert len(upstream.requests) == 3
+
+
+async def test_client_errors_are_not_retried(tmp_path):
+    upstream = Upstream(httpx.Response(404))
+    client = _client(tmp_path, upstream)
+    staging = client.cache.staging()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_text(URL, staging=staging)
+    assert len(upstream.requests) == 1
+
+
+async def test_committed_validators_make_a_304_not_modified(tmp_path):
+    upstream = Upstream(_page(etag='"v1"', **{"last-modified": "Mon, 16 Feb 2026 06:00:00 GMT"}), httpx.Response(304))
+    client = _client(tmp_path, upstream)
+    staging = client.cache.staging()
+
+    await client.get_text(URL, staging=staging)
+    staging.commit()
+    with pytest.raises(UpstreamNotModified):
+        await client.get_text(URL, staging=staging)
+
+    revalidation = upstream.requests[1]
+    assert revalidation.headers["if-none-match"] == '"v1"'
+    assert revalidation.headers["if-modified-since"] == "Mon, 16 Feb 2026 06:00:00 GMT"
+
+
+async def test_identical_body_without_validators_is_not_modified(tmp_path):
+    upstream = Upstream(_page(), _page(), _page(PAGE + "<p>updated</p>"))
+    client = _client(tmp_path, upstream)
+    staging = client.cache.staging()
+
+    await client.get_text(URL, staging=staging)
+    staging.commit()
+    with pytest.raises(UpstreamNotModified):
+        await client.get_text(URL, staging=staging)
+    assert "updated" in await client.get_text(URL, staging=staging)
+
+
+async def test_uncommitted_fetch_is_not_remembered(tmp_path):
+    upstream = Upstream(_page(etag='"v1"'), _page(etag='"v1"'))
+    client = _client(tmp_path, upstream)
+    staging = client.cache.staging()
+
+    await client.get_text(URL, staging=staging)
+    staging.discard()
+
+    assert await client.get_text(URL, staging=staging) == PAGE
+    assert "if-none-match" not in upstream.requests[1].headers
+
+
+async def test_unconditional_fetch_answers_304_from_cached_body(tmp_path):
+    upstream = Upstream(_page(etag='"v1"'), httpx.Response(304))
+    client = _client(tmp_path, upstream)
+    staging = client.cache.staging()
+
+    await client.get_text(URL, staging=staging)
+    staging.commit()
+
+    assert await client.get_text(URL, staging=staging, conditional=False) == PAGE
+    assert upstream.requests[1].headers["if-none-match"] == '"v1"'
+
+
+async def test_connection_is_reused_across_requests(tmp_path):
+    upstream = Upstream(_page(), _page(PAGE + "<p>2</p>"))
+    client = _client(tmp_path, upstream)
+    staging = client.cache.staging()
+
+    await client.get_text(URL, staging=staging)
+    first = client.client
+    await client.get_text(URL, staging=staging)
+
+    assert client.client is first
+    await client.aclose()
+
+
+async def test_runs_commit_and_discard_only_their_own_validators(tmp_path):
+    upstream = Upstream(_page(etag='"v1"'), _page("<p>other</p>", etag='"w1"'), httpx.Response(304))
+    client = _client(tmp_path, upstream)
+    scheduled, manual = client.cache.staging(), client.cache.staging()
+
+    await client.get_text(URL, staging=scheduled)
+    await client.get_text(URL + "/other", staging=manual)
+    manual.discard()
+    scheduled.commit()
+
+    with pytest.raises(UpstreamNotModified):
+        await client.get_text(URL, staging=client.cache.staging())
+    assert client.cache.get(URL + "/other") is None
+
+
+async def test_download_streams_to_a_file_and_caches_only_the_hash(tmp_path):
+    upstream = Upstream(_page("a,b\n1,2\n", etag='"v1"'), httpx.Response(304), _page("a,b\n1,2\n"))
+    client = _client(tmp_path / "cache", upstream)
+    staging = client.cache.staging()
+    destination = tmp_path / "extract.csv"
+
+    await client.download(URL, destination, staging=staging)
+    staging.commit()
+
+    assert destination.read_text() == "a,b\n1,2\n"
+    assert client.cache.get(URL).body is None
+    with pytest.raises(UpstreamNotModified):
+        await client.download(URL, destination, staging=staging)
+    assert upstream.requests[1].headers["if-none-match"] == '"v1"'
+    await client.download(URL, destination, staging=staging, conditional=False)
+    assert "if-none-match" not in upstream.requests[2].headers
+
+
+async def test_unchanged_page_is_returned_again_on_a_new_scrape_date(tmp_path):
+    monday, tuesday = date(2026, 2, 16), date(2026, 2, 17)
+    upstream = Upstream(_page(etag='"v1"'), httpx.Response(304), _page(), httpx.Response(304))
+    client = _client(tmp_path, upstream)
+
+    staging = client.cache.staging()
+    await client.get_text(URL, staging=staging, scrape_date=monday)
+    staging.commit()
+    with pytest.raises(UpstreamNotModified):
+        await client.get_text(URL, staging=client.cache.staging(), scrape_date=monday)
+
+    staging = client.cache.staging()
+    assert await client.get_text(URL, staging=staging, scrape_date=tuesday) == PAGE
+    assert upstream.requests[2].headers["if-none-match"] == '"v1"'
+    staging.commit()
+    assert client.cache.get(URL).scrape_date == "2026-02-17"
+    with pytest.raises(UpstreamNotModified):
+        await client.get_text(URL, staging=client.cache.staging(), scrape_date=tuesday)
+
+
+async def test_unchanged_download_is_fetched_again_on_a_new_scrape_date(tmp_path):
+    monday, tuesday = date(2026, 2, 16), date(2026, 2, 17)
+    upstream = Upstream(_page("a,b\n1,2\n", etag='"v1"'), _page("a,b\n1,2\n", etag='"v1"'))
+    client = _client(tmp_path / "cache", upstream)
+    destination = tmp_path / "extract.csv"
+
+    staging = client.cache.staging()
+    await client.download(URL, destination, staging=staging, scrape_date=monday)
+    staging.commit()
+    destination.unlink()
+
+    await client.download(URL, destination, staging=client.cache.staging(), scrape_date=tuesday)
+
+    assert destination.read_text() == "a,b\n1,2\n"
+    assert "if-none-match" not in upstream.requests[1].headers
@@ -1,14 +1,20 @@
 from datetime import date
 
+import numpy as np
+
+from app.ml.param_cache import ArimaParamCache, ArimaWarmStart
 from app.ml.predictor import generate_forecast_points
-from app.ml.trainer import train_best_model
+from app.ml.registry import CHEAP_MODEL_MAX_COST, registered_models
+from app.ml.trainer import ARIMA_ORDER, train_best_model
+
+MODEL_NAMES = {spec.name for spec in registered_models()}
 
 
 def test_train_best_model_returns_supported_model_name() -> None:
     prices = [45.0, 45.8, 46.3, 46.7, 47.1, 47.9, 48.4, 49.0, 49.2, 49.6]
     trained = train_best_model(prices)
 
-    assert trained.model_name in {"linear_regression", "arima_1_1_1"}
+    assert trained.model_name in MODEL_NAMES
 
 
 def test_generate_forecast_points_returns_horizon_rows() -> None:
@@ -20,3 +26,88 @@ def test_generate_forecast_points_returns_horizon_rows() -> None:
     assert len(rows) == 7
     assert rows[0]["forecast_date"].isoformat() == "2026-01-11"
     assert "predicted_price" in rows[0]
+
+
+def _seasonal_prices(length: int = 60) -> list[float]:
+    return [50.0 + step * 0.05 + (1.5 if step % 7 in (5, 6) else 0.0) + (step % 3) * 0.2 for step in range(length)]
+
+
+def test_train_best_model_returns_arima_warm_start() -> None:
+    prices = _seasonal_prices()
+    trained = train_best_model(prices, tolerance=0.0)
+
+    assert trained.arima_warm_start is not None
+    assert trained.arima_warm_start.order == ARIMA_ORDER
+    assert len(trained.arima_warm_start.params) == 3
+
+
+def test_warm_started_fit_reuses_previous_parameters() -> None:
+    prices = _seasonal_prices()
+    previous = train_best_model(prices[:-7], tolerance=0.0)
+    trained = train_best_model(prices, warm_start=previous.arima_warm_start, tolerance=0.0)
+
+    assert trained.model_name in MODEL_NAMES
+    assert trained.arima_warm_start is not None
+
+
+def test_warm_start_is_invalidated_when_series_changes_shape() -> None:
+    prices = np.array(_seasonal_prices(), dtype=float)
+    warm_start = ArimaWarmStart.from_fit(ARIMA_ORDER, np.array([0.5, -0.9, 1.0]), prices)
+
+    assert warm_start.is_compatible(prices, ARIMA_ORDER)
+    assert not warm_start.is_compatible(prices[:-5], ARIMA_ORDER)
+    assert not warm_start.is_compatible(prices * 2, ARIMA_ORDER)
+    assert not warm_start.is_compatible(prices, (2, 1, 1))
+
+
+def test_param_cache_drops_incompatible_entries() -> None:
+    prices = np.array(_seasonal_prices(), dtype=float)
+    cache = ArimaParamCache()
+    cache.put(1, 1, ArimaWarmStart.from_fit(ARIMA_ORDER, np.array([0.5, -0.9, 1.0]), prices))
+
+    assert cache.get(1, 1, ARIMA_ORDER, prices) is not None
+    assert cache.get(1, 2, ARIMA_ORDER, prices) is None
+    assert cache.get(1, 1, ARIMA_ORDER, prices[:10]) is None
+    assert len(cache) == 0
+
+
+def test_warm_start_round_trips_through_dict() -> None:
+    warm_start = ArimaWarmStart(order=ARIMA_ORDER, params=[0.1, 0.2, 0.3], n_obs=40, level=51.5)
+
+    assert ArimaWarmStart.from_dict(warm_start.to_dict()) == warm_start
+    assert ArimaWarmStart.from_dict(None) is None
+    assert ArimaWarmStart.from_dict({"order": [1, 1, 1]}) is None
+
+
+def test_registry_orders_candidates_by_cost() -> None:
+    costs = [spec.cost for spec in registered_models()]
+
+    assert costs == sorted(costs)
+    assert {"naive", "seasonal_naive_7", "ses", "linear_regression", "arima_1_1_1"} <= MODEL_NAMES
+    assert "arima_1_1_1" not in {spec.name for spec in registered_models(CHEAP_MODEL_MAX_COST)}
+
+
+def test_cheap_model_within_tolerance_skips_arima() -> None:
+    prices = [50.0] * 30
+
+    trained = train_best_model(prices)
+
+    assert trained.model_name == "naive"
+    assert set(trained.model_seconds) == {"naive"}
+
+
+def test_zero_tolerance_evaluates_every_candidate() -> None:
+    trained = train_best_model(_seasonal_prices(), tolerance=0.0)
+
+    assert set(trained.model_seconds) == MODEL_NAMES
+    assert trained.mae >= 0.0
+
+
+def test_seasonal_naive_forecast_repeats_last_week() -> None:
+    prices = [float(10 + step % 7) for step in range(28)]
+
+    trained = train_best_model(prices)
+    rows = generate_forecast_points(trained=trained, history=prices, start_date=date(2026, 1, 10), horizon_days=7)
+
+    assert trained.model_name == "seasonal_naive_7"
+    assert [row["predicted_price"] for row in rows] == prices[-7:]
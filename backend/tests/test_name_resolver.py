@@ -0,0 +1,95 @@
+"""Tests for scraped-name resolution."""
+
+from datetime import date
+
+import numpy as np
+
+from app.scraping.data_loader import _resolve_batch
+from app.scraping.name_resolver import NameIndex, NameResolver, normalize_name, token_key
+from app.scraping.types import PriceRecordBatch, RawPriceRecord
+from app.utils.seed_data import seed_reference_data
+
+COMMODITIES = [
+    ("Well-Milled Rice", 1),
+    ("Red Onion", 2),
+    ("White Onion", 3),
+    ("Eggplant (Talong)", 4),
+    ("Garlic (Local)", 5),
+    ("Garlic (Imported)", 6),
+    ("Pork Liempo", 7),
+]
+
+
+def _index() -> NameIndex:
+    return NameIndex.build("commodity", COMMODITIES, {"liempo": "Pork Liempo"})
+
+
+def test_normalization_folds_case_accents_and_punctuation():
+    assert normalize_name("  Piña,  Queen-Variety ") == "pina queen variety"
+    assert token_key("Rice, Well-Milled") == token_key("WELL MILLED RICE")
+
+
+def test_resolves_exact_alias_normalized_and_parenthetical_names():
+    index = _index()
+
+    assert index.resolve("Red Onion") == 2
+    assert index.resolve("liempo") == 7
+    assert index.resolve("rice, well-milled") == 1
+    assert index.resolve("Talong") == 4
+    assert index.resolve("EGGPLANT") == 4
+
+
+def test_fuzzy_match_resolves_near_misses():
+    index = _index()
+
+    assert index.resolve("Red Onions") == 2
+    assert index.resolve("Well Miled Rice") == 1
+    assert index.matched_by["fuzzy"] == 2
+
+
+def test_ambiguous_and_unrelated_names_stay_unmatched():
+    index = _index()
+
+    # "Garlic" names two commodities; a distant name matches nothing.
+    assert index.resolve("Garlic") is None
+    assert index.resolve("Bangus") is None
+    assert index.matched_by["unmatched"] == 2
+
+
+def test_each_distinct_name_is_resolved_once():
+    index = _index()
+
+    ids = index.resolve_column(np.array(["red onions", "Bangus", "red onions"] * 1000, dtype=object))
+
+    assert ids[:3].tolist() == [2, 0, 2]
+    assert sum(index.matched_by.values()) == 2
+
+
+def test_rows_resolving_to_the_same_key_keep_the_last():
+    resolver = NameResolver(
+        commodities=_index(),
+        markets=NameIndex.build("market", [("Lagonoy Public Market", 1)]),
+        regions=NameIndex.build("region", [("AGO", 1)], {"Agosais": "AGO"}),
+    )
+    day = date(2026, 2, 16)
+    batch = PriceRecordBatch.from_records(
+        [
+            RawPriceRecord("Red Onion", "Lagonoy Public Market", "AGO", day, 130.0),
+            RawPriceRecord("red onions", "LAGONOY PUBLIC MARKET", "Agosais", day, 131.0),
+        ]
+    )
+
+    prices, result = _resolve_batch(batch, resolver)
+
+    assert prices.price_prevailing.tolist() == [131.0]
+    assert not result.unmatched_rows
+
+
+async def test_loads_from_reference_tables(db_session):
+    await seed_reference_data(db_session, history_days=1)
+
+    resolver = await NameResolver.load(db_session)
+
+    assert resolver.commodities.resolve("Malunggay") is not None
+    assert resolver.commodities.resolve("well milled rice") == resolver.commodities.resolve("Well-Milled Rice")
+    assert resolver.regions.resolve("Agosais") == resolver.regions.resolve("AGO")
@@ -0,0 +1,199 @@
+"""Tests for multi-source ingestion in the pipeline service."""
+
+import asyncio
+from collections import Counter
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.models import DailyPrice, ScrapeLog
+from app.scraping.data_loader import UpsertResult
+from app.scraping.http_client import UpstreamNotModified, ValidatorCache, scraper_http
+from app.scraping.types import PriceRecordBatch, RawPriceRecord
+from app.services import pipeline_service
+from tests.conftest import TestSessionLocal
+
+
+def _record(source: str, price: float, *, market: str = "Balintawak Market") -> RawPriceRecord:
+    return RawPriceRecord(
+        commodity_name="Well-Milled Rice",
+        market_name=market,
+        region_code="NCR",
+        date=date(2026, 2, 16),
+        price_prevailing=price,
+        source=source,
+    )
+
+
+@pytest.fixture()
+def loaded(monkeypatch, db_session, tmp_path) -> list[list[RawPriceRecord]]:
+    """Run the pipeline against the test database, capturing what each upsert was given."""
+    calls: list[list[RawPriceRecord]] = []
+
+    async def _upsert(_session, batches, _resolver=None):
+        records = [record async for batch in batches for record in batch.records()]
+        calls.append(records)
+        return UpsertResult(inserted=Counter(record.source for record in records))
+
+    async def _no_alerts(_session):
+        return 0
+
+    monkeypatch.setattr(scraper_http, "cache", ValidatorCache(tmp_path, max_body_bytes=1024))
+    monkeypatch.setattr(pipeline_service, "AsyncSessionLocal", TestSessionLocal)
+    monkeypatch.setattr(pipeline_service, "upsert_daily_prices", _upsert)
+    monkeypatch.setattr(pipeline_service, "create_price_alerts", _no_alerts)
+    return calls
+
+
+def _scraper(*records: RawPriceRecord, delay: float = 0.0):
+    async def _scrape(_url: str, **_options) -> list[RawPriceRecord]:
+        await asyncio.sleep(delay)
+        return list(records)
+
+    return _scrape
+
+
+async def _logs(session) -> dict[str, ScrapeLog]:
+    result = await session.execute(select(ScrapeLog))
+    return {log.source: log for log in result.scalars()}
+
+
+async def test_all_sources_load_in_one_upsert(monkeypatch, loaded, db_session):
+    monkeypatch.setattr(pipeline_service, "scrape_da_prices", _scraper(_record("DA", 50.0)))
+    monkeypatch.setattr(
+        pipeline_service,
+        "scrape_psa_prices",
+        _scraper(_record("PSA", 51.0), _record("PSA", 52.0, market="Cubao Market")),
+    )
+    monkeypatch.setattr(pipeline_service, "scrape_bantay_presyo_prices", _scraper())
+
+    result = await pipeline_service.run_ingestion_pipeline("all")
+
+    assert len(loaded) == 1
+    assert sorted(record.price_prevailing for record in loaded[0]) == [50.0, 51.0, 52.0]
+    assert result["status"] == "success"
+    assert result["source"] == "ALL"
+    assert result["rows_ingested"] == 3
+    assert result["sources"] == {"DA": "success", "PSA": "success", "BANTAY_PRESYO": "success"}
+    assert (result["rows_inserted"], result["rows_changed"], result["rows_unchanged"]) == (3, 0, 0)
+
+    logs = await _logs(db_session)
+    assert {name: log.rows_ingested for name, log in logs.items()} == {"DA": 1, "PSA": 2, "BANTAY_PRESYO": 0}
+    assert {name: log.rows_inserted for name, log in logs.items()} == {"DA": 1, "PSA": 2, "BANTAY_PRESYO": 0}
+    assert all(log.status == "success" for log in logs.values())
+
+
+async def test_sources_are_fetched_concurrently(monkeypatch, loaded):
+    monkeypatch.setattr(pipeline_service, "scrape_da_prices", _scraper(_record("DA", 50.0), delay=0.2))
+    monkeypatch.setattr(pipeline_service, "scrape_psa_prices", _scraper(_record("PSA", 51.0), delay=0.2))
+    monkeypatch.setattr(pipeline_service, "scrape_bantay_presyo_prices", _scraper(delay=0.2))
+
+    started_at = asyncio.get_running_loop().time()
+    await pipeline_service.run_ingestion_pipeline("ALL")
+
+    assert asyncio.get_running_loop().time() - started_at < 0.5
+
+
+async def test_timed_out_source_is_logged_and_others_still_load(monkeypatch, loaded, db_session):
+    monkeypatch.setattr(pipeline_service.settings, "scrape_source_timeout_seconds", 0.05)
+    monkeypatch.setattr(pipeline_service, "scrape_da_prices", _scraper(_record("DA", 50.0)))
+    monkeypatch.setattr(pipeline_service, "scrape_psa_prices", _scraper(_record("PSA", 51.0), delay=1.0))
+    monkeypatch.setattr(pipeline_service, "scrape_bantay_presyo_prices", _scraper())
+
+    result = await pipeline_service.run_ingestion_pipeline("ALL")
+
+    assert result["status"] == "partial"
+    assert result["sources"]["PSA"] == "failed"
+    assert [record.source for record in loaded[0]] == ["DA"]
+
+    logs = await _logs(db_session)
+    assert logs["PSA"].status == "failed"
+    assert logs["PSA"].error_message == "timed out after 0.05s"
+    assert logs["DA"].rows_ingested == 1
+
+
+async def test_single_source_failure_raises_and_is_logged(monkeypatch, loaded, db_session):
+    async def _broken(_url: str, **_options) -> list[RawPriceRecord]:
+        raise ConnectionError("upstream unavailable")
+
+    monkeypatch.setattr(pipeline_service, "scrape_da_prices", _broken)
+
+    with pytest.raises(RuntimeError, match="DA: upstream unavailable"):
+        await pipeline_service.run_ingestion_pipeline("DA")
+
+    assert loaded == []
+    logs = await _logs(db_session)
+    assert list(logs) == ["DA"]
+    assert logs["DA"].status == "failed"
+
+
+async def test_unchanged_sources_skip_the_upsert(monkeypatch, loaded, db_session):
+    async def _unchanged(url: str, **_options) -> list[RawPriceRecord]:
+        raise UpstreamNotModified(url)
+
+    monkeypatch.setattr(pipeline_service, "scrape_da_prices", _unchanged)
+    monkeypatch.setattr(pipeline_service, "scrape_psa_prices", _unchanged)
+    monkeypatch.setattr(pipeline_service, "scrape_bantay_presyo_prices", _unchanged)
+
+    result = await pipeline_service.run_ingestion_pipeline("ALL")
+
+    assert loaded == []
+    assert result["status"] == "success"
+    assert result["rows_ingested"] == 0
+    assert set(result["sources"].values()) == {"unchanged"}
+    logs = await _logs(db_session)
+    assert {log.status for log in logs.values()} == {"unchanged"}
+
+
+async def test_force_passes_unconditional_fetch_to_da(monkeypatch, loaded):
+    options: list[dict] = []
+
+    async def _da(_url: str, **kwargs) -> list[RawPriceRecord]:
+        options.append(kwargs)
+        return [_record("DA", 50.0)]
+
+    monkeypatch.setattr(pipeline_service, "scrape_da_prices", _da)
+
+    await pipeline_service.run_ingestion_pipeline("DA")
+    await pipeline_service.run_ingestion_pipeline("DA", force=True)
+
+    assert [kwargs["conditional"] for kwargs in options] == [True, False]
+    assert options[0]["staging"] is not options[1]["staging"]
+
+
+async def test_streamed_source_is_cleaned_chunk_by_chunk_into_the_upsert(monkeypatch, loaded):
+    async def _chunks():
+        yield PriceRecordBatch.from_records([_record("PSA", 51.0), _record("PSA", -1.0, market="Cubao Market")])
+        yield PriceRecordBatch.from_records([_record("PSA", 53.456, market="Cubao Market")])
+
+    async def _psa(_url: str, **_options):
+        return _chunks()
+
+    monkeypatch.setattr(pipeline_service, "scrape_psa_prices", _psa)
+
+    result = await pipeline_service.run_ingestion_pipeline("PSA")
+
+    assert [record.price_prevailing for record in loaded[0]] == [51.0, 53.46]
+    assert result["sources"] == {"PSA": "success"}
+
+
+async def test_failed_alert_evaluation_rolls_back_the_prices(monkeypatch, seeded_session, tmp_path):
+    async def _alerts_fail(_session):
+        raise RuntimeError("alert rules unavailable")
+
+    monkeypatch.setattr(scraper_http, "cache", ValidatorCache(tmp_path, max_body_bytes=1024))
+    monkeypatch.setattr(pipeline_service, "AsyncSessionLocal", TestSessionLocal)
+    monkeypatch.setattr(pipeline_service, "create_price_alerts", _alerts_fail)
+    monkeypatch.setattr(
+        pipeline_service, "scrape_da_prices", _scraper(_record("DA", 55.0, market="Quezon City Public Market"))
+    )
+
+    with pytest.raises(RuntimeError, match="alert rules unavailable"):
+        await pipeline_service.run_ingestion_pipeline("DA")
+
+    prices = await seeded_session.execute(select(DailyPrice).where(DailyPrice.source == "DA"))
+    assert prices.scalars().all() == []
+    logs = await _logs(seeded_session)
+    assert logs["DA"].status == "failed"
+    assert logs["DA"].rows_ingested == 0
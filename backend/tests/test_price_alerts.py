@@ -0,0 +1,97 @@
+"""Tests for alert generation during ingestion."""
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select, update
+
+from app.models import Commodity, DailyPrice, PriceAlert
+from app.services.alert_service import create_price_alerts
+from app.services.price_changes import CHANGE_COLUMNS, prepare_price_changes, record_price_changes
+from app.services.rolling_stats_service import advance_rolling_stats
+
+
+def _row(price: str, day: date, *, commodity_id: int = 1) -> dict:
+    return {
+        "commodity_id": commodity_id,
+        "market_id": 1,
+        "region_id": 1,
+        "price_prevailing": Decimal(price),
+        "date": day,
+        "source": "DA-BPI",
+    }
+
+
+async def _ingest(session, rows: list[dict]) -> int:
+    """Insert ``rows`` and record their keys as the loader would, then advance the stats and raise alerts."""
+    session.add_all(DailyPrice(**row) for row in rows)
+    await session.flush()
+    await prepare_price_changes(session)
+    await record_price_changes(session, [{column: row[column] for column in CHANGE_COLUMNS} for row in rows])
+    await advance_rolling_stats(session)
+    return await create_price_alerts(session)
+
+
+async def _alerts(session) -> list[PriceAlert]:
+    return list((await session.execute(select(PriceAlert).order_by(PriceAlert.alert_type))).scalars().all())
+
+
+async def test_outlier_raises_spike_alert_with_severity(seeded_session):
+    created = await _ingest(seeded_session, [_row("90.00", date(2026, 2, 16))])
+
+    [alert] = await _alerts(seeded_session)
+    assert created == 1
+    assert alert.alert_type == "spike"
+    assert alert.severity == "high"
+    assert alert.price_date == date(2026, 2, 16)
+    assert alert.current_price == Decimal("90.00")
+    assert alert.threshold_price < Decimal("90.00")
+    assert alert.message.startswith("Well-Milled Rice in")
+
+
+async def test_price_above_ceiling_raises_breach_alert(seeded_session):
+    await seeded_session.execute(update(Commodity).where(Commodity.id == 1).values(price_ceiling=Decimal("50.00")))
+
+    created = await _ingest(seeded_session, [_row("51.00", date(2026, 2, 16))])
+
+    [alert] = await _alerts(seeded_session)
+    assert created == 1
+    assert alert.alert_type == "ceiling_breach"
+    assert alert.severity == "low"
+    assert alert.threshold_price == Decimal("50.00")
+
+
+async def test_normal_prices_raise_no_alerts(seeded_session):
+    assert await _ingest(seeded_session, [_row("51.00", date(2026, 2, 16))]) == 0
+    assert await _alerts(seeded_session) == []
+
+
+async def test_same_alert_is_not_raised_twice(seeded_session):
+    await _ingest(seeded_session, [_row("90.00", date(2026, 2, 16))])
+
+    # The same rows are still recorded as changed; advancing again replays the pair.
+    await advance_rolling_stats(seeded_session)
+    assert await create_price_alerts(seeded_session) == 0
+    assert len(await _alerts(seeded_session)) == 1
+
+
+async def test_replayed_spikes_on_older_rows_are_ignored(seeded_session):
+    await _ingest(seeded_session, [_row("90.00", date(2026, 2, 16))])
+    await seeded_session.execute(PriceAlert.__table__.delete())
+
+    # A backfill before the spike replays the pair, re-reporting the 16th's spike.
+    created = await _ingest(seeded_session, [_row("50.95", date(2026, 2, 15)) | {"source": "PSA"}])
+
+    assert created == 0
+
+
+async def test_alerts_endpoint_lists_generated_alerts(client, seeded_session):
+    await _ingest(seeded_session, [_row("90.00", date(2026, 2, 16))])
+    await seeded_session.commit()
+
+    resp = await client.get("/api/v1/alerts", params={"severity": "high"})
+
+    assert resp.status_code == 200
+    [alert] = resp.json()
+    assert alert["alert_type"] == "spike"
+    assert alert["commodity_name"] == "Well-Milled Rice"
@@ -0,0 +1,66 @@
+"""Tests for the latest-price snapshot and the endpoints that read it."""
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.models import DailyPrice, LatestPriceSnapshot
+from app.services.price_service import get_latest_prices, refresh_latest_price_snapshot
+
+
+async def test_snapshot_holds_latest_and_previous_date_per_market(seeded_session):
+    rows = (await seeded_session.execute(select(LatestPriceSnapshot))).scalars().all()
+
+    by_pair = {(row.commodity_id, row.market_id): row for row in rows}
+    assert set(by_pair) == {(1, 1), (2, 1), (1, 2)}
+    rice = by_pair[(1, 1)]
+    assert rice.latest_date == date(2026, 2, 15)
+    assert rice.previous_date == date(2026, 2, 14)
+    assert rice.latest_price_sum == Decimal("50.90")
+    assert rice.latest_price_count == 1
+    assert rice.previous_price_sum == Decimal("50.80")
+
+
+async def test_refresh_moves_snapshot_to_newly_ingested_date(seeded_session):
+    seeded_session.add(
+        DailyPrice(
+            commodity_id=1,
+            market_id=1,
+            region_id=1,
+            price_prevailing=Decimal("52.00"),
+            date=date(2026, 2, 16),
+            source="DA-BPI",
+        )
+    )
+    await seeded_session.flush()
+
+    written = await refresh_latest_price_snapshot(seeded_session)
+    items, total = await get_latest_prices(seeded_session)
+
+    assert written == 3
+    assert total == 1
+    assert items[0]["date"] == date(2026, 2, 16)
+    assert items[0]["avg_price"] == Decimal("52.00")
+
+
+async def test_latest_prices_total_survives_offset_past_last_page(seeded_session):
+    items, total = await get_latest_prices(seeded_session, limit=1)
+    past_end, past_end_total = await get_latest_prices(seeded_session, limit=1, offset=10)
+
+    assert len(items) == 1
+    assert total == 3
+    assert past_end == []
+    assert past_end_total == 3
+
+
+async def test_price_board_reports_change_from_previous_date(client):
+    resp = await client.get("/api/v1/price-board", params={"category": "Vegetables"})
+
+    assert resp.status_code == 200
+    [group] = resp.json()
+    [item] = group["items"]
+    assert item["commodity_name"] == "Red Onion"
+    assert item["avg_price"] == 134.5
+    assert item["prev_price"] == 134.0
+    assert item["change_percent"] == 0.4
@@ -0,0 +1,93 @@
+"""Tests for the in-process response cache."""
+
+import asyncio
+
+import pytest
+
+from app.cache import ResponseCache, response_cache
+
+
+async def test_get_or_load_caches_until_invalidated() -> None:
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await cache.get_or_load("key", load) == 1
+    assert await cache.get_or_load("key", load) == 1
+    cache.invalidate()
+    assert await cache.get_or_load("key", load) == 2
+    assert cache.stats.to_dict() == {"hits": 1, "misses": 2, "evictions": 0, "invalidations": 1, "hit_ratio": 0.3333}
+
+
+async def test_lru_eviction_drops_least_recently_used() -> None:
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+
+    async def load_value(value: str):
+        return value
+
+    await cache.get_or_load("a", lambda: load_value("a"))
+    await cache.get_or_load("b", lambda: load_value("b"))
+    await cache.get_or_load("a", lambda: load_value("a"))
+    await cache.get_or_load("c", lambda: load_value("c"))
+
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    assert await cache.get_or_load("b", lambda: load_value("reloaded")) == "reloaded"
+
+
+async def test_expired_entries_are_reloaded() -> None:
+    cache = ResponseCache(max_entries=10, ttl_seconds=0.01)
+
+    async def load_value(value: str):
+        return value
+
+    await cache.get_or_load("key", lambda: load_value("old"))
+    await asyncio.sleep(0.02)
+    assert await cache.get_or_load("key", lambda: load_value("new")) == "new"
+
+
+async def test_concurrent_misses_share_one_load() -> None:
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    calls = 0
+
+    async def slow_load() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_load("key", slow_load) for _ in range(5)))
+
+    assert results == ["value"] * 5
+    assert calls == 1
+
+
+async def test_failed_loads_are_not_cached() -> None:
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+
+    async def failing_load():
+        raise RuntimeError("database down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("key", failing_load)
+    assert len(cache) == 0
+
+
+async def test_endpoint_responses_are_cached_per_query(client):
+    first = await client.get("/api/v1/commodities", params={"category": "Rice"})
+    second = await client.get("/api/v1/commodities", params={"category": "Rice"})
+    other = await client.get("/api/v1/commodities")
+
+    assert first.json() == second.json()
+    assert len(other.json()) >= len(first.json())
+    stats = (await client.get("/api/v1/health/cache")).json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+    response_cache.invalidate()
+    await client.get("/api/v1/commodities", params={"category": "Rice"})
+    assert response_cache.stats.misses == 3
@@ -0,0 +1,132 @@
+"""Tests for the incremental rolling statistics and persisted price spikes."""
+
+import random
+import statistics
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.models import DailyPrice, PriceSpike, RollingPriceStat
+from app.services.price_changes import CHANGE_COLUMNS, prepare_price_changes, record_price_changes
+from app.services.rolling_stats_service import (
+    SPIKE_WINDOW_ROWS,
+    RollingWindow,
+    advance_rolling_stats,
+    rebuild_rolling_stats,
+)
+
+
+def _price_row(price: str, day: date, *, market_id: int = 1) -> dict:
+    return {
+        "commodity_id": 1,
+        "market_id": market_id,
+        "region_id": 1,
+        "price_prevailing": Decimal(price),
+        "date": day,
+        "source": "DA-BPI",
+    }
+
+
+async def _ingest(session, row: dict) -> int:
+    """Upsert ``row`` the way the loader would, then advance the rolling stats."""
+    existing = await session.scalar(
+        select(DailyPrice).where(
+            DailyPrice.commodity_id == row["commodity_id"],
+            DailyPrice.market_id == row["market_id"],
+            DailyPrice.date == row["date"],
+            DailyPrice.source == row["source"],
+        )
+    )
+    if existing is None:
+        session.add(DailyPrice(**row))
+    else:
+        existing.price_prevailing = row["price_prevailing"]
+    await session.flush()
+    await prepare_price_changes(session)
+    await record_price_changes(session, [{column: row[column] for column in CHANGE_COLUMNS}])
+    return await advance_rolling_stats(session)
+
+
+async def _spikes(session) -> list[tuple]:
+    result = await session.execute(
+        select(
+            PriceSpike.commodity_id, PriceSpike.region_id, PriceSpike.market_id, PriceSpike.date, PriceSpike.price
+        ).order_by(PriceSpike.date, PriceSpike.market_id)
+    )
+    return list(result.all())
+
+
+def test_rolling_window_matches_exact_statistics() -> None:
+    rng = random.Random(7)
+    values = [rng.uniform(40, 60) for _ in range(100)]
+    window = RollingWindow()
+
+    for index, value in enumerate(values):
+        window.push(value)
+        expected = values[max(0, index + 1 - SPIKE_WINDOW_ROWS) : index + 1]
+        assert window.mean == pytest.approx(statistics.fmean(expected))
+        if len(expected) > 1:
+            assert window.std == pytest.approx(statistics.stdev(expected))
+        else:
+            assert window.std is None
+
+
+async def test_rebuild_creates_one_state_per_pair(seeded_session):
+    states = (await seeded_session.execute(select(RollingPriceStat))).scalars().all()
+
+    by_pair = {(state.commodity_id, state.region_id): state for state in states}
+    assert set(by_pair) == {(1, 1), (2, 1), (1, 2)}
+    rice = by_pair[(1, 1)]
+    assert rice.last_date == date(2026, 2, 15)
+    assert len(rice.window_values) == SPIKE_WINDOW_ROWS
+    assert rice.window_sum == pytest.approx(sum(rice.window_values))
+
+
+async def test_new_outlier_is_recorded_as_spike(seeded_session):
+    recorded = await _ingest(seeded_session, _price_row("90.00", date(2026, 2, 16)))
+
+    assert recorded == 1
+    spike = (await seeded_session.execute(select(PriceSpike).where(PriceSpike.date == date(2026, 2, 16)))).scalar_one()
+    assert spike.price == Decimal("90.00")
+    assert spike.rolling_mean < 90
+    state = await seeded_session.scalar(
+        select(RollingPriceStat).where(RollingPriceStat.commodity_id == 1, RollingPriceStat.region_id == 1)
+    )
+    assert state.last_date == date(2026, 2, 16)
+    assert state.window_values[-1] == 90.0
+
+
+async def test_rescrape_of_same_day_replays_the_pair(seeded_session):
+    await _ingest(seeded_session, _price_row("90.00", date(2026, 2, 16)))
+    await _ingest(seeded_session, _price_row("51.00", date(2026, 2, 16)))
+
+    assert not [spike for spike in await _spikes(seeded_session) if spike.date == date(2026, 2, 16)]
+
+
+async def test_incremental_updates_match_a_full_rebuild(seeded_session):
+    for day, price, market_id in ((16, "90.00", 1), (17, "52.00", 1), (17, "30.00", 2), (14, "70.00", 1)):
+        row = _price_row(price, date(2026, 2, day), market_id=market_id)
+        row["region_id"] = market_id
+        await _ingest(seeded_session, row)
+    incremental = await _spikes(seeded_session)
+
+    await rebuild_rolling_stats(seeded_session)
+
+    assert incremental
+    assert await _spikes(seeded_session) == incremental
+
+
+async def test_price_spikes_endpoint_pages_through_all_spikes(client, seeded_session):
+    for day in (16, 17, 18):
+        await _ingest(seeded_session, _price_row("95.00" if day != 17 else "20.00", date(2026, 2, day)))
+    await seeded_session.commit()
+
+    first = await client.get("/api/v1/analytics/price-spikes", params={"limit": 2})
+    second = await client.get("/api/v1/analytics/price-spikes", params={"limit": 2, "offset": 2})
+
+    total = int(first.headers["x-total-count"])
+    assert total >= 3
+    assert [row["date"] for row in first.json()] == ["2026-02-18", "2026-02-17"]
+    assert len(first.json()) + len(second.json()) == min(total, 4)
@@ -0,0 +1,116 @@
+"""Tests for the daily, weekly and monthly price rollups."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.models import DailyPrice, DailyPriceRollup, MonthlyPriceRollup, WeeklyPriceRollup
+from app.services.analytics_service import get_weekly_variance
+from app.services.price_changes import prepare_price_changes, record_price_changes
+from app.services.rollup_service import RollupScope, refresh_rollups, week_start
+
+
+async def _raw_totals(session, *conditions) -> tuple[Decimal, int]:
+    row = (await session.execute(select(func.sum(DailyPrice.price_prevailing), func.count()).where(*conditions))).one()
+    return Decimal(str(row[0])), row[1]
+
+
+async def test_rollups_match_raw_prices(seeded_session):
+    raw_sum, raw_count = await _raw_totals(seeded_session, DailyPrice.commodity_id == 1)
+
+    for rollup in (DailyPriceRollup, WeeklyPriceRollup, MonthlyPriceRollup):
+        row = (
+            await seeded_session.execute(
+                select(func.sum(rollup.price_sum), func.sum(rollup.price_count)).where(rollup.commodity_id == 1)
+            )
+        ).one()
+        assert Decimal(str(row[0])) == raw_sum
+        assert row[1] == raw_count
+
+    weeks = (
+        await seeded_session.execute(select(WeeklyPriceRollup.period_start).where(WeeklyPriceRollup.commodity_id == 1))
+    ).scalars()
+    assert all(week_start(period) == period for period in weeks)
+
+
+async def test_weekly_rollup_tracks_min_max_and_squares(seeded_session):
+    week = date(2026, 2, 9)
+    rollup = (
+        await seeded_session.execute(
+            select(WeeklyPriceRollup).where(
+                WeeklyPriceRollup.commodity_id == 2,
+                WeeklyPriceRollup.region_id == 1,
+                WeeklyPriceRollup.period_start == week,
+            )
+        )
+    ).scalar_one()
+
+    # Commodity 2 runs 130.00, 130.50, ... from 2026-02-06; the week of the 9th holds days 3-9.
+    prices = [Decimal("130.00") + Decimal("0.50") * i for i in range(3, 10)]
+    assert rollup.price_count == 7
+    assert rollup.price_min == prices[0]
+    assert rollup.price_max == prices[-1]
+    assert Decimal(str(rollup.price_sum_sq)) == sum(price * price for price in prices)
+
+
+async def test_scoped_refresh_recomputes_only_touched_periods(seeded_session):
+    await seeded_session.execute(
+        update(DailyPrice)
+        .where(DailyPrice.commodity_id == 1, DailyPrice.region_id == 1, DailyPrice.date == date(2026, 2, 15))
+        .values(price_prevailing=Decimal("60.90"))
+    )
+    # Corrupt an untouched week so a full rebuild would be visible.
+    await seeded_session.execute(
+        update(WeeklyPriceRollup).where(WeeklyPriceRollup.period_start == date(2026, 1, 19)).values(price_count=0)
+    )
+
+    await prepare_price_changes(seeded_session)
+    await record_price_changes(
+        seeded_session,
+        [{"commodity_id": 1, "market_id": 1, "region_id": 1, "date": date(2026, 2, 15), "source": "DA-BPI"}],
+    )
+    scope = await RollupScope.from_changes(seeded_session)
+    assert scope == RollupScope(frozenset({1}), frozenset({1}), date(2026, 2, 15), date(2026, 2, 15))
+    await refresh_rollups(seeded_session, scope)
+
+    rollups = {
+        row.period_start: row
+        for row in (
+            await seeded_session.execute(
+                select(WeeklyPriceRollup).where(WeeklyPriceRollup.commodity_id == 1, WeeklyPriceRollup.region_id == 1)
+            )
+        ).scalars()
+    }
+    raw_sum, raw_count = await _raw_totals(
+        seeded_session,
+        DailyPrice.commodity_id == 1,
+        DailyPrice.region_id == 1,
+        DailyPrice.date >= date(2026, 2, 9),
+    )
+    assert Decimal(str(rollups[date(2026, 2, 9)].price_sum)) == raw_sum
+    assert rollups[date(2026, 2, 9)].price_max == Decimal("60.90")
+    assert rollups[date(2026, 1, 19)].price_count == 0
+
+
+async def test_weekly_variance_from_rollups(seeded_session):
+    rows = await get_weekly_variance(seeded_session, from_date=date(2026, 2, 10))
+
+    assert {row["week_start"] for row in rows} == {date(2026, 2, 9)}
+    rice = next(row for row in rows if row["commodity_id"] == 1)
+    # The lag still sees the week before the requested range.
+    assert rice["wow_percent_change"] is not None
+    assert rice["wow_percent_change"] > 0
+
+
+async def test_weekly_variance_ends_at_to_date_mid_week(seeded_session):
+    rows = await get_weekly_variance(seeded_session, from_date=date(2026, 2, 10), to_date=date(2026, 2, 12))
+
+    assert {row["week_start"] for row in rows} == {date(2026, 2, 9)}
+    rice = next(row for row in rows if row["commodity_id"] == 1)
+    raw_sum, raw_count = await _raw_totals(
+        seeded_session, DailyPrice.commodity_id == 1, DailyPrice.date.between(date(2026, 2, 9), date(2026, 2, 12))
+    )
+    assert float(rice["weekly_avg_price"]) == pytest.approx(float(raw_sum / raw_count))
+    assert rice["wow_percent_change"] is not None
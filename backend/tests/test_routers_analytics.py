@@ -1,23 +1,20 @@
 """Tests for /api/v1/analytics endpoints.
 
-Note: Some analytics queries use PostgreSQL-specific aggregate window
-functions (e.g. stddev_samp, date_trunc) that are unavailable in SQLite.
-Those tests are marked with ``pytest.mark.xfail`` when running against
-the in-memory SQLite test database.
+Spikes, weekly variance, regional comparison and seasonal patterns read
+precomputed tables, so every endpoint runs against the in-memory SQLite
+test database.
 """
 
 import pytest
 
-# --- Weekly variance uses date_trunc (PostgreSQL only) ---
+# --- Weekly variance reads the weekly rollups ---
 
 
-@pytest.mark.xfail(reason="date_trunc not available in SQLite", strict=False)
 async def test_weekly_variance_returns_200(client):
     resp = await client.get("/api/v1/analytics/weekly-variance")
     assert resp.status_code == 200
 
 
-@pytest.mark.xfail(reason="date_trunc not available in SQLite", strict=False)
 async def test_weekly_variance_is_list(client):
     resp = await client.get("/api/v1/analytics/weekly-variance")
     data = resp.json()
@@ -35,23 +32,20 @@ async def test_regional_comparison_filter_commodity(client):
     assert isinstance(data, list)
 
 
-# --- Price spikes uses stddev_samp (PostgreSQL only) ---
+# --- Price spikes reads the persisted spike table ---
 
 
-@pytest.mark.xfail(reason="stddev_samp not available in SQLite", strict=False)
 async def test_price_spikes_returns_200(client):
     resp = await client.get("/api/v1/analytics/price-spikes")
     assert resp.status_code == 200
 
 
-@pytest.mark.xfail(reason="stddev_samp not available in SQLite", strict=False)
 async def test_price_spikes_filter_commodity(client):
     resp = await client.get("/api/v1/analytics/price-spikes", params={"commodity_id": 1})
     data = resp.json()
     assert isinstance(data, list)
 
 
-@pytest.mark.xfail(reason="stddev_samp not available in SQLite", strict=False)
 async def test_price_spikes_filter_region(client):
     resp = await client.get("/api/v1/analytics/price-spikes", params={"region_id": 1})
     data = resp.json()
@@ -101,3 +95,22 @@ async def test_seasonal_pattern_is_list(client):
     if data:
         assert "month" in data[0]
         assert "avg_price" in data[0]
+
+
+async def test_rolling_average_respects_date_bounds(client):
+    full = (await client.get("/api/v1/analytics/rolling-average/1")).json()
+    resp = await client.get("/api/v1/analytics/rolling-average/1", params={"from": "2026-02-10", "to": "2026-02-12"})
+    assert resp.status_code == 200
+    bounded = resp.json()
+    assert bounded
+    assert all("2026-02-10" <= row["date"] <= "2026-02-12" for row in bounded)
+    # Rows before the range still feed each window, so the averages match the unbounded query.
+    expected = {(row["date"], row["avg_price"]): row["rolling_30_day_avg"] for row in full}
+    for row in bounded:
+        assert row["rolling_30_day_avg"] == pytest.approx(expected[(row["date"], row["avg_price"])])
+
+
+async def test_seasonal_pattern_empty_outside_date_bounds(client):
+    resp = await client.get("/api/v1/analytics/seasonal/1", params={"from": "2020-01-01", "to": "2020-12-31"})
+    assert resp.status_code == 200
+    assert resp.json() == []
@@ -1,5 +1,9 @@
 """Tests for /api/v1/forecast endpoints."""
 
+import asyncio
+
+from app.services.job_tracker import FORECAST_JOB, job_tracker
+
 
 async def test_forecast_summary_returns_200(client):
     resp = await client.get("/api/v1/forecast/summary")
@@ -56,3 +60,25 @@ async def test_forecast_nonexistent_commodity(client):
     resp = await client.get("/api/v1/forecast/9999")
     data = resp.json()
     assert data == []
+
+
+async def test_forecasts_degrade_while_startup_forecast_runs(client):
+    release = asyncio.Event()
+
+    async def _forecast() -> None:
+        await release.wait()
+
+    task = job_tracker.start([(FORECAST_JOB, _forecast)])
+    try:
+        resp = await client.get("/api/v1/forecast/1")
+        assert resp.status_code == 200
+        assert resp.json() == []
+        assert resp.headers["Retry-After"] == "30"
+
+        release.set()
+        await task
+        resp = await client.get("/api/v1/forecast/1")
+        assert len(resp.json()) == 7
+        assert "Retry-After" not in resp.headers
+    finally:
+        job_tracker.reset()
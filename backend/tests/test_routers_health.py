@@ -1,5 +1,9 @@
 """Tests for /api/v1/health endpoint."""
 
+import asyncio
+
+from app.services.job_tracker import job_tracker
+
 
 async def test_health_returns_200(client):
     resp = await client.get("/api/v1/health")
@@ -9,3 +13,52 @@ async def test_health_returns_200(client):
 async def test_health_body(client):
     resp = await client.get("/api/v1/health")
     assert resp.json() == {"status": "ok"}
+
+
+async def test_ready_when_no_startup_jobs(client):
+    resp = await client.get("/api/v1/health/ready")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ready", "jobs": {}}
+
+
+async def test_ready_reports_running_then_finished_jobs(client):
+    release = asyncio.Event()
+
+    async def _seed() -> str:
+        await release.wait()
+        return "seeded"
+
+    task = job_tracker.start([("seed", _seed)])
+    try:
+        await asyncio.sleep(0)
+        resp = await client.get("/api/v1/health/ready")
+        assert resp.status_code == 503
+        assert resp.json()["status"] == "starting"
+        assert resp.json()["jobs"]["seed"]["status"] == "running"
+
+        release.set()
+        await task
+        resp = await client.get("/api/v1/health/ready")
+        assert resp.status_code == 200
+        assert resp.json()["jobs"]["seed"]["detail"] == "seeded"
+    finally:
+        job_tracker.reset()
+
+
+async def test_ready_reports_failed_and_skipped_jobs(client):
+    async def _seed() -> None:
+        raise RuntimeError("database unavailable")
+
+    async def _forecast() -> None:
+        return None
+
+    try:
+        await job_tracker.start([("seed", _seed), ("forecast", _forecast)])
+        resp = await client.get("/api/v1/health/ready")
+        body = resp.json()
+        assert resp.status_code == 503
+        assert body["status"] == "failed"
+        assert body["jobs"]["seed"]["detail"] == "database unavailable"
+        assert body["jobs"]["forecast"]["status"] == "failed"
+    finally:
+        job_tracker.reset()
@@ -1,5 +1,7 @@
 """Tests for /api/v1/prices endpoints."""
 
+from app.services import price_service
+
 
 async def test_daily_prices_returns_200(client):
     resp = await client.get("/api/v1/prices/daily")
@@ -83,3 +85,39 @@ async def test_price_history_nonexistent_commodity(client):
     resp = await client.get("/api/v1/prices/history/9999")
     data = resp.json()
     assert data == []
+
+
+async def test_latest_prices_cursor_pagination_walks_every_row(client):
+    seen = []
+    cursor = None
+    while True:
+        params = {"pagination": "cursor", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await client.get("/api/v1/prices/latest", params=params)
+        data = resp.json()
+        assert data["total"] == 3
+        assert data["total_is_estimate"] is True
+        seen.extend((item["commodity_name"], item["region_code"]) for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen)
+    assert len(seen) == 3
+
+
+async def test_latest_price_totals_cache_is_bounded(client, monkeypatch):
+    monkeypatch.setattr(price_service._latest_total_cache, "max_entries", 2)
+    price_service._latest_total_cache.invalidate()
+
+    for search in ("rice", "onion", "no-such-commodity"):
+        resp = await client.get("/api/v1/prices/latest", params={"pagination": "cursor", "search": search})
+        assert resp.status_code == 200
+
+    assert len(price_service._latest_total_cache) == 2
+
+
+async def test_latest_prices_rejects_malformed_cursor(client):
+    resp = await client.get("/api/v1/prices/latest", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
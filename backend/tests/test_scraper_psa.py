@@ -0,0 +1,96 @@
+"""Tests for the columnar PSA CSV ingestion path."""
+
+from datetime import date
+
+import httpx
+import numpy as np
+import pytest
+
+from app.scraping import scraper_psa
+from app.scraping.data_loader import _resolve_batch
+from app.scraping.http_client import ScraperHttpClient, ValidatorCache
+from app.scraping.name_resolver import NameIndex, NameResolver
+from app.scraping.types import PriceRecordBatch, RawPriceRecord
+
+CSV = """\
+Commodity,Market,Region_Code,Price_Prevailing,Price_Low,Notes
+well milled rice,Lagonoy Public Market,ago,48.25,46,ok
+Red Onion,Lagonoy Public Market,AGO,not available,,bad price
+,Lagonoy Public Market,AGO,130.00,,missing name
+Pork Liempo,Lagonoy Public Market,AGO,345.5,,ok
+Red Onion,Balaton Fish Port,BAL,-1,,negative
+"""
+
+
+URL = "https://psa.example.test/extract.csv"
+
+
+@pytest.fixture()
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(scraper_psa.settings, "psa_csv_chunk_rows", 2)
+
+
+def _serve(monkeypatch, tmp_path, body: str) -> ValidatorCache:
+    """Answer the PSA download with ``body`` through a scraper client backed by a cache in ``tmp_path``."""
+    cache = ValidatorCache(tmp_path, max_body_bytes=1024)
+    transport = httpx.MockTransport(lambda _request: httpx.Response(200, text=body))
+    monkeypatch.setattr(scraper_psa, "scraper_http", ScraperHttpClient(cache, transport=transport))
+    return cache
+
+
+async def test_streams_needed_columns_chunk_by_chunk_and_drops_invalid_rows(monkeypatch, tmp_path, small_chunks):
+    cache = _serve(monkeypatch, tmp_path, CSV)
+
+    chunks = [chunk async for chunk in await scraper_psa.scrape_psa_prices(URL, staging=cache.staging())]
+    batch = PriceRecordBatch.concat(chunks)
+
+    assert [len(chunk) for chunk in chunks] == [1, 1, 1]
+    # The non-numeric price and the missing name are dropped; cleaning handles the negative one.
+    assert batch.commodity_name.tolist() == ["well milled rice", "Pork Liempo", "Red Onion"]
+    assert batch.price_prevailing.tolist() == [48.25, 345.5, -1.0]
+    assert batch.price_low[0] == 46.0
+    assert np.isnan(batch.price_high).all()
+    assert set(batch.source.tolist()) == {"PSA"}
+    assert len(set(batch.date.tolist())) == 1
+
+
+async def test_missing_required_columns_yield_no_chunks(monkeypatch, tmp_path, small_chunks):
+    cache = _serve(monkeypatch, tmp_path, "commodity,market,price_prevailing\nRed Onion,Market,120\n")
+
+    assert [chunk async for chunk in await scraper_psa.scrape_psa_prices(URL, staging=cache.staging())] == []
+
+
+async def test_downloaded_extract_is_removed_once_the_stream_is_closed(monkeypatch, tmp_path, small_chunks):
+    cache = _serve(monkeypatch, tmp_path / "cache", CSV)
+    monkeypatch.setattr(scraper_psa.tempfile, "tempdir", str(tmp_path))
+
+    stream = await scraper_psa.scrape_psa_prices(URL, staging=cache.staging())
+    assert len(await anext(stream)) == 1
+    await stream.aclose()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_resolve_batch_resolves_ids_and_drops_unknown_names():
+    day = date(2026, 2, 16)
+    batch = PriceRecordBatch.from_records(
+        [
+            RawPriceRecord("Red Onion", "Market", "AGO", day, 120.5, price_high=130.0),
+            RawPriceRecord("Unknown", "Market", "AGO", day, 10.0),
+        ]
+    )
+
+    resolver = NameResolver(
+        commodities=NameIndex.build("commodity", [("Red Onion", 2)]),
+        markets=NameIndex.build("market", [("Market", 3)]),
+        regions=NameIndex.build("region", [("AGO", 1)]),
+    )
+
+    prices, result = _resolve_batch(batch, resolver)
+
+    assert result.unmatched_names == {("commodity", "Unknown"): 1}
+    assert result.unmatched_rows == {"DA": 1}
+    assert (prices.commodity_id.tolist(), prices.market_id.tolist(), prices.region_id.tolist()) == ([2], [3], [1])
+    assert prices.price_prevailing.tolist() == [120.5]
+    assert np.isnan(prices.price_low).all()
+    assert prices.price_high.tolist() == [130.0]
@@ -0,0 +1,55 @@
+"""Tests for the vectorized synthetic price seeding."""
+
+import hashlib
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.models import DailyPrice, Market
+from app.utils.seed_data import (
+    _RAW_COMMODITIES,
+    _deterministic_noise_matrix,
+    iter_synthetic_prices,
+    seed_reference_data,
+)
+
+
+def test_noise_matrix_matches_md5_definition() -> None:
+    noise = _deterministic_noise_matrix(["SFR:Well-Milled Rice", "BIN:Tilapia"], 4)
+
+    raw = hashlib.md5(b"BIN:Tilapia:3").hexdigest()  # noqa: S324
+    assert noise.shape == (2, 4)
+    assert noise[1, 3] == (int(raw[:8], 16) / 0xFFFFFFFF) * 2 - 1
+    assert np.all((noise >= -1) & (noise <= 1))
+
+
+def test_synthetic_prices_are_reproducible_and_consistent() -> None:
+    commodities = {
+        name: SimpleNamespace(id=index + 1, category=category)
+        for index, (name, category, _, _) in enumerate(_RAW_COMMODITIES[:5])
+    }
+    markets = [(1, 1, "SFR"), (2, 1, "SFR")]
+
+    first = list(iter_synthetic_prices(markets, commodities, start_date=date(2026, 1, 1), history_days=10))
+    second = list(iter_synthetic_prices(markets, commodities, start_date=date(2026, 1, 1), history_days=10))
+
+    assert [len(block) for block in first] == [50, 50]
+    np.testing.assert_array_equal(first[0].price_prevailing, second[0].price_prevailing)
+    np.testing.assert_array_equal(first[0].price_prevailing, first[1].price_prevailing)
+    assert np.all(first[0].price_low <= first[0].price_prevailing)
+    assert np.all(first[0].price_prevailing <= first[0].price_high)
+    assert first[0].dates[9] == np.datetime64("2026-01-10")
+
+
+async def test_seed_reference_data_honours_history_days_and_extra_markets(db_session) -> None:
+    await seed_reference_data(db_session, history_days=3, extra_markets=2)
+
+    market_count = await db_session.scalar(select(func.count(Market.id)))
+    price_count = await db_session.scalar(select(func.count(DailyPrice.id)))
+    day_count = await db_session.scalar(select(func.count(func.distinct(DailyPrice.date))))
+
+    assert market_count == 7
+    assert price_count == market_count * len(_RAW_COMMODITIES) * 3
+    assert day_count == 3